@@ -3,7 +3,7 @@ Flask Web Application
 Web interface for ATS Resume Analyzer
 """
 
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, request, jsonify, send_file
 from flask_cors import CORS
 import os
 import sys
@@ -12,6 +12,11 @@ import json
 import tempfile
 import re
 import datetime
+import functools
+import queue
+import threading
+import time
+import uuid
 
 # Add src directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
@@ -20,6 +25,14 @@ from src.text_extractor import TextExtractor
 from src.resume_parser import ResumeParser
 from src.ats_analyzer import ATSAnalyzer
 from src.report_generator import ReportGenerator
+from src.live_optimizer import LiveOptimizer, SessionConflict
+from src.result_cache import ResultCache, content_hash
+from src.config_store import config_store, current_config
+from src.candidate_index import CandidateIndex
+from src.admission import Overloaded, build_controllers, render_metrics
+from src.singleflight import SingleFlight
+from src.response_shaping import ResponseShape, compress, dumps, negotiate_encoding, should_compress
+from config.config import CANDIDATE_INDEX
 
 app = Flask(__name__)
 CORS(app, origins=["http://localhost:4200"], supports_credentials=True)
@@ -42,6 +55,106 @@ extractor = TextExtractor()
 parser = ResumeParser()
 analyzer = ATSAnalyzer()
 report_generator = ReportGenerator(output_dir=app.config['RESULTS_FOLDER'])
+candidate_index = CandidateIndex(CANDIDATE_INDEX['path'])
+
+# Shared by all worker processes on this host
+app.config['RESULT_CACHE_PATH'] = os.path.join(base_temp, 'result_cache.sqlite3')
+result_cache = ResultCache(app.config['RESULT_CACHE_PATH'], current_config().version)
+
+# Optimizer sessions live in the same database, so any worker can apply the next edit
+live_optimizer = LiveOptimizer(parser, analyzer, app.config['RESULT_CACHE_PATH'])
+
+# Reloaded settings get their own cache keys; entries from older versions are dropped
+config_store.subscribe(lambda snapshot: result_cache.set_config_version(snapshot.version))
+
+
+# Identical analyses in flight at once (retries, double-clicks) run only once
+inflight = SingleFlight()
+
+# Bounded concurrency and wait queue per class of CPU-heavy endpoint
+admission = build_controllers()
+
+
+# Warm-up state reported by /ready (separate from /health liveness)
+warmup_state = {'ready': False, 'duration_ms': None, 'error': None}
+
+WARMUP_RESUME = """Alex Sample
+alex.sample@example.com | (555) 010-0000
+
+Professional Summary
+Software Engineer with 5 years of experience building web services.
+
+Experience
+Software Engineer, Example Corp, Jan 2019 - Present
+Developed REST API services in Python and Docker; reduced latency by 30%.
+Was responsible for CI/CD pipelines and mentored 3 engineers.
+
+Education
+Bachelor of Science in Computer Science, Example University, 2018
+
+Skills
+Python, JavaScript, React, PostgreSQL, AWS, Git, Agile, Communication
+"""
+
+
+def warm_up():
+    """
+    Run every lazily-initialized component once (regex compilation, syllable
+    dictionary, report imports) so the first real request does not pay for it.
+    Called by the production server in the parent process before forking.
+    """
+    started = time.perf_counter()
+    try:
+        parsed = parser.parse(WARMUP_RESUME)
+        results = analyzer.analyze(WARMUP_RESUME, parsed, "Python engineer with AWS and REST API experience")
+        report_generator.generate_text_report(results, parsed, filename=None)
+        import reportlab.platypus  # noqa: F401  (imported lazily by /generate-ats-pdf)
+        warmup_state['ready'] = True
+    except Exception as e:
+        warmup_state['error'] = str(e)
+    warmup_state['duration_ms'] = round((time.perf_counter() - started) * 1000, 2)
+    return warmup_state
+
+
+@app.after_request
+def compress_response(response):
+    """gzip/brotli-encode JSON bodies when the client's Accept-Encoding allows it"""
+    if response.direct_passthrough or response.is_streamed:
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate_encoding(request.headers.get('Accept-Encoding'))
+    if encoding and should_compress(response.status_code, response.mimetype, response.headers,
+                                    response.content_length or 0):
+        response.set_data(compress(response.get_data(), encoding))
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def overloaded_response(error):
+    """503 telling the client when to try again"""
+    response = jsonify({'error': str(error), 'retry_after': error.retry_after})
+    return response, 503, {'Retry-After': str(error.retry_after)}
+
+
+def admitted(endpoint_class):
+    """Run the view only once admission[endpoint_class] grants a slot; 503 if it is overloaded"""
+    def decorate(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method == 'OPTIONS':
+                return view(*args, **kwargs)
+            controller = admission[endpoint_class]
+            try:
+                controller.acquire()
+            except Overloaded as e:
+                return overloaded_response(e)
+            started = time.perf_counter()
+            try:
+                return view(*args, **kwargs)
+            finally:
+                controller.release(time.perf_counter() - started)
+        return wrapper
+    return decorate
 
 
 def allowed_file(filename):
@@ -50,172 +163,385 @@ def allowed_file(filename):
            filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
 
 
+def remember_candidate(resume_text, parsed_resume, filename):
+    """Add an analyzed resume to the candidate pool if CANDIDATE_INDEX['store_analyzed'] is on"""
+    if CANDIDATE_INDEX['store_analyzed']:
+        candidate_index.add(resume_text, parsed_resume, filename)
+
+
+def build_analysis_response(resume_filename, parsed_resume, analysis_results, include_report=True):
+    """
+    Build the /analyze JSON payload (results + recruiter insights)
+    
+    include_report=False skips rendering results.full_report for clients
+    that did not ask for it (see ResponseShape).
+    """
+    # Generate text report content directly without saving to disk
+    report_text = None
+    if include_report:
+        _, report_text = report_generator.generate_text_report(
+            analysis_results, parsed_resume, filename=None
+        )
+
+    # Prepare the recruiter-style structured insights
+    skills = parsed_resume.get('skills', {})
+    tech_skills = skills.get('technical', {})
+
+    # 1. Candidate Details
+    experience_data = parsed_resume.get('experience', {})
+    timeline_data = parsed_resume.get('timeline', {})
+    years_list = experience_data.get('years_mentioned', [])
+    total_years = timeline_data.get('total_experience_years') or (years_list[0] if years_list else "Not explicitly stated")
+
+    contact_info = parsed_resume.get('contact_info', {})
+    emails = contact_info.get('emails', [])
+    phones = contact_info.get('phones', [])
+
+    candidate_details = {
+        'name': parsed_resume.get('name', 'Not Found'),
+        'email': emails[0] if emails else "Not Found",
+        'phone': phones[0] if phones else "Not Found",
+        'total_years_experience': total_years
+    }
+
+    # 2. Key Sections
+    key_sections = {
+        'skills': {
+            'technical': tech_skills.get('programming_languages', []) + tech_skills.get('web_technologies', []),
+            'tools': tech_skills.get('tools', []) + tech_skills.get('cloud_platforms', []),
+            'soft_skills': skills.get('soft', [])
+        },
+        'work_experience_summary': " - ".join(experience_data.get('detected_titles', [])[:5]),
+        'education': parsed_resume.get('education', {}).get('degrees', [])
+    }
+
+    # 3. Resume Quality
+    resume_quality = {
+        'strengths': analysis_results.get('strengths', []),
+        'weaknesses': [rec for rec in analysis_results.get('recommendations', []) if "URGENT" in rec],
+        'missing_or_unclear_information': [s for s, present in parsed_resume.get('sections', {}).items() if not present]
+    }
+
+    # 4. ATS Compatibility
+    ats_compatibility = {
+        'score': analysis_results['overall_score'],
+        'reasons': [f"Rating: {analysis_results['rating']}"],
+        'formatting_issues': analysis_results.get('format_check', {}).get('issues', []),
+        'keyword_issues': analysis_results.get('keyword_match', {}).get('missing_keywords', []) if 'keyword_match' in analysis_results else []
+    }
+
+    # 5. Improvement Suggestions
+    roadmap = analysis_results.get('career_roadmap', {})
+    improvement_suggestions = {
+        'skills_to_add': [s for s in (analysis_results.get('skills_match', {}).get('missing_skills', []) or [])[:10]],
+        'resume_formatting_improvements': [rec for rec in analysis_results.get('recommendations', []) if "format" in rec.lower()],
+        'content_improvements': roadmap.get('steps', [])
+    }
+
+    # 6. Advanced Visualization Items (New Phase 2)
+    skill_heatmap = {
+        'technical': len(key_sections['skills']['technical']),
+        'tools': len(key_sections['skills']['tools']),
+        'soft': len(key_sections['skills']['soft_skills'])
+    }
+
+    # Prepare reports for compatibility (in-memory names)
+    reports = {
+        'text': f"{resume_filename.rsplit('.', 1)[0]}_report.txt",
+        'json': f"{resume_filename.rsplit('.', 1)[0]}_report.json",
+        'excel': f"{resume_filename.rsplit('.', 1)[0]}_report.xlsx"
+    }
+
+    # Final JSON Response (Combined for compatibility and new requirements)
+    response_data = {
+        'success': True,
+        'results': {
+            'overall_score': analysis_results['overall_score'],
+            'rating': analysis_results['rating'],
+            'scores': analysis_results['scores'],
+            'strengths': analysis_results.get('strengths', []),
+            'recommendations': analysis_results.get('recommendations', []),
+            'candidate_name': parsed_resume.get('name', 'Not Found'),
+            'contact_info': parsed_resume.get('contact_info', {}),
+            'skills': {
+                'technical': len(parsed_resume.get('skills', {}).get('all_technical', [])),
+                'soft': len(parsed_resume.get('skills', {}).get('soft', []))
+            },
+            'sections': parsed_resume.get('sections', {}),
+            'format_check': analysis_results.get('format_check', {}),
+            'impact_analysis': analysis_results.get('impact_analysis', {}),
+            'readability': analysis_results.get('readability', {}),
+            'tone_analysis': analysis_results.get('tone_analysis', {}),
+            'career_analysis': analysis_results.get('career_analysis', {}),
+            'link_validation': analysis_results.get('link_validation', []),
+            'role_suitability': analysis_results.get('role_suitability', []),
+            'career_roadmap': analysis_results.get('career_roadmap', {}),
+            **({'full_report': report_text} if include_report else {})
+        },
+        'reports': reports,
+        'recruiter_insights': {
+            'candidate_details': candidate_details,
+            'key_sections': key_sections,
+            'resume_quality': resume_quality,
+            'ats_compatibility': ats_compatibility,
+            'improvement_suggestions': improvement_suggestions,
+            'timeline': timeline_data, # New Timeline Data
+            'skill_heatmap': skill_heatmap  # New Heatmap Data
+        }
+    }
+    
+    return response_data
+
+
+def extract_upload_bytes(data, filename, on_preflight=None, with_layout=False):
+    """
+    Write uploaded bytes to the temp folder, extract their text and delete the file.
+    A pre-flight inspection runs first; rejected documents raise ValueError
+    before any extraction work and over-long PDFs are truncated.
+    With with_layout=True, returns (text, layout) for the format check.
+    """
+    # Unique prefix so concurrent uploads with the same name don't collide
+    path = os.path.join(app.config['UPLOAD_FOLDER'], f"{uuid.uuid4().hex}_{secure_filename(filename)}")
+    with open(path, 'wb') as f:
+        f.write(data)
+    try:
+        report = extractor.preflight(path)
+        if on_preflight:
+            on_preflight(report)
+        if report['action'] == 'reject':
+            raise ValueError("; ".join(report['reasons']))
+        for reason in report['reasons']:
+            # Truncation and an unconfirmed text layer are warnings only
+            print(f"⚠️ {filename}: {reason}")
+        if with_layout:
+            return extractor.extract_with_layout(path, max_pages=report['max_pages'])
+        return extractor.extract(path, max_pages=report['max_pages'])
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def read_analysis_upload(files, form):
+    """
+    Read the resume upload and job description of an /analyze request.
+    
+    Returns:
+        tuple: (resume_filename, resume_bytes, job_description)
+    
+    Raises:
+        ValueError: If the resume is missing or has an unsupported format
+    """
+    if 'resume' not in files:
+        raise ValueError('No resume file provided')
+    
+    resume_file = files['resume']
+    
+    if resume_file.filename == '':
+        raise ValueError('No file selected')
+    
+    if not allowed_file(resume_file.filename):
+        raise ValueError('Invalid file format. Please upload PDF or DOCX')
+    
+    # Handle job description
+    job_description = ""
+    if 'job_description' in files:
+        jd_file = files['job_description']
+        if jd_file.filename != '' and allowed_file(jd_file.filename):
+            job_description = extract_upload_bytes(jd_file.read(), jd_file.filename)
+    elif 'job_description_text' in form:
+        job_description = form['job_description_text']
+    
+    return secure_filename(resume_file.filename), resume_file.read(), job_description
+
+
+def format_sse(event, data):
+    """Encode one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def run_streaming_analysis(resume_bytes, resume_filename, job_description, emit, check_links=True):
+    """
+    Run the /analyze pipeline, calling emit(event, data) as each step finishes:
+    'extraction', 'parse', one event per analyzer stage, 'score',
+    'link_validation' and finally 'final' with the full /analyze payload.
+    Links are checked after scoring because they wait on the network.
+    
+    With check_links=False the function stops after 'score' and returns
+    (cache_key, parsed_resume, analysis_results); the caller validates the
+    links itself and passes them to finish_streaming_analysis. It returns
+    None when 'final' was already sent from the result cache.
+    """
+    cache_key = result_cache.make_key(content_hash(resume_bytes), job_description)
+    cached = result_cache.get(cache_key)
+    if cached:
+        emit('final', build_analysis_response(resume_filename, cached['parsed_resume'], cached['analysis_results']))
+        return None
+    
+    resume_text, layout = extract_upload_bytes(
+        resume_bytes, resume_filename, lambda report: emit('preflight', report), with_layout=True
+    )
+    emit('extraction', {'characters': len(resume_text), 'lines': resume_text.count('\n') + 1, 'layout': layout})
+    
+    parsed_resume = parser.parse(resume_text)
+    remember_candidate(resume_text, parsed_resume, resume_filename)
+    emit('parse', {
+        'candidate_name': parsed_resume.get('name', 'Not Found'),
+        'contact_info': parsed_resume.get('contact_info', {}),
+        'sections': parsed_resume.get('sections', {}),
+        'skills': parsed_resume.get('skills', {})
+    })
+    
+    analysis_results = analyzer.analyze(
+        resume_text, parsed_resume, job_description, validate_links=False, on_stage=emit, layout=layout
+    )
+    emit('score', {
+        'overall_score': analysis_results['overall_score'],
+        'rating': analysis_results['rating'],
+        'scores': analysis_results['scores']
+    })
+    
+    if not check_links:
+        return cache_key, parsed_resume, analysis_results
+    
+    links = analyzer.advanced.validate_links(parsed_resume.get('contact_info', {}))
+    finish_streaming_analysis(cache_key, resume_filename, parsed_resume, analysis_results, links, emit)
+
+
+def finish_streaming_analysis(cache_key, resume_filename, parsed_resume, analysis_results, links, emit):
+    """Emit 'link_validation', cache the result and emit 'final'"""
+    analysis_results['link_validation'] = links
+    emit('link_validation', links)
+    
+    result_cache.put(cache_key, {'parsed_resume': parsed_resume, 'analysis_results': analysis_results})
+    emit('final', build_analysis_response(resume_filename, parsed_resume, analysis_results))
+
+
 @app.route('/analyze', methods=['POST', 'OPTIONS'])
+@admitted('analysis')
 def analyze():
     """Analyze resume endpoint"""
     if request.method == 'OPTIONS':
         return jsonify({'status': 'ok'}), 200
     
     try:
-        # Check if resume file is present
-        if 'resume' not in request.files:
-            return jsonify({'error': 'No resume file provided'}), 400
-        
-        resume_file = request.files['resume']
-        
-        if resume_file.filename == '':
-            return jsonify({'error': 'No file selected'}), 400
-        
-        if not allowed_file(resume_file.filename):
-            return jsonify({'error': 'Invalid file format. Please upload PDF or DOCX'}), 400
-        
-        # Save resume file
-        resume_filename = secure_filename(resume_file.filename)
-        resume_path = os.path.join(app.config['UPLOAD_FOLDER'], resume_filename)
-        resume_file.save(resume_path)
-        
-        # Extract resume text
-        resume_text = extractor.extract(resume_path)
-        
-        # Delete uploaded resume after extraction
-        if os.path.exists(resume_path):
-            os.remove(resume_path)
-        
-        # Handle job description
-        job_description = ""
-        if 'job_description' in request.files:
-            jd_file = request.files['job_description']
-            if jd_file.filename != '' and allowed_file(jd_file.filename):
-                jd_filename = secure_filename(jd_file.filename)
-                jd_path = os.path.join(app.config['UPLOAD_FOLDER'], jd_filename)
-                jd_file.save(jd_path)
-                job_description = extractor.extract(jd_path)
+        # ?fields=, ?profile= and ?compact= trim the payload (see ResponseShape)
+        shape = ResponseShape.from_args(request.args)
+        resume_filename, resume_bytes, job_description = read_analysis_upload(request.files, request.form)
+        
+        # Reuse results for a resume/JD pair analyzed before under the same config
+        cache_key = result_cache.make_key(content_hash(resume_bytes), job_description)
+        cached = result_cache.get(cache_key)
+        if not cached:
+            def compute():
+                resume_text, layout = extract_upload_bytes(resume_bytes, resume_filename, with_layout=True)
                 
-                # Delete uploaded JD after extraction
-                if os.path.exists(jd_path):
-                    os.remove(jd_path)
-        elif 'job_description_text' in request.form:
-            job_description = request.form['job_description_text']
-        
-        # Parse and analyze
-        parsed_resume = parser.parse(resume_text)
-        analysis_results = analyzer.analyze(resume_text, parsed_resume, job_description)
-        
-        # Generate text report content directly without saving to disk
-        _, report_text = report_generator.generate_text_report(
-            analysis_results, parsed_resume, filename=None
-        )
-        
-        # Prepare the recruiter-style structured insights
-        skills = parsed_resume.get('skills', {})
-        tech_skills = skills.get('technical', {})
-        
-        # 1. Candidate Details
-        experience_data = parsed_resume.get('experience', {})
-        timeline_data = parsed_resume.get('timeline', {})
-        years_list = experience_data.get('years_mentioned', [])
-        total_years = timeline_data.get('total_experience_years') or (years_list[0] if years_list else "Not explicitly stated")
-        
-        contact_info = parsed_resume.get('contact_info', {})
-        emails = contact_info.get('emails', [])
-        phones = contact_info.get('phones', [])
-        
-        candidate_details = {
-            'name': parsed_resume.get('name', 'Not Found'),
-            'email': emails[0] if emails else "Not Found",
-            'phone': phones[0] if phones else "Not Found",
-            'total_years_experience': total_years
-        }
-        
-        # 2. Key Sections
-        key_sections = {
-            'skills': {
-                'technical': tech_skills.get('programming_languages', []) + tech_skills.get('web_technologies', []),
-                'tools': tech_skills.get('tools', []) + tech_skills.get('cloud_platforms', []),
-                'soft_skills': skills.get('soft', [])
-            },
-            'work_experience_summary': " - ".join(experience_data.get('detected_titles', [])[:5]),
-            'education': parsed_resume.get('education', {}).get('degrees', [])
-        }
-        
-        # 3. Resume Quality
-        resume_quality = {
-            'strengths': analysis_results.get('strengths', []),
-            'weaknesses': [rec for rec in analysis_results.get('recommendations', []) if "URGENT" in rec],
-            'missing_or_unclear_information': [s for s, present in parsed_resume.get('sections', {}).items() if not present]
-        }
-        
-        # 4. ATS Compatibility
-        ats_compatibility = {
-            'score': analysis_results['overall_score'],
-            'reasons': [f"Rating: {analysis_results['rating']}"],
-            'formatting_issues': analysis_results.get('format_check', {}).get('issues', []),
-            'keyword_issues': analysis_results.get('keyword_match', {}).get('missing_keywords', []) if 'keyword_match' in analysis_results else []
-        }
-        
-        # 5. Improvement Suggestions
-        roadmap = analysis_results.get('career_roadmap', {})
-        improvement_suggestions = {
-            'skills_to_add': [s for s in (analysis_results.get('skills_match', {}).get('missing_skills', []) or [])[:10]],
-            'resume_formatting_improvements': [rec for rec in analysis_results.get('recommendations', []) if "format" in rec.lower()],
-            'content_improvements': roadmap.get('steps', [])
-        }
+                # Parse and analyze
+                parsed_resume = parser.parse(resume_text)
+                remember_candidate(resume_text, parsed_resume, resume_filename)
+                analysis_results = analyzer.analyze(resume_text, parsed_resume, job_description, layout=layout)
+                value = {'parsed_resume': parsed_resume, 'analysis_results': analysis_results}
+                result_cache.put(cache_key, value)
+                return value
+            
+            # A concurrent request for the same resume and JD shares this result
+            cached = inflight.do(cache_key, compute, lambda: result_cache.get(cache_key))
+        parsed_resume = cached['parsed_resume']
+        analysis_results = cached['analysis_results']
         
-        # 6. Advanced Visualization Items (New Phase 2)
-        skill_heatmap = {
-            'technical': len(key_sections['skills']['technical']),
-            'tools': len(key_sections['skills']['tools']),
-            'soft': len(key_sections['skills']['soft_skills'])
-        }
+        response_data = build_analysis_response(resume_filename, parsed_resume, analysis_results,
+                                                include_report=shape.include_report)
         
-        # Prepare reports for compatibility (in-memory names)
-        reports = {
-            'text': f"{resume_filename.rsplit('.', 1)[0]}_report.txt",
-            'json': f"{resume_filename.rsplit('.', 1)[0]}_report.json",
-            'excel': f"{resume_filename.rsplit('.', 1)[0]}_report.xlsx"
-        }
+        print(f"✅ Analysis complete for: {response_data['recruiter_insights']['candidate_details']['name']}")
+        return Response(dumps(shape.apply(response_data)), mimetype='application/json')
+    
+    except ValueError as e:
+        # Unsupported or rejected document (see TextExtractor.preflight)
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
-        # Final JSON Response (Combined for compatibility and new requirements)
-        response_data = {
+@app.route('/analyze/stream', methods=['POST'])
+def analyze_stream():
+    """
+    Streaming variant of /analyze.
+    Sends Server-Sent Events as each pipeline step finishes; the 'final'
+    event carries the same payload as /analyze, 'error' reports a failure.
+    """
+    # Taken before reading the upload, so shed requests cost no I/O; the
+    # slot is held by the worker thread until the pipeline finishes
+    controller = admission['analysis']
+    try:
+        controller.acquire()
+    except Overloaded as e:
+        return overloaded_response(e)
+    started = time.perf_counter()
+    
+    try:
+        resume_filename, resume_bytes, job_description = read_analysis_upload(request.files, request.form)
+    except ValueError as e:
+        controller.release()
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        controller.release()
+        return jsonify({'error': str(e)}), 500
+    except BaseException:
+        controller.release()
+        raise
+    
+    # The pipeline reports stages through a callback, so it runs in its own
+    # thread and the response generator forwards events as they arrive
+    events = queue.Queue()
+    
+    def work():
+        try:
+            run_streaming_analysis(
+                resume_bytes, resume_filename, job_description,
+                lambda event, data: events.put(format_sse(event, data))
+            )
+        except Exception as e:
+            events.put(format_sse('error', {'error': str(e)}))
+        finally:
+            controller.release(time.perf_counter() - started)
+            events.put(None)
+    
+    threading.Thread(target=work, daemon=True).start()
+    
+    def stream():
+        while True:
+            chunk = events.get()
+            if chunk is None:
+                break
+            yield chunk
+    
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/candidates/search', methods=['POST'])
+@admitted('search')
+def search_candidates():
+    """
+    Shortlist stored resumes for a job description: nearest neighbours from
+    the candidate index, re-ranked by keyword and skill match.
+    Build the index first with `python main.py --build-pool`.
+    """
+    try:
+        data = request.json or {}
+        job_description = data.get('job_description', '')
+        if not job_description:
+            return jsonify({'error': 'job_description is required'}), 400
+        top_k = int(data.get('top_k', 100))
+        
+        started = time.perf_counter()
+        candidates = candidate_index.shortlist(job_description, analyzer, top_k)
+        return jsonify({
             'success': True,
-            'results': {
-                'overall_score': analysis_results['overall_score'],
-                'rating': analysis_results['rating'],
-                'scores': analysis_results['scores'],
-                'strengths': analysis_results.get('strengths', []),
-                'recommendations': analysis_results.get('recommendations', []),
-                'candidate_name': parsed_resume.get('name', 'Not Found'),
-                'contact_info': parsed_resume.get('contact_info', {}),
-                'skills': {
-                    'technical': len(parsed_resume.get('skills', {}).get('all_technical', [])),
-                    'soft': len(parsed_resume.get('skills', {}).get('soft', []))
-                },
-                'sections': parsed_resume.get('sections', {}),
-                'format_check': analysis_results.get('format_check', {}),
-                'impact_analysis': analysis_results.get('impact_analysis', {}),
-                'readability': analysis_results.get('readability', {}),
-                'tone_analysis': analysis_results.get('tone_analysis', {}),
-                'career_analysis': analysis_results.get('career_analysis', {}),
-                'link_validation': analysis_results.get('link_validation', []),
-                'role_suitability': analysis_results.get('role_suitability', []),
-                'career_roadmap': analysis_results.get('career_roadmap', {}),
-                'full_report': report_text
-            },
-            'reports': reports,
-            'recruiter_insights': {
-                'candidate_details': candidate_details,
-                'key_sections': key_sections,
-                'resume_quality': resume_quality,
-                'ats_compatibility': ats_compatibility,
-                'improvement_suggestions': improvement_suggestions,
-                'timeline': timeline_data, # New Timeline Data
-                'skill_heatmap': skill_heatmap  # New Heatmap Data
-            }
-        }
-        
-        print(f"✅ Analysis complete for: {candidate_details['name']}")
-        return jsonify(response_data)
+            'candidates': candidates,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 2)
+        })
     
+    except ValueError as e:
+        # Index not built yet
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -224,6 +550,21 @@ def health():
     """Health check endpoint"""
     return jsonify({'status': 'healthy'})
 
+@app.route('/ready')
+def ready():
+    """Readiness endpoint: 200 once components are warmed up, 503 before"""
+    status = 200 if warmup_state['ready'] else 503
+    return jsonify({
+        'status': 'ready' if warmup_state['ready'] else 'warming_up',
+        'config_version': current_config().version,
+        **warmup_state
+    }), status
+
+@app.route('/metrics')
+def metrics():
+    """Admission control and request coalescing counters of this worker process (Prometheus text format)"""
+    return Response(render_metrics(admission) + inflight.metrics_text(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/generate-cover-letter', methods=['POST'])
 def generate_cover_letter():
     """Generate a tailored cover letter"""
@@ -240,6 +581,7 @@ def generate_cover_letter():
 
 
 @app.route('/compare-jobs', methods=['POST'])
+@admitted('comparison')
 def compare_jobs():
     """Compare resume against multiple job descriptions"""
     try:
@@ -267,29 +609,39 @@ def compare_jobs():
             files = request.files.getlist('jd_files')
             for f in files:
                 if f.filename != '':
-                    filename = secure_filename(f.filename)
-                    path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-                    f.save(path)
-                    text = extractor.extract(path)
-                    jds.append(text)
-                    if os.path.exists(path): os.remove(path)
+                    try:
+                        jds.append(extract_upload_bytes(f.read(), f.filename))
+                    except ValueError as e:
+                        # Rejected by pre-flight (see TextExtractor.preflight)
+                        return jsonify({'error': f"{f.filename}: {str(e)}"}), 400
         
         if not jds:
             return jsonify({'error': 'No job descriptions provided'}), 400
             
-        # Process Resume Logic (Single Extraction)
-        resume_filename = secure_filename(resume_file.filename)
-        resume_path = os.path.join(app.config['UPLOAD_FOLDER'], resume_filename)
-        resume_file.save(resume_path)
-        resume_text = extractor.extract(resume_path)
-        if os.path.exists(resume_path): os.remove(resume_path)
-        
-        parsed_resume = parser.parse(resume_text)
+        # Reuse cached results for JDs this resume was already scored against
+        resume_bytes = resume_file.read()
+        resume_hash = content_hash(resume_bytes)
+        cache_keys = [result_cache.make_key(resume_hash, jd) for jd in jds]
+        jd_results = [(result_cache.get(key) or {}).get('analysis_results') for key in cache_keys]
+        missing = [i for i, res in enumerate(jd_results) if res is None]
+        
+        if missing:
+            # Process Resume Logic (Single Extraction)
+            resume_text, layout = extract_upload_bytes(resume_bytes, resume_file.filename, with_layout=True)
+            
+            parsed_resume = parser.parse(resume_text)
+            
+            # Resume-only stages run once; each JD only adds keyword/skill matching
+            pre_analysis = analyzer.pre_analyze(resume_text, parsed_resume, layout=layout)
+            scored = analyzer.score_job_descriptions(
+                pre_analysis, resume_text, parsed_resume, [jds[i] for i in missing]
+            )
+            for i, res in zip(missing, scored):
+                jd_results[i] = res
+                result_cache.put(cache_keys[i], {'parsed_resume': parsed_resume, 'analysis_results': res})
         
         comparison_results = []
-        for i, jd_text in enumerate(jds):
-            # Run lightweight analysis
-            res = analyzer.analyze(resume_text, parsed_resume, jd_text)
+        for i, res in enumerate(jd_results):
             comparison_results.append({
                 'id': i + 1,
                 'score': res['overall_score'],
@@ -302,10 +654,116 @@ def compare_jobs():
             'comparison': comparison_results
         })
 
+    except ValueError as e:
+        # Unsupported or rejected resume (see TextExtractor.preflight)
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/optimizer/sessions', methods=['POST'])
+@admitted('analysis')
+def create_optimizer_session():
+    """
+    Start a Live Optimizer session.
+    Accepts a resume upload (multipart) or JSON with 'resume_text'.
+    """
+    try:
+        job_description = ""
+        if 'resume' in request.files:
+            resume_file = request.files['resume']
+            if resume_file.filename == '' or not allowed_file(resume_file.filename):
+                return jsonify({'error': 'Invalid file format. Please upload PDF or DOCX'}), 400
+            resume_text = extract_upload_bytes(resume_file.read(), resume_file.filename)
+            job_description = request.form.get('job_description_text', '')
+        else:
+            data = request.get_json(silent=True) or {}
+            resume_text = data.get('resume_text', '')
+            job_description = data.get('job_description', '')
+
+        if not resume_text.strip():
+            return jsonify({'error': 'No resume provided'}), 400
+
+        session_id, parsed_resume, analysis_results = live_optimizer.create_session(resume_text, job_description)
+
+        return jsonify({
+            'success': True,
+            'session_id': session_id,
+            'lines': resume_text.split('\n'),
+            'overall_score': analysis_results['overall_score'],
+            'rating': analysis_results['rating'],
+            'scores': analysis_results['scores'],
+            'recommendations': analysis_results['recommendations'],
+            'strengths': analysis_results['strengths']
+        })
+
+    except ValueError as e:
+        # Unsupported or rejected document (see TextExtractor.preflight)
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/optimizer/sessions/<session_id>/edits', methods=['POST'])
+def edit_optimizer_session(session_id):
+    """
+    Apply an edit to a Live Optimizer session and return updated scores.
+    JSON body: 'text' plus either 'section' or 'start_line'/'end_line' (0-based, end exclusive).
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        if 'text' not in data:
+            return jsonify({'error': 'No replacement text provided'}), 400
+
+        update = live_optimizer.apply_edit(
+            session_id,
+            data['text'],
+            section=data.get('section'),
+            start_line=data.get('start_line'),
+            end_line=data.get('end_line')
+        )
+        return jsonify({'success': True, 'session_id': session_id, **update})
+
+    except KeyError as e:
+        return jsonify({'error': str(e.args[0]) if e.args else 'Session not found'}), 404
+    except SessionConflict as e:
+        return jsonify({'error': str(e)}), 409
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/optimizer/sessions/<session_id>', methods=['DELETE'])
+def close_optimizer_session(session_id):
+    """End a Live Optimizer session"""
+    if not live_optimizer.close_session(session_id):
+        return jsonify({'error': 'Session not found'}), 404
+    return jsonify({'success': True})
+
+
+def chat_reply(message, context):
+    """
+    Answer a chat message.
+    Currently uses mock logic, ready for OpenAI/Gemini integration.
+    """
+    # Mock Logic / Placeholder for LLM
+    response = ""
+
+    if "summary" in message:
+        response = "Your professional summary should be 3-4 lines long and highlight your unique value proposition. Try starting with 'Results-oriented Software Engineer with 5+ years of experience in...'."
+    elif "skill" in message or "python" in message or "java" in message:
+        response = "Based on your resume, you have strong technical skills. Consider adding more 'Tools' like Docker, Kubernetes, or AWS if you have experience with them, as they are highly requested."
+    elif "fix" in message or "improve" in message:
+        response = "I recommend focusing on your 'Work Experience' section. Ensure every bullet point starts with a strong action verb (e.g., Led, Developed, Optimized) and includes a metric."
+    elif "hello" in message or "hi" in message:
+        response = "Hello! I'm your AI Career Assistant. How can I help you optimize your resume today?"
+    else:
+        response = "That's a great question. To improve your ATS score, focus on keyword optimization matching the job description. detailed metrics in your experience, and simple formatting."
+    
+    return response
+
+
 @app.route('/chat', methods=['POST'])
 def chat_with_ai():
     """
@@ -317,19 +775,7 @@ def chat_with_ai():
         message = data.get('message', '').lower()
         context = data.get('context', {}) # Resume data, current score, etc.
         
-        # Mock Logic / Placeholder for LLM
-        response = ""
-        
-        if "summary" in message:
-            response = "Your professional summary should be 3-4 lines long and highlight your unique value proposition. Try starting with 'Results-oriented Software Engineer with 5+ years of experience in...'."
-        elif "skill" in message or "python" in message or "java" in message:
-            response = "Based on your resume, you have strong technical skills. Consider adding more 'Tools' like Docker, Kubernetes, or AWS if you have experience with them, as they are highly requested."
-        elif "fix" in message or "improve" in message:
-            response = "I recommend focusing on your 'Work Experience' section. Ensure every bullet point starts with a strong action verb (e.g., Led, Developed, Optimized) and includes a metric."
-        elif "hello" in message or "hi" in message:
-            response = "Hello! I'm your AI Career Assistant. How can I help you optimize your resume today?"
-        else:
-            response = "That's a great question. To improve your ATS score, focus on keyword optimization matching the job description. detailed metrics in your experience, and simple formatting."
+        response = chat_reply(message, context)
             
         return jsonify({'response': response, 'role': 'assistant'})
 
@@ -337,6 +783,42 @@ def chat_with_ai():
         return jsonify({'error': str(e)}), 500
 
 
+def linkedin_insights(profile_text):
+    """Score a pasted LinkedIn profile"""
+    # 1. Basic parsing (reuse resume parser logic partially)
+    # LinkedIn text often has "About", "Experience", etc.
+    parsed = parser.parse(profile_text)
+
+    # 2. LinkedIn specific checks
+    # - Banner/Headline check (heuristics)
+    has_headline = len(parsed['name'].split()) > 2 # Rough proxy
+
+    # - About section length
+    about_score = 0
+    if parsed['sections'].get('summary'): # Parser detects summary/about
+         about_score = 100
+
+    # - Experience detailedness
+    exp_score = 0
+    if parsed['experience'].get('years_mentioned'):
+         exp_score = 80
+
+    score = (about_score + exp_score + (100 if has_headline else 50)) / 3
+
+    insights = {
+        'overall_score': round(score, 0),
+        'headline_strength': 'Strong' if has_headline else 'Weak (Add keywords)',
+        'about_section': 'Good length' if about_score > 0 else 'Missing or too short',
+        'recommendations': [
+            "Add a custom banner image",
+            "Ensure your headline includes your target role keywords",
+            "Request recommendations from colleagues"
+        ]
+    }
+    
+    return insights
+
+
 @app.route('/analyze-linkedin', methods=['POST'])
 def analyze_linkedin():
     """
@@ -349,42 +831,152 @@ def analyze_linkedin():
         if not profile_text:
             return jsonify({'error': 'No text provided'}), 400
             
-        # 1. Basic parsing (reuse resume parser logic partially)
-        # LinkedIn text often has "About", "Experience", etc.
-        parsed = parser.parse(profile_text)
-        
-        # 2. LinkedIn specific checks
-        # - Banner/Headline check (heuristics)
-        has_headline = len(parsed['name'].split()) > 2 # Rough proxy
-        
-        # - About section length
-        about_score = 0
-        if parsed['sections'].get('summary'): # Parser detects summary/about
-             about_score = 100
-        
-        # - Experience detailedness
-        exp_score = 0
-        if parsed['experience'].get('years_mentioned'):
-             exp_score = 80
-             
-        score = (about_score + exp_score + (100 if has_headline else 50)) / 3
-        
-        insights = {
-            'overall_score': round(score, 0),
-            'headline_strength': 'Strong' if has_headline else 'Weak (Add keywords)',
-            'about_section': 'Good length' if about_score > 0 else 'Missing or too short',
-            'recommendations': [
-                "Add a custom banner image",
-                "Ensure your headline includes your target role keywords",
-                "Request recommendations from colleagues"
-            ]
-        }
+        insights = linkedin_insights(profile_text)
         
         return jsonify({'success': True, 'insights': insights})
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def render_ats_pdf(results):
+    """Render the multi-page ATS report PDF into the upload folder and return its filename"""
+    candidate_name = results.get('candidate_name', 'Candidate')
+    filename = f"Resume_Analysis_{secure_filename(candidate_name)}_{int(datetime.datetime.now().timestamp())}.pdf"
+    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+    from reportlab.lib.enums import TA_CENTER, TA_LEFT
+
+    doc = SimpleDocTemplate(filepath, pagesize=letter, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=72)
+    Story = []
+    styles = getSampleStyleSheet()
+
+    # --- Custom Styles ---
+    styles.add(ParagraphStyle(name='TitleCustom', parent=styles['Heading1'], fontSize=24, leading=28, spaceAfter=20, textColor=colors.HexColor("#2563eb"), alignment=TA_CENTER))
+    styles.add(ParagraphStyle(name='Subtitle', parent=styles['Normal'], fontSize=12, leading=14, spaceAfter=40, textColor=colors.grey, alignment=TA_CENTER))
+    styles.add(ParagraphStyle(name='SectionHeader', parent=styles['Heading2'], fontSize=16, leading=20, spaceBefore=20, spaceAfter=10, textColor=colors.HexColor("#1e40af"), borderPadding=5, borderColor=colors.HexColor("#e5e7eb"), borderWidth=0, borderBottomWidth=1))
+    styles.add(ParagraphStyle(name='ScoreBig', parent=styles['Heading1'], fontSize=48, leading=56, spaceAfter=10, textColor=colors.HexColor("#2563eb"), alignment=TA_CENTER))
+    styles.add(ParagraphStyle(name='NormalCustom', parent=styles['Normal'], fontSize=10, leading=14, spaceAfter=6))
+    styles.add(ParagraphStyle(name='BulletCustom', parent=styles['Bullet'], fontSize=10, leading=14, spaceAfter=4))
+
+    # --- Header Section ---
+    Story.append(Paragraph("Resume Analysis Report", styles['TitleCustom']))
+    Story.append(Paragraph(f"Prepared for: <b>{candidate_name}</b><br/>Date: {datetime.datetime.now().strftime('%B %d, %Y')}", styles['Subtitle']))
+
+    # --- Executive Summary (Score) ---
+    score = results.get('overall_score', 0)
+    rating = results.get('rating', 'Needs Improvement')
+
+    Story.append(Paragraph("ATS Integrity Score", styles['TitleCustom']))
+    Story.append(Paragraph(str(score), styles['ScoreBig']))
+    Story.append(Paragraph(f"<b>Rating: {rating}</b>", styles['Subtitle']))
+
+    # Visual Progress Bar (Table-based)
+    bar_width = 400
+    fill_width = (score / 100) * bar_width
+    color = colors.HexColor("#22c55e") if score > 75 else (colors.HexColor("#f59e0b") if score > 50 else colors.HexColor("#ef4444"))
+
+    # Draw a custom graphic flowable would be better, but table is easier for now
+    # Creating a colored Table to act as a progress bar
+    bar_data = [['', '']]
+    bar_table = Table(bar_data, colWidths=[fill_width, bar_width - fill_width], rowHeights=[15])
+    bar_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (0, 0), color),
+        ('BACKGROUND', (1, 0), (1, 0), colors.HexColor("#f3f4f6")),
+        ('BOX', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('ROUNDEDCORNERS', [5, 5, 5, 5]), # ReportLab 3.6+
+    ]))
+    Story.append(bar_table)
+    Story.append(Spacer(1, 30))
+
+    # --- Section Breakdown Table ---
+    Story.append(Paragraph("Detailed Compliance Audit", styles['SectionHeader']))
+
+    scores = results.get('scores', {})
+    table_data = [['Analysis Category', 'Score', 'Status']]
+
+    for key, val in scores.items():
+        status = "PASS" if val >= 70 else "NEEDS WORK"
+        status_color = colors.HexColor("#22c55e") if val >= 70 else colors.HexColor("#ef4444")
+
+        # Create a Paragraph object for status text to color it
+        p_status = Paragraph(f"<font color='{status_color.hexval()}'><b>{status}</b></font>", styles["Normal"])
+        p_val = f"{val}/100"
+
+        row = [key.replace('_', ' ').title(), p_val, p_status]
+        table_data.append(row)
+
+    t = Table(table_data, colWidths=[3.5*inch, 1.5*inch, 1.5*inch])
+    t.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#f8fafc")),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor("#64748b")),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor("#e2e8f0")),
+        ('ROWBACKGROUNDS', (1, 0), (-1, -1), [colors.white, colors.HexColor("#fcfcfc")]),
+        ('PADDING', (0, 0), (-1, -1), 8),
+    ]))
+    Story.append(t)
+    Story.append(Spacer(1, 20))
+
+    # --- Priority Recommendations ---
+    Story.append(Paragraph("Critical Action Plan (High Priority)", styles['SectionHeader']))
+    recs = results.get('recommendations', [])
+    if not recs:
+        Story.append(Paragraph("Excellent! No critical formatting issues found.", styles['NormalCustom']))
+    else:
+        for rec in recs[:5]: # Top 5
+            # Prepend 'HIGH IMPACT' badge logic if needed, simplify for now
+            Story.append(Paragraph(f"• {rec}", styles['BulletCustom']))
+
+    Story.append(PageBreak())
+
+    # --- Skills Matrix (Page 2) ---
+    Story.append(Paragraph("Strategic Skills Matrix", styles['SectionHeader']))
+
+    # Hard to pass exact lists from 'results' dict without proper parsing in backend
+    # Re-using what we have in 'results' which has 'skills' counts usually
+    # But we want the LISTS. The parser data has lists.
+    # Check if 'skills_list' or similar is in results. If not, use generic advice.
+
+    Story.append(Paragraph("Skills extracted from your document:", styles['NormalCustom']))
+
+    # We need actual skill lists. In current app.py, 'results' mainly has counts.
+    # Let's see if we can get robust data. The 'response_data' in analyze() has 'recruiter_insights'
+    # But here we only receive 'results' key from frontend call.
+    # Frontend calls: generateAtsPdf({ results: this.results() })
+
+    # Workaround: Use text placeholders or simple summary
+    tech_count = results.get('skills', {}).get('technical', 0)
+    soft_count = results.get('skills', {}).get('soft', 0)
+
+    Story.append(Paragraph(f"<b>Technical Skills Identified:</b> {tech_count}", styles['NormalCustom']))
+    Story.append(Paragraph(f"<b>Soft Skills Identified:</b> {soft_count}", styles['NormalCustom']))
+    Story.append(Spacer(1, 10))
+    Story.append(Paragraph("<i>Note: To improve this section, ensure you list specific tools and technologies relevant to your target role (e.g., Python, React, AWS, Leadership).</i>", styles['Subtitle']))
+
+    # --- Career Roadmap ---
+    roadmap = results.get('career_roadmap', {})
+    if roadmap:
+         Story.append(Paragraph(f"Career Trajectory: {roadmap.get('target_next_level', 'Next Level')}", styles['SectionHeader']))
+         for step in roadmap.get('steps', []):
+             Story.append(Paragraph(f"• {step}", styles['BulletCustom']))
+
+    # --- Footer ---
+    Story.append(Spacer(1, 40))
+    Story.append(Paragraph("Generated by Resume Analyzer Pro • AI-Powered Career Optimization", styles['Subtitle']))
+
+    doc.build(Story)
+
+    return filename
+
+
 @app.route('/generate-ats-pdf', methods=['POST'])
 def generate_ats_pdf():
     """
@@ -396,139 +988,7 @@ def generate_ats_pdf():
             return jsonify({'error': 'No data provided'}), 400
             
         results = data.get('results', {})
-        candidate_name = results.get('candidate_name', 'Candidate')
-        filename = f"Resume_Analysis_{secure_filename(candidate_name)}_{int(datetime.datetime.now().timestamp())}.pdf"
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        
-        from reportlab.lib import colors
-        from reportlab.lib.pagesizes import letter
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib.units import inch
-        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
-        from reportlab.lib.enums import TA_CENTER, TA_LEFT
-
-        doc = SimpleDocTemplate(filepath, pagesize=letter, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=72)
-        Story = []
-        styles = getSampleStyleSheet()
-
-        # --- Custom Styles ---
-        styles.add(ParagraphStyle(name='TitleCustom', parent=styles['Heading1'], fontSize=24, leading=28, spaceAfter=20, textColor=colors.HexColor("#2563eb"), alignment=TA_CENTER))
-        styles.add(ParagraphStyle(name='Subtitle', parent=styles['Normal'], fontSize=12, leading=14, spaceAfter=40, textColor=colors.grey, alignment=TA_CENTER))
-        styles.add(ParagraphStyle(name='SectionHeader', parent=styles['Heading2'], fontSize=16, leading=20, spaceBefore=20, spaceAfter=10, textColor=colors.HexColor("#1e40af"), borderPadding=5, borderColor=colors.HexColor("#e5e7eb"), borderWidth=0, borderBottomWidth=1))
-        styles.add(ParagraphStyle(name='ScoreBig', parent=styles['Heading1'], fontSize=48, leading=56, spaceAfter=10, textColor=colors.HexColor("#2563eb"), alignment=TA_CENTER))
-        styles.add(ParagraphStyle(name='NormalCustom', parent=styles['Normal'], fontSize=10, leading=14, spaceAfter=6))
-        styles.add(ParagraphStyle(name='BulletCustom', parent=styles['Bullet'], fontSize=10, leading=14, spaceAfter=4))
-        
-        # --- Header Section ---
-        Story.append(Paragraph("Resume Analysis Report", styles['TitleCustom']))
-        Story.append(Paragraph(f"Prepared for: <b>{candidate_name}</b><br/>Date: {datetime.datetime.now().strftime('%B %d, %Y')}", styles['Subtitle']))
-        
-        # --- Executive Summary (Score) ---
-        score = results.get('overall_score', 0)
-        rating = results.get('rating', 'Needs Improvement')
-        
-        Story.append(Paragraph("ATS Integrity Score", styles['TitleCustom']))
-        Story.append(Paragraph(str(score), styles['ScoreBig']))
-        Story.append(Paragraph(f"<b>Rating: {rating}</b>", styles['Subtitle']))
-        
-        # Visual Progress Bar (Table-based)
-        bar_width = 400
-        fill_width = (score / 100) * bar_width
-        color = colors.HexColor("#22c55e") if score > 75 else (colors.HexColor("#f59e0b") if score > 50 else colors.HexColor("#ef4444"))
-        
-        # Draw a custom graphic flowable would be better, but table is easier for now
-        # Creating a colored Table to act as a progress bar
-        bar_data = [['', '']]
-        bar_table = Table(bar_data, colWidths=[fill_width, bar_width - fill_width], rowHeights=[15])
-        bar_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, 0), color),
-            ('BACKGROUND', (1, 0), (1, 0), colors.HexColor("#f3f4f6")),
-            ('BOX', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('ROUNDEDCORNERS', [5, 5, 5, 5]), # ReportLab 3.6+
-        ]))
-        Story.append(bar_table)
-        Story.append(Spacer(1, 30))
-
-        # --- Section Breakdown Table ---
-        Story.append(Paragraph("Detailed Compliance Audit", styles['SectionHeader']))
-        
-        scores = results.get('scores', {})
-        table_data = [['Analysis Category', 'Score', 'Status']]
-        
-        for key, val in scores.items():
-            status = "PASS" if val >= 70 else "NEEDS WORK"
-            status_color = colors.HexColor("#22c55e") if val >= 70 else colors.HexColor("#ef4444")
-            
-            # Create a Paragraph object for status text to color it
-            p_status = Paragraph(f"<font color='{status_color.hexval()}'><b>{status}</b></font>", styles["Normal"])
-            p_val = f"{val}/100"
-            
-            row = [key.replace('_', ' ').title(), p_val, p_status]
-            table_data.append(row)
-            
-        t = Table(table_data, colWidths=[3.5*inch, 1.5*inch, 1.5*inch])
-        t.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#f8fafc")),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor("#64748b")),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor("#e2e8f0")),
-            ('ROWBACKGROUNDS', (1, 0), (-1, -1), [colors.white, colors.HexColor("#fcfcfc")]),
-            ('PADDING', (0, 0), (-1, -1), 8),
-        ]))
-        Story.append(t)
-        Story.append(Spacer(1, 20))
-
-        # --- Priority Recommendations ---
-        Story.append(Paragraph("Critical Action Plan (High Priority)", styles['SectionHeader']))
-        recs = results.get('recommendations', [])
-        if not recs:
-            Story.append(Paragraph("Excellent! No critical formatting issues found.", styles['NormalCustom']))
-        else:
-            for rec in recs[:5]: # Top 5
-                # Prepend 'HIGH IMPACT' badge logic if needed, simplify for now
-                Story.append(Paragraph(f"• {rec}", styles['BulletCustom']))
-
-        Story.append(PageBreak())
-
-        # --- Skills Matrix (Page 2) ---
-        Story.append(Paragraph("Strategic Skills Matrix", styles['SectionHeader']))
-        
-        # Hard to pass exact lists from 'results' dict without proper parsing in backend
-        # Re-using what we have in 'results' which has 'skills' counts usually
-        # But we want the LISTS. The parser data has lists.
-        # Check if 'skills_list' or similar is in results. If not, use generic advice.
-        
-        Story.append(Paragraph("Skills extracted from your document:", styles['NormalCustom']))
-        
-        # We need actual skill lists. In current app.py, 'results' mainly has counts.
-        # Let's see if we can get robust data. The 'response_data' in analyze() has 'recruiter_insights'
-        # But here we only receive 'results' key from frontend call.
-        # Frontend calls: generateAtsPdf({ results: this.results() })
-        
-        # Workaround: Use text placeholders or simple summary
-        tech_count = results.get('skills', {}).get('technical', 0)
-        soft_count = results.get('skills', {}).get('soft', 0)
-        
-        Story.append(Paragraph(f"<b>Technical Skills Identified:</b> {tech_count}", styles['NormalCustom']))
-        Story.append(Paragraph(f"<b>Soft Skills Identified:</b> {soft_count}", styles['NormalCustom']))
-        Story.append(Spacer(1, 10))
-        Story.append(Paragraph("<i>Note: To improve this section, ensure you list specific tools and technologies relevant to your target role (e.g., Python, React, AWS, Leadership).</i>", styles['Subtitle']))
-
-        # --- Career Roadmap ---
-        roadmap = results.get('career_roadmap', {})
-        if roadmap:
-             Story.append(Paragraph(f"Career Trajectory: {roadmap.get('target_next_level', 'Next Level')}", styles['SectionHeader']))
-             for step in roadmap.get('steps', []):
-                 Story.append(Paragraph(f"• {step}", styles['BulletCustom']))
-
-        # --- Footer ---
-        Story.append(Spacer(1, 40))
-        Story.append(Paragraph("Generated by Resume Analyzer Pro • AI-Powered Career Optimization", styles['Subtitle']))
-        
-        doc.build(Story)
+        filename = render_ats_pdf(results)
         
         return jsonify({
             'success': True, 
@@ -544,4 +1004,6 @@ def download_file(filename):
     return send_file(os.path.join(app.config['UPLOAD_FOLDER'], filename), as_attachment=True)
 
 if __name__ == '__main__':
+    # Development server; use `python server.py` in production
+    warm_up()
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,539 @@
+"""
+ASGI Web Application
+Asyncio-native variant of app.py exposing the same routes. Uploads, link
+checks and chat backends are awaited; parsing and scoring run in a thread
+pool so they never block the event loop.
+
+Usage:
+    hypercorn asgi_app:app --bind 0.0.0.0:5000
+"""
+
+import asyncio
+import functools
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+from quart import Quart, Response, request, jsonify, send_file
+from quart.wrappers.response import DataBody
+from quart_cors import cors
+
+# Components, helpers and settings are shared with the Flask app
+import app as web
+
+app = Quart(__name__)
+app = cors(app, allow_origin="http://localhost:4200", allow_credentials=True)
+app.config['MAX_CONTENT_LENGTH'] = web.app.config['MAX_CONTENT_LENGTH']
+
+# Extraction, parsing and scoring are CPU-bound; keep them off the event loop
+CPU_WORKERS = int(os.environ.get('CPU_WORKERS', os.cpu_count() or 4))
+cpu_executor = ThreadPoolExecutor(max_workers=CPU_WORKERS, thread_name_prefix='analysis')
+
+# Shared HTTP client for link checks and chat backends (opened at startup)
+http = {'client': None}
+
+
+async def run_cpu(func, *args, **kwargs):
+    """Run a blocking function in the CPU executor and await its result"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(cpu_executor, functools.partial(func, *args, **kwargs))
+
+
+@app.after_request
+async def compress_response(response):
+    """gzip/brotli-encode JSON bodies when the client's Accept-Encoding allows it"""
+    if not isinstance(response.response, DataBody):
+        # Server-Sent Events and files are sent as they are
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = web.negotiate_encoding(request.headers.get('Accept-Encoding'))
+    if encoding and web.should_compress(response.status_code, response.mimetype, response.headers,
+                                        response.content_length or 0):
+        body = await response.get_data()
+        response.set_data(await run_cpu(web.compress, body, encoding))
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def overloaded_response(error):
+    """503 telling the client when to try again"""
+    response = jsonify({'error': str(error), 'retry_after': error.retry_after})
+    return response, 503, {'Retry-After': str(error.retry_after)}
+
+
+def admitted(endpoint_class):
+    """
+    Run the view only once web.admission[endpoint_class] grants a slot; 503 if
+    it is overloaded. Admission happens before the upload body is read, so
+    turned-away requests cost almost nothing.
+    """
+    def decorate(view):
+        @functools.wraps(view)
+        async def wrapper(*args, **kwargs):
+            if request.method == 'OPTIONS':
+                return await view(*args, **kwargs)
+            controller = web.admission[endpoint_class]
+            try:
+                await controller.acquire_async()
+            except web.Overloaded as e:
+                return overloaded_response(e)
+            started = time.perf_counter()
+            try:
+                return await view(*args, **kwargs)
+            finally:
+                controller.release(time.perf_counter() - started)
+        return wrapper
+    return decorate
+
+
+async def chat_backend(message, context):
+    """
+    Answer a chat message.
+    Replace with an awaited LLM call (e.g. via http['client']); the mock
+    answer is instant, so it runs inline.
+    """
+    return web.chat_reply(message, context)
+
+
+async def analyze_text(resume_text, job_description="", layout=None):
+    """Parse and score a resume while its profile links are checked concurrently"""
+    parsed_resume = await run_cpu(web.parser.parse, resume_text)
+    analysis_results, links = await asyncio.gather(
+        run_cpu(web.analyzer.analyze, resume_text, parsed_resume, job_description,
+                validate_links=False, layout=layout),
+        web.analyzer.advanced.validate_links_async(parsed_resume.get('contact_info', {}), http['client'])
+    )
+    analysis_results['link_validation'] = links
+    return parsed_resume, analysis_results
+
+
+@app.before_serving
+async def startup():
+    http['client'] = httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=200, max_keepalive_connections=50)
+    )
+    state = await run_cpu(web.warm_up)
+    if state['error']:
+        print(f"⚠️ Warm-up failed: {state['error']}")
+
+
+@app.after_serving
+async def shutdown():
+    await http['client'].aclose()
+    cpu_executor.shutdown(wait=False)
+
+
+@app.route('/analyze', methods=['POST', 'OPTIONS'])
+@admitted('analysis')
+async def analyze():
+    """Analyze resume endpoint"""
+    if request.method == 'OPTIONS':
+        return jsonify({'status': 'ok'}), 200
+
+    try:
+        # ?fields=, ?profile= and ?compact= trim the payload (see ResponseShape)
+        shape = web.ResponseShape.from_args(request.args)
+
+        # The request body is received asynchronously
+        files = await request.files
+        form = await request.form
+
+        resume_filename, resume_bytes, job_description = await run_cpu(web.read_analysis_upload, files, form)
+
+        cache_key = web.result_cache.make_key(web.content_hash(resume_bytes), job_description)
+        cached = await run_cpu(web.result_cache.get, cache_key)
+        if not cached:
+            async def compute():
+                resume_text, layout = await run_cpu(web.extract_upload_bytes, resume_bytes, resume_filename,
+                                                    with_layout=True)
+                parsed_resume, analysis_results = await analyze_text(resume_text, job_description, layout)
+                await run_cpu(web.remember_candidate, resume_text, parsed_resume, resume_filename)
+                value = {'parsed_resume': parsed_resume, 'analysis_results': analysis_results}
+                await run_cpu(web.result_cache.put, cache_key, value)
+                return value
+
+            # A concurrent request for the same resume and JD shares this result
+            cached = await web.inflight.do_async(cache_key, compute, functools.partial(web.result_cache.get, cache_key))
+        parsed_resume = cached['parsed_resume']
+        analysis_results = cached['analysis_results']
+
+        response_data = await run_cpu(web.build_analysis_response, resume_filename, parsed_resume, analysis_results,
+                                      include_report=shape.include_report)
+        body = await run_cpu(lambda: web.dumps(shape.apply(response_data)))
+        return Response(body, mimetype='application/json')
+
+    except ValueError as e:
+        # Unsupported or rejected document (see TextExtractor.preflight)
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/analyze/stream', methods=['POST'])
+async def analyze_stream():
+    """
+    Streaming variant of /analyze.
+    Sends Server-Sent Events as each pipeline step finishes; the 'final'
+    event carries the same payload as /analyze, 'error' reports a failure.
+    """
+    # The slot is held until the pipeline finishes, not just until the response starts
+    controller = web.admission['analysis']
+    try:
+        await controller.acquire_async()
+    except web.Overloaded as e:
+        return overloaded_response(e)
+    started = time.perf_counter()
+
+    try:
+        files = await request.files
+        form = await request.form
+        resume_filename, resume_bytes, job_description = await run_cpu(web.read_analysis_upload, files, form)
+    except ValueError as e:
+        controller.release()
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        controller.release()
+        return jsonify({'error': str(e)}), 500
+    except BaseException:
+        # Client disconnected while uploading
+        controller.release()
+        raise
+
+    loop = asyncio.get_running_loop()
+    events = asyncio.Queue()
+
+    def emit(event, data):
+        # Called from the executor thread
+        loop.call_soon_threadsafe(events.put_nowait, web.format_sse(event, data))
+
+    async def work():
+        try:
+            staged = await run_cpu(web.run_streaming_analysis, resume_bytes, resume_filename, job_description,
+                                   emit, check_links=False)
+            if staged is not None:
+                # Links are awaited on the event loop instead of blocking a CPU worker
+                cache_key, parsed_resume, analysis_results = staged
+                links = await web.analyzer.advanced.validate_links_async(
+                    parsed_resume.get('contact_info', {}), http['client']
+                )
+                await run_cpu(web.finish_streaming_analysis, cache_key, resume_filename,
+                              parsed_resume, analysis_results, links, emit)
+        except Exception as e:
+            emit('error', {'error': str(e)})
+        finally:
+            controller.release(time.perf_counter() - started)
+            loop.call_soon_threadsafe(events.put_nowait, None)
+
+    task = asyncio.ensure_future(work())
+
+    async def stream():
+        try:
+            while True:
+                chunk = await events.get()
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            await task
+
+    return stream(), 200, {
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    }
+
+
+@app.route('/candidates/search', methods=['POST'])
+@admitted('search')
+async def search_candidates():
+    """Shortlist stored resumes for a job description (see app.search_candidates)"""
+    try:
+        data = await request.get_json() or {}
+        job_description = data.get('job_description', '')
+        if not job_description:
+            return jsonify({'error': 'job_description is required'}), 400
+        top_k = int(data.get('top_k', 100))
+
+        started = time.perf_counter()
+        candidates = await run_cpu(web.candidate_index.shortlist, job_description, web.analyzer, top_k)
+        return jsonify({
+            'success': True,
+            'candidates': candidates,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 2)
+        })
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/health')
+async def health():
+    """Health check endpoint"""
+    return jsonify({'status': 'healthy'})
+
+
+@app.route('/ready')
+async def ready():
+    """Readiness endpoint: 200 once components are warmed up, 503 before"""
+    state = web.warmup_state
+    status = 200 if state['ready'] else 503
+    return jsonify({
+        'status': 'ready' if state['ready'] else 'warming_up',
+        'config_version': web.current_config().version,
+        **state
+    }), status
+
+
+@app.route('/metrics')
+async def metrics():
+    """Admission control and request coalescing counters of this process (Prometheus text format)"""
+    return Response(web.render_metrics(web.admission) + web.inflight.metrics_text(),
+                    mimetype='text/plain; version=0.0.4')
+
+
+@app.route('/generate-cover-letter', methods=['POST'])
+async def generate_cover_letter():
+    """Generate a tailored cover letter"""
+    try:
+        data = await request.get_json()
+        name = data.get('name', 'Applicant')
+        skills = data.get('skills', {})
+        jd = data.get('job_description', '')
+
+        letter = await run_cpu(web.analyzer.advanced.generate_cover_letter, name, skills, jd)
+        return jsonify({'success': True, 'cover_letter': letter})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/compare-jobs', methods=['POST'])
+@admitted('comparison')
+async def compare_jobs():
+    """Compare resume against multiple job descriptions"""
+    try:
+        files = await request.files
+        form = await request.form
+
+        if 'resume' not in files:
+            return jsonify({'error': 'No resume file provided'}), 400
+
+        resume_file = files['resume']
+        resume_bytes = resume_file.read()
+
+        jds = []
+        if 'job_descriptions' in form:
+            try:
+                jds = json.loads(form['job_descriptions'])
+            except ValueError:
+                pass
+
+        # JD files are extracted concurrently
+        async def extract_jd(jd_file):
+            try:
+                return await run_cpu(web.extract_upload_bytes, jd_file.read(), jd_file.filename)
+            except ValueError as e:
+                raise ValueError(f"{jd_file.filename}: {str(e)}")
+
+        jd_files = [f for f in files.getlist('jd_files') if f.filename != '']
+        jds.extend(await asyncio.gather(*(extract_jd(f) for f in jd_files)))
+
+        if not jds:
+            return jsonify({'error': 'No job descriptions provided'}), 400
+
+        resume_hash = web.content_hash(resume_bytes)
+        cache_keys = [web.result_cache.make_key(resume_hash, jd) for jd in jds]
+        jd_results = [(cached or {}).get('analysis_results') for cached in
+                      await asyncio.gather(*(run_cpu(web.result_cache.get, key) for key in cache_keys))]
+        missing = [i for i, res in enumerate(jd_results) if res is None]
+
+        if missing:
+            resume_text, layout = await run_cpu(web.extract_upload_bytes, resume_bytes, resume_file.filename,
+                                                with_layout=True)
+            parsed_resume = await run_cpu(web.parser.parse, resume_text)
+
+            pre_analysis, links = await asyncio.gather(
+                run_cpu(web.analyzer.pre_analyze, resume_text, parsed_resume, validate_links=False, layout=layout),
+                web.analyzer.advanced.validate_links_async(parsed_resume.get('contact_info', {}), http['client'])
+            )
+            pre_analysis['link_validation'] = links
+            scored = await run_cpu(
+                web.analyzer.score_job_descriptions,
+                pre_analysis, resume_text, parsed_resume, [jds[i] for i in missing]
+            )
+            for i, res in zip(missing, scored):
+                jd_results[i] = res
+                await run_cpu(web.result_cache.put, cache_keys[i],
+                              {'parsed_resume': parsed_resume, 'analysis_results': res})
+
+        comparison_results = []
+        for i, res in enumerate(jd_results):
+            comparison_results.append({
+                'id': i + 1,
+                'score': res['overall_score'],
+                'rating': res['rating'],
+                'missing_keywords': res.get('keyword_match', {}).get('missing_keywords', [])[:5]
+            })
+
+        return jsonify({
+            'success': True,
+            'comparison': comparison_results
+        })
+
+    except ValueError as e:
+        # Unsupported or rejected resume or JD file (see TextExtractor.preflight)
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/optimizer/sessions', methods=['POST'])
+@admitted('analysis')
+async def create_optimizer_session():
+    """
+    Start a Live Optimizer session.
+    Accepts a resume upload (multipart) or JSON with 'resume_text'.
+    """
+    try:
+        job_description = ""
+        files = await request.files
+        if 'resume' in files:
+            resume_file = files['resume']
+            if resume_file.filename == '' or not web.allowed_file(resume_file.filename):
+                return jsonify({'error': 'Invalid file format. Please upload PDF or DOCX'}), 400
+            resume_text = await run_cpu(web.extract_upload_bytes, resume_file.read(), resume_file.filename)
+            job_description = (await request.form).get('job_description_text', '')
+        else:
+            data = await request.get_json(silent=True) or {}
+            resume_text = data.get('resume_text', '')
+            job_description = data.get('job_description', '')
+
+        if not resume_text.strip():
+            return jsonify({'error': 'No resume provided'}), 400
+
+        session_id, parsed_resume, analysis_results = await run_cpu(
+            web.live_optimizer.create_session, resume_text, job_description
+        )
+
+        return jsonify({
+            'success': True,
+            'session_id': session_id,
+            'lines': resume_text.split('\n'),
+            'overall_score': analysis_results['overall_score'],
+            'rating': analysis_results['rating'],
+            'scores': analysis_results['scores'],
+            'recommendations': analysis_results['recommendations'],
+            'strengths': analysis_results['strengths']
+        })
+
+    except ValueError as e:
+        # Unsupported or rejected document (see TextExtractor.preflight)
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/optimizer/sessions/<session_id>/edits', methods=['POST'])
+async def edit_optimizer_session(session_id):
+    """
+    Apply an edit to a Live Optimizer session and return updated scores.
+    JSON body: 'text' plus either 'section' or 'start_line'/'end_line' (0-based, end exclusive).
+    """
+    try:
+        data = await request.get_json(silent=True) or {}
+        if 'text' not in data:
+            return jsonify({'error': 'No replacement text provided'}), 400
+
+        update = await run_cpu(
+            web.live_optimizer.apply_edit,
+            session_id,
+            data['text'],
+            section=data.get('section'),
+            start_line=data.get('start_line'),
+            end_line=data.get('end_line')
+        )
+        return jsonify({'success': True, 'session_id': session_id, **update})
+
+    except KeyError as e:
+        return jsonify({'error': str(e.args[0]) if e.args else 'Session not found'}), 404
+    except web.SessionConflict as e:
+        return jsonify({'error': str(e)}), 409
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/optimizer/sessions/<session_id>', methods=['DELETE'])
+async def close_optimizer_session(session_id):
+    """End a Live Optimizer session"""
+    if not web.live_optimizer.close_session(session_id):
+        return jsonify({'error': 'Session not found'}), 404
+    return jsonify({'success': True})
+
+
+@app.route('/chat', methods=['POST'])
+async def chat_with_ai():
+    """AI Career Assistant Chat Endpoint"""
+    try:
+        data = await request.get_json()
+        message = data.get('message', '').lower()
+        context = data.get('context', {})
+
+        response = await chat_backend(message, context)
+
+        return jsonify({'response': response, 'role': 'assistant'})
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/analyze-linkedin', methods=['POST'])
+async def analyze_linkedin():
+    """Analyze LinkedIn Profile Text"""
+    try:
+        data = await request.get_json()
+        profile_text = data.get('text', '')
+
+        if not profile_text:
+            return jsonify({'error': 'No text provided'}), 400
+
+        insights = await run_cpu(web.linkedin_insights, profile_text)
+
+        return jsonify({'success': True, 'insights': insights})
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/generate-ats-pdf', methods=['POST'])
+async def generate_ats_pdf():
+    """Generate the multi-page PDF report (rendered in the CPU executor)"""
+    try:
+        data = await request.get_json()
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
+
+        filename = await run_cpu(web.render_ats_pdf, data.get('results', {}))
+
+        return jsonify({
+            'success': True,
+            'download_url': f"http://localhost:5000/download/{filename}"
+        })
+
+    except Exception as e:
+        print(f"PDF Gen Error: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/download/<filename>')
+async def download_file(filename):
+    return await send_file(os.path.join(web.app.config['UPLOAD_FOLDER'], filename), as_attachment=True)
+
+
+if __name__ == '__main__':
+    # Development server; use hypercorn in production
+    app.run(host='0.0.0.0', port=5000)
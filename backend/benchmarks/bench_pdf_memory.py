@@ -0,0 +1,105 @@
+"""
+PDF Extraction Memory Benchmark
+Checks that peak RSS of TextExtractor stays flat as the page count grows
+
+Each document is extracted in a fresh process so peaks don't carry over.
+Exits non-zero if the largest document needs more than --max-growth-mb
+above the smallest one.
+
+Usage:
+    python benchmarks/bench_pdf_memory.py --pages 5 40 160 --max-growth-mb 25
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+LINES_PER_PAGE = 45
+LINE_TEXT = "Developed scalable Python services on AWS, reducing latency by 30% for 2,000 users"
+
+
+def build_pdf(path, pages):
+    """Write a text-only PDF with the given number of full pages"""
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, PageBreak
+
+    style = getSampleStyleSheet()['Normal']
+    story = []
+    for page in range(pages):
+        for line in range(LINES_PER_PAGE):
+            story.append(Paragraph(f"Page {page + 1}, line {line + 1}: {LINE_TEXT}", style))
+        story.append(PageBreak())
+    SimpleDocTemplate(path).build(story)
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_child(path, with_layout):
+    """Extract one document and print 'seconds peak_mb characters'"""
+    from src.text_extractor import TextExtractor
+
+    extractor = TextExtractor()
+    started = time.perf_counter()
+    if with_layout:
+        text, _ = extractor.extract_with_layout(path)
+    else:
+        text = extractor.extract(path)
+    print(f"{time.perf_counter() - started:.3f} {peak_rss_mb():.1f} {len(text)}")
+
+
+def measure(path, with_layout):
+    """Run run_child in a fresh interpreter and return (seconds, peak_mb, characters)"""
+    command = [sys.executable, os.path.abspath(__file__), '--child', path]
+    if with_layout:
+        command.append('--layout')
+    result = subprocess.run(command, capture_output=True, text=True, check=True)
+    seconds, peak, characters = result.stdout.split()
+    return float(seconds), float(peak), int(characters)
+
+
+def main():
+    """Parse arguments, run the benchmark and check the growth limit"""
+    parser = argparse.ArgumentParser(description='Measure peak RSS of PDF extraction by page count')
+    parser.add_argument('--pages', type=int, nargs='+', default=[5, 40, 160])
+    parser.add_argument('--max-growth-mb', type=float, default=25.0,
+                        help='Allowed peak RSS increase from the smallest to the largest document')
+    parser.add_argument('--layout', action='store_true', help='Also collect layout signals')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.layout)
+        return
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        peaks = []
+        print(f"{'pages':>6} {'seconds':>8} {'peak MB':>8} {'chars':>9}")
+        for pages in sorted(args.pages):
+            path = os.path.join(work_dir, f"resume_{pages}.pdf")
+            build_pdf(path, pages)
+            seconds, peak, characters = measure(path, args.layout)
+            peaks.append(peak)
+            print(f"{pages:>6} {seconds:>8.2f} {peak:>8.1f} {characters:>9}")
+
+    growth = peaks[-1] - peaks[0]
+    print(f"\nPeak RSS growth: {growth:.1f} MB (limit {args.max_growth_mb} MB)")
+    if growth > args.max_growth_mb:
+        print("FAIL: peak RSS grows with page count")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Skills Taxonomy Benchmark
+Times snapshot compile, snapshot load and matching for growing taxonomies
+
+Synthetic skills ("skill 17 tool", with one alias each) are added to the
+built-in lists. Exits non-zero if matching the largest taxonomy is more than
+--max-slowdown times slower than the smallest one.
+
+Usage:
+    python benchmarks/bench_skill_taxonomy.py --sizes 1000 20000 100000 --max-slowdown 2
+"""
+
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+from src.skill_taxonomy import load_matcher
+
+SAMPLE_TEXT = """Senior Software Engineer with 6 years of experience.
+Built microservices in Python, Go and Node.js on AWS with k8s and Docker.
+Led migration from MySQL to Postgres; added CI/CD with Jenkins and GitHub Actions.
+Frontend work in ReactJS and TypeScript, tested with pytest and Selenium.
+Mentored 4 engineers and practiced Agile/Scrum with strong communication skills.
+"""
+
+MATCH_ROUNDS = 200
+
+
+def write_taxonomy(path, size):
+    """Write a CSV taxonomy with `size` synthetic skills"""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['canonical', 'aliases', 'category'])
+        for i in range(size):
+            writer.writerow([f"skill {i} tool", f"skill{i}", f"category_{i % 50}"])
+
+
+def time_match(matcher):
+    """Average microseconds per match of SAMPLE_TEXT, bypassing the result cache"""
+    started = time.perf_counter()
+    for round_no in range(MATCH_ROUNDS):
+        matcher.match(SAMPLE_TEXT + str(round_no))
+    return (time.perf_counter() - started) / MATCH_ROUNDS * 1e6
+
+
+def main():
+    """Parse arguments, run the benchmark and check the slowdown limit"""
+    parser = argparse.ArgumentParser(description='Measure skills snapshot load and match time by taxonomy size')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 20000, 100000])
+    parser.add_argument('--max-slowdown', type=float, default=2.0,
+                        help='Allowed match time ratio between the largest and smallest taxonomy')
+    args = parser.parse_args()
+
+    match_times = []
+    print(f"{'skills':>7} {'compile ms':>11} {'load ms':>8} {'snapshot KB':>12} {'match us':>9}")
+    with tempfile.TemporaryDirectory() as work_dir:
+        for size in sorted(args.sizes):
+            source = os.path.join(work_dir, f"taxonomy_{size}.csv")
+            snapshot_dir = os.path.join(work_dir, f"snapshots_{size}")
+            write_taxonomy(source, size)
+
+            started = time.perf_counter()
+            load_matcher(source, snapshot_dir).close()
+            compile_ms = (time.perf_counter() - started) * 1000
+
+            started = time.perf_counter()
+            matcher = load_matcher(source, snapshot_dir)
+            load_ms = (time.perf_counter() - started) * 1000
+
+            match_us = time_match(matcher)
+            match_times.append(match_us)
+            snapshot_kb = os.path.getsize(matcher.path) / 1024
+            matcher.close()
+            print(f"{size:>7} {compile_ms:>11.1f} {load_ms:>8.1f} {snapshot_kb:>12.0f} {match_us:>9.0f}")
+
+    slowdown = match_times[-1] / match_times[0]
+    print(f"\nMatch time ratio largest/smallest: {slowdown:.2f} (limit {args.max_slowdown})")
+    if slowdown > args.max_slowdown:
+        print("FAIL: match time grows with taxonomy size")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
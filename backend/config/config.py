@@ -3,6 +3,9 @@ Configuration file for ATS Resume Analyzer
 Contains skills database, keywords, and settings
 """
 
+import os
+import tempfile
+
 # Technical Skills Database
 TECHNICAL_SKILLS = {
     'programming_languages': [
@@ -48,6 +51,159 @@ SOFT_SKILLS = [
     'Presentation', 'Interpersonal', 'Organizational', 'Strategic Planning'
 ]
 
+# Other spellings matched as the canonical skill. Short forms that are also
+# parts of other names or ordinary words ("JS", "TS", "ML", "kube", "Mongo",
+# and ".NET", which tokenizes to "net") are left out: "JS" would be found
+# inside "Node JS" and "Next JS" too.
+SKILL_ALIASES = {
+    'JavaScript': ['ECMAScript', 'ES6'],
+    'C++': ['CPP'],
+    'C#': ['CSharp', 'C Sharp'],
+    'Go': ['Golang'],
+    'React': ['ReactJS', 'React.js', 'React JS'],
+    'Angular': ['AngularJS', 'Angular.js', 'Angular JS'],
+    'Vue.js': ['Vue', 'VueJS', 'Vue JS'],
+    'Node.js': ['NodeJS', 'Node JS'],
+    'Express.js': ['ExpressJS', 'Express JS'],
+    'Next.js': ['NextJS', 'Next JS'],
+    'ASP.NET': ['ASP.NET Core', 'dotnet'],
+    'REST API': ['REST APIs', 'RESTful API', 'RESTful APIs'],
+    'PostgreSQL': ['Postgres', 'psql'],
+    'MongoDB': ['Mongo DB'],
+    'SQL Server': ['MSSQL', 'MS SQL'],
+    'Elasticsearch': ['Elastic Search'],
+    'AWS': ['Amazon Web Services'],
+    'Azure': ['Microsoft Azure'],
+    'GCP': ['Google Cloud Platform'],
+    'Kubernetes': ['k8s'],
+    'Scikit-learn': ['sklearn', 'scikit learn'],
+    'NLP': ['Natural Language Processing'],
+    'Spark': ['Apache Spark', 'PySpark'],
+    'Hadoop': ['Apache Hadoop'],
+    'VS Code': ['Visual Studio Code', 'VSCode'],
+    'JIRA': ['Atlassian Jira'],
+    'CI/CD': ['CICD', 'Continuous Integration', 'Continuous Delivery'],
+    'TDD': ['Test-Driven Development', 'Test Driven Development'],
+    'Microservices': ['Microservice', 'Micro-services'],
+    'Problem Solving': ['Problem-solving'],
+    'Teamwork': ['Team Work', 'Team Player'],
+    'Detail-oriented': ['Detail oriented', 'Attention to Detail'],
+    'Self-motivated': ['Self motivated', 'Self-starter']
+}
+
+# Skills taxonomy: the lists above plus an optional external JSON/CSV file
+# (canonical, aliases, category), compiled once into a binary snapshot
+SKILLS_TAXONOMY = {
+    'source': os.environ.get('SKILLS_TAXONOMY_PATH') or None,
+    'snapshot_dir': os.environ.get(
+        'SKILLS_SNAPSHOT_DIR',
+        os.path.join(tempfile.gettempdir(), 'resume_analyzer', 'skills')
+    )
+}
+
+# Typo-tolerant skill matching, reported apart from exact matches (skills['fuzzy'])
+FUZZY_SKILLS = {
+    'enabled': True,
+    'max_distance': 2,
+    'distance_thresholds': [7, 10],  # characters needed before 1 and 2 edits are allowed
+    'max_ngram': 3,                  # text tokens joined when looking up one spelling
+    'prefix_length': 7,              # characters of each spelling in the delete index
+    'budget_ms': 25                  # per-document time limit for fuzzy lookups
+}
+
+# Stored resume pool searched by /candidates/search (see src/candidate_index.py)
+CANDIDATE_INDEX = {
+    'path': os.environ.get(
+        'CANDIDATE_INDEX_DIR',
+        os.path.join(tempfile.gettempdir(), 'resume_analyzer', 'candidates')
+    ),
+    'dimensions': 128,           # SVD dimensions of each resume vector
+    'hash_features': 2 ** 16,    # hashed TF-IDF columns before SVD
+    'fit_sample': 50000,         # resumes used to fit IDF, SVD and IVF centroids
+    'nprobe': 16,                # IVF lists scanned per query
+    'store_analyzed': os.environ.get('STORE_ANALYZED_RESUMES') == '1'  # add /analyze uploads to the pool
+}
+
+# Concurrency limits per endpoint class, per worker process (see src/admission.py).
+# Requests beyond max_concurrent wait in a queue of max_queue; a full queue or a
+# wait longer than max_wait_seconds is answered with 503 and Retry-After.
+ADMISSION_CONTROL = {
+    'analysis': {                # /analyze, /analyze/stream, /optimizer/sessions
+        'max_concurrent': int(os.environ.get('ANALYSIS_CONCURRENCY', os.cpu_count() or 4)),
+        'max_queue': int(os.environ.get('ANALYSIS_QUEUE', 2 * (os.cpu_count() or 4))),
+        'max_wait_seconds': 15,
+        'retry_after': 5
+    },
+    'comparison': {              # /compare-jobs (one resume against many JDs)
+        'max_concurrent': max(1, (os.cpu_count() or 4) // 2),
+        'max_queue': os.cpu_count() or 4,
+        'max_wait_seconds': 15,
+        'retry_after': 10
+    },
+    'search': {                  # /candidates/search
+        'max_concurrent': 2 * (os.cpu_count() or 4),
+        'max_queue': 4 * (os.cpu_count() or 4),
+        'max_wait_seconds': 5,
+        'retry_after': 2
+    }
+}
+
+# Named field sets for /analyze?profile=... (dotted paths into the response; None = everything)
+RESPONSE_PROFILES = {
+    'full': None,
+    'summary': [
+        'results.overall_score', 'results.rating', 'results.scores',
+        'results.candidate_name', 'recruiter_insights.candidate_details'
+    ],
+    'dashboard': [
+        'results.overall_score', 'results.rating', 'results.scores', 'results.strengths',
+        'results.recommendations', 'results.candidate_name', 'results.skills',
+        'results.format_check', 'results.career_analysis', 'results.role_suitability',
+        'recruiter_insights.skill_heatmap', 'recruiter_insights.timeline'
+    ],
+    'recruiter': ['results.overall_score', 'results.rating', 'recruiter_insights', 'reports'],
+    'report': ['results.overall_score', 'results.rating', 'results.full_report']
+}
+
+# gzip/brotli for JSON responses, chosen from the client's Accept-Encoding
+RESPONSE_COMPRESSION = {
+    'min_bytes': 1024,           # smaller bodies are sent as they are
+    'gzip_level': 6,
+    'brotli_quality': 5          # 0-11; higher is smaller but slower
+}
+
+# Coalescing of identical in-flight analyses (see src/singleflight.py)
+SINGLEFLIGHT = {
+    'lock_dir': os.path.join(tempfile.gettempdir(), 'resume_analyzer', 'inflight'),
+    'wait_seconds': 60           # a follower gives up waiting and computes itself
+}
+
+# Parquet export of batch results (see src/columnar_export.py)
+COLUMNAR_EXPORT = {
+    'path': os.environ.get(
+        'RESULTS_DATASET_DIR',
+        os.path.join(tempfile.gettempdir(), 'resume_analyzer', 'dataset')
+    ),
+    'row_group_size': 50000,     # rows buffered before a row group is written
+    'compression': 'zstd'
+}
+
+# main.py --batch: checkpointed runs that --resume-run can continue (see src/batch_run.py)
+BATCH_RUNS = {
+    'path': os.environ.get(
+        'BATCH_RUNS_DIR',
+        os.path.join(tempfile.gettempdir(), 'resume_analyzer', 'runs')
+    ),
+    'checkpoint_every': 50       # items between fsyncs of the run's result files
+}
+
+# main.py --watch: folder ingestion (see src/folder_watcher.py)
+WATCH_FOLDER = {
+    'poll_seconds': 5,           # pause between folder scans
+    'settle_seconds': 2,         # files modified more recently are still being copied
+    'workers': None              # analysis processes (None = CPU count)
+}
+
 # Education Keywords
 EDUCATION_KEYWORDS = [
     'Bachelor', 'Master', 'PhD', 'Doctorate', 'B.Tech', 'M.Tech', 'B.S.',
@@ -121,6 +277,14 @@ ATS_PITFALLS = [
     'shading', 'progress bars', 'infographics', 'fancy fonts'
 ]
 
+# Pre-flight checks run before text extraction
+PREFLIGHT_LIMITS = {
+    'max_pages': 10,             # longer PDFs are analyzed from their first pages only
+    'reject_pages': 100,         # documents longer than this are rejected
+    'max_text_chars': 200000,    # estimated text beyond this is rejected
+    'require_text_layer': True   # reject image-only (scanned) PDFs
+}
+
 # Scoring Weights
 SCORING_WEIGHTS = {
     'keyword_match': 0.25,
@@ -138,4 +302,54 @@ SCORE_THRESHOLDS = {
     'good': 60,
     'fair': 40,
     'poor': 0
-}
\ No newline at end of file
+}
+
+# Live-tunable settings: a JSON file whose keys (scoring_weights,
+# score_thresholds, action_verbs, ats_pitfalls, technical_skills,
+# soft_skills, skill_aliases) replace the constants above. Workers poll it
+# and swap in the new settings without a restart.
+CONFIG_OVERRIDES = {
+    'path': os.environ.get('ANALYZER_CONFIG_PATH') or None,
+    'poll_seconds': float(os.environ.get('CONFIG_POLL_SECONDS', 2))
+}
+
+# Bump when a code change alters analysis results for the same inputs
+ANALYZER_VERSION = 8
+
+
+def compute_config_version(overrides=None):
+    """Hash of every setting that changes analysis results; keys result caches"""
+    import hashlib
+    import json
+    
+    source = SKILLS_TAXONOMY['source']
+    if source and os.path.exists(source):
+        with open(source, 'rb') as f:
+            taxonomy_digest = hashlib.sha256(f.read()).hexdigest()
+    else:
+        taxonomy_digest = None
+    
+    settings = {
+        'analyzer_version': ANALYZER_VERSION,
+        'technical_skills': TECHNICAL_SKILLS,
+        'soft_skills': SOFT_SKILLS,
+        'skill_aliases': SKILL_ALIASES,
+        'skills_taxonomy': taxonomy_digest,
+        'fuzzy_skills': {k: v for k, v in FUZZY_SKILLS.items() if k != 'budget_ms'},
+        'education_keywords': EDUCATION_KEYWORDS,
+        'experience_keywords': EXPERIENCE_KEYWORDS,
+        'section_headers': SECTION_HEADERS,
+        'action_verbs': ACTION_VERBS,
+        'stop_words': sorted(STOP_WORDS),
+        'ats_pitfalls': ATS_PITFALLS,
+        'scoring_weights': SCORING_WEIGHTS,
+        'score_thresholds': SCORE_THRESHOLDS,
+        'ats_format_rules': ATS_FORMAT_RULES,
+        'preflight_limits': PREFLIGHT_LIMITS
+    }
+    settings.update(overrides or {})
+    payload = json.dumps(settings, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+CONFIG_VERSION = compute_config_version()
@@ -15,6 +15,11 @@ from src.text_extractor import TextExtractor
 from src.resume_parser import ResumeParser
 from src.ats_analyzer import ATSAnalyzer
 from src.report_generator import ReportGenerator
+from src.candidate_index import CandidateIndex
+from src.columnar_export import ParquetResultWriter
+from src.folder_watcher import FolderWatcher
+from src.batch_run import BatchRun
+from config.config import CANDIDATE_INDEX
 
 
 import tempfile
@@ -48,7 +53,7 @@ class ATSResumeAnalyzer:
         # Step 1: Extract text from resume
         print(f"📄 Extracting text from: {os.path.basename(resume_path)}")
         try:
-            resume_text = self.extractor.extract(resume_path)
+            resume_text, layout = self.extractor.extract_with_layout(resume_path)
             print(f"✓ Extracted {len(resume_text)} characters\n")
         except Exception as e:
             print(f"✗ Error extracting resume: {str(e)}")
@@ -73,7 +78,7 @@ class ATSResumeAnalyzer:
         
         # Step 4: Analyze
         print("⚡ Running ATS analysis...")
-        analysis_results = self.analyzer.analyze(resume_text, parsed_resume, job_description)
+        analysis_results = self.analyzer.analyze(resume_text, parsed_resume, job_description, layout=layout)
         print(f"✓ Analysis complete\n")
         
         # Step 5: Display results
@@ -115,6 +120,150 @@ class ATSResumeAnalyzer:
         
         return analysis_results
     
+    def analyze_batch(self, paths=None, job_description_path=None, output='excel', resume_run=None):
+        """
+        Analyze many resumes into one Excel workbook and/or a Parquet dataset
+        (one row per candidate)
+        
+        Progress is checkpointed under BATCH_RUNS['path'], so an interrupted
+        run continues with resume_run=<run id>. Resumes that fail are written
+        to the run's errors.jsonl and the batch carries on.
+        
+        Args:
+            paths (list): Resume files or folders of PDF/DOCX/DOC files
+            job_description_path (str): Path to job description file (optional)
+            output (str): 'excel', 'parquet' or 'both'
+            resume_run (str): Id of an earlier run to continue (paths,
+                job description and output are then taken from that run)
+        """
+        if resume_run:
+            run = BatchRun.open(resume_run)
+            print(f"⏯️  Resuming run {run.run_id}: {len(run.done)} done, {len(run.failed)} failed, "
+                  f"{len(run.pending())} to go")
+        else:
+            run = BatchRun.create(self._collect_files(paths), job_description_path, output)
+            print(f"📄 Run {run.run_id}: analyzing {len(run.files)} resumes")
+        
+        job_path = run.info['job_description_path']
+        job_description = self.extractor.extract(job_path) if job_path else ""
+        total = len(run.files)
+        
+        try:
+            for item, file_path in run.pending():
+                source = os.path.basename(file_path)
+                try:
+                    # Rejected files (scanned, oversized, encrypted) are quarantined unread
+                    report = self.extractor.preflight(file_path)
+                    if report['action'] == 'reject':
+                        raise ValueError("; ".join(report['reasons']))
+                    resume_text, layout = self.extractor.extract_with_layout(file_path, max_pages=report['max_pages'])
+                    parsed_resume = self.parser.parse(resume_text)
+                    analysis_results = self.analyzer.analyze(resume_text, parsed_resume, job_description, layout=layout)
+                except Exception as e:
+                    run.fail(item, file_path, e)
+                    print(f"\n✗ {source}: {str(e)}")
+                    continue
+                run.complete(item, source, analysis_results, parsed_resume)
+                print(f"  {item + 1}/{total}", end='\r')
+        except KeyboardInterrupt:
+            run.close()
+            print(f"\n⏸️  Stopped. Continue with: python main.py --resume-run {run.run_id}")
+            return None
+        
+        outputs = {}
+        if run.info['output'] in ('excel', 'both'):
+            filepath, rows = self.report_generator.generate_batch_excel_report(
+                run.results(), f"batch_analysis_{run.run_id}.xlsx"
+            )
+            run.set_output('excel', filepath)
+            outputs['excel'] = filepath
+            print(f"\n✓ Excel report: {filepath} ({rows} candidates)")
+        if run.info['output'] in ('parquet', 'both'):
+            with ParquetResultWriter(run_id=run.run_id) as columnar:
+                for analysis_results, parsed_resume, source in run.results():
+                    columnar.add(analysis_results, parsed_resume, source)
+            run.set_output('parquet', columnar.filepath)
+            outputs['parquet'] = columnar.filepath
+            print(f"\n✓ Parquet file: {columnar.filepath} ({columnar.rows} candidates)")
+        run.close()
+        
+        if run.failed:
+            print(f"⚠️ {len(run.failed)} resumes failed; details in {run.errors_path}")
+        return outputs
+    
+    def watch_folder(self, folder, job_description_path=None, output_format='json', workers=None, once=False):
+        """
+        Keep analyzing resumes that appear or change in a folder
+        
+        Args:
+            folder (str): Folder to watch (subfolders included)
+            job_description_path (str): Path to job description file (optional)
+            output_format (str): 'text', 'json', 'excel' or 'all'
+            workers (int): Analysis processes (default: CPU count)
+            once (bool): Scan a single time and exit
+        """
+        job_description = self.extractor.extract(job_description_path) if job_description_path else ""
+        watcher = FolderWatcher(folder, self.report_generator, job_description, output_format, workers=workers)
+        print(f"👀 Watching {watcher.folder} ({watcher.workers} workers, every {watcher.poll_seconds}s)")
+        print(f"   Reports: {self.results_dir}")
+        print(f"   Manifest: {watcher.manifest.db_path}")
+        return watcher.run(once=once)
+    
+    @staticmethod
+    def _collect_files(paths):
+        """Expand folders into the resume files they contain"""
+        files = []
+        for path in paths:
+            if os.path.isdir(path):
+                files.extend(os.path.join(path, name) for name in sorted(os.listdir(path))
+                             if name.lower().endswith(('.pdf', '.docx', '.doc')))
+            else:
+                files.append(path)
+        return files
+    
+    def add_to_pool(self, paths):
+        """Parse resumes (files or folders of PDF/DOCX/DOC) and store them in the candidate pool"""
+        pool = CandidateIndex(CANDIDATE_INDEX['path'])
+        files = self._collect_files(paths)
+        
+        added = 0
+        for file_path in files:
+            try:
+                resume_text = self.extractor.extract(file_path)
+                pool.add(resume_text, self.parser.parse(resume_text), os.path.basename(file_path))
+                added += 1
+            except Exception as e:
+                print(f"✗ {os.path.basename(file_path)}: {str(e)}")
+        print(f"✓ Added {added} of {len(files)} resumes; the pool holds {pool.count()}")
+        print("💡 Run with --build-pool to index them for --shortlist")
+    
+    def build_pool(self):
+        """Rebuild the candidate index from every stored resume"""
+        pool = CandidateIndex(CANDIDATE_INDEX['path'])
+        print(f"🔧 Indexing {pool.count()} resumes...")
+        meta = pool.build(progress=lambda done, total: print(f"  {done}/{total}", end='\r'))
+        print(f"\n✓ Built {meta['generation']}: {meta['count']} resumes, "
+              f"{meta['dimensions']} dimensions, {meta['nlist']} lists")
+    
+    def shortlist(self, job_description_path, top_k=20):
+        """Print the stored resumes that best fit a job description"""
+        import time
+        
+        pool = CandidateIndex(CANDIDATE_INDEX['path'])
+        job_description = self.extractor.extract(job_description_path)
+        started = time.perf_counter()
+        candidates = pool.shortlist(job_description, self.analyzer, top_k)
+        elapsed = (time.perf_counter() - started) * 1000
+        
+        print(f"\nTop {len(candidates)} candidates ({elapsed:.0f} ms):")
+        print("-" * 80)
+        for rank, candidate in enumerate(candidates, 1):
+            label = candidate['name'] or candidate['filename'] or f"#{candidate['id']}"
+            print(f"{rank:>3}. {label:<40} score {candidate['score']:>6.2f}  "
+                  f"(keywords {candidate['keyword_match']:.0f}, skills {candidate['skills_match']:.0f}, "
+                  f"similarity {candidate['similarity']:.3f})")
+        return candidates
+    
     def _display_results(self, results, parsed_resume):
         """Display analysis results in terminal"""
         print("\n" + "="*80)
@@ -193,6 +342,23 @@ Examples:
   
   # Generate only JSON report
   python main.py --resume data/resumes/john_doe.pdf --format json
+  
+  # Analyze a folder of resumes into one Excel sheet (one row per candidate)
+  python main.py --batch data/resumes/ --jd data/job_descriptions/software_engineer.pdf
+  
+  # Analyze every new or changed resume dropped into a folder (Ctrl+C to stop)
+  python main.py --watch /shared/hr_inbox --jd data/job_descriptions/software_engineer.pdf
+  
+  # Append the same rows to the Parquet dataset used for analytics
+  python main.py --batch data/resumes/ --batch-format parquet
+  
+  # Continue a batch that crashed or was stopped (the run id is printed at start)
+  python main.py --resume-run 20250101-093000-1a2b3c
+  
+  # Store resumes in the candidate pool, index them and shortlist for a JD
+  python main.py --add-to-pool data/resumes/
+  python main.py --build-pool
+  python main.py --shortlist data/job_descriptions/software_engineer.pdf --top 50
         """
     )
     
@@ -214,8 +380,106 @@ Examples:
         help='Output format for reports (default: none - only prints to terminal)'
     )
     
+    parser.add_argument(
+        '--batch', '-b',
+        nargs='+',
+        metavar='PATH',
+        help='Analyze resume files or folders into a single Excel report'
+    )
+    
+    parser.add_argument(
+        '--batch-format',
+        choices=['excel', 'parquet', 'both'],
+        default='excel',
+        help='Output of --batch: one Excel sheet and/or a Parquet file in RESULTS_DATASET_DIR (default: excel)'
+    )
+    
+    parser.add_argument(
+        '--resume-run',
+        metavar='RUN_ID',
+        help='Continue an interrupted --batch run where it stopped'
+    )
+    
+    parser.add_argument(
+        '--watch', '-w',
+        metavar='FOLDER',
+        help='Keep analyzing new or changed resumes in FOLDER (reports as --format, json if none)'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Analysis processes for --watch (default: CPU count)'
+    )
+    
+    parser.add_argument(
+        '--once',
+        action='store_true',
+        help='With --watch: scan the folder a single time and exit'
+    )
+    
+    parser.add_argument(
+        '--add-to-pool',
+        nargs='+',
+        metavar='PATH',
+        help='Store resume files or folders in the candidate pool'
+    )
+    
+    parser.add_argument(
+        '--build-pool',
+        action='store_true',
+        help='(Re)build the candidate index from the stored pool'
+    )
+    
+    parser.add_argument(
+        '--shortlist',
+        metavar='JD_PATH',
+        help='List the pooled resumes that best fit this job description'
+    )
+    
+    parser.add_argument(
+        '--top',
+        type=int,
+        default=20,
+        help='Number of candidates for --shortlist (default: 20)'
+    )
+    
     args = parser.parse_args()
     
+    # Candidate pool commands
+    if args.add_to_pool or args.build_pool or args.shortlist:
+        app = ATSResumeAnalyzer()
+        if args.add_to_pool:
+            app.add_to_pool(args.add_to_pool)
+        if args.build_pool:
+            app.build_pool()
+        if args.shortlist:
+            app.shortlist(args.shortlist, args.top)
+        return
+    
+    if args.resume_run:
+        try:
+            ATSResumeAnalyzer().analyze_batch(resume_run=args.resume_run)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        return
+    
+    if args.batch or args.watch:
+        if args.jd and not os.path.exists(args.jd):
+            print(f"Error: Job description file not found: {args.jd}")
+            sys.exit(1)
+        if args.watch and not os.path.isdir(args.watch):
+            print(f"Error: Folder not found: {args.watch}")
+            sys.exit(1)
+        app = ATSResumeAnalyzer()
+        if args.batch:
+            app.analyze_batch(args.batch, args.jd, output=args.batch_format)
+        else:
+            output_format = 'json' if args.format == 'none' else args.format
+            app.watch_folder(args.watch, args.jd, output_format, args.workers, args.once)
+        return
+    
     resume_path = args.resume
     
     # Auto-find resume if not provided
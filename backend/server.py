@@ -0,0 +1,97 @@
+"""
+Production Server
+Serves the Flask app with gunicorn. The app and all analysis components are
+loaded and warmed up once in the master process before workers are forked,
+so compiled patterns and dictionaries are shared copy-on-write.
+
+Usage:
+    python server.py --workers 4 --threads 4 --bind 0.0.0.0:5000
+"""
+
+import argparse
+import gc
+import multiprocessing
+import os
+
+from gunicorn.app.base import BaseApplication
+
+
+class ResumeAnalyzerServer(BaseApplication):
+    """Embedded gunicorn application with preload and warm-up"""
+
+    def __init__(self, options):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key, value)
+
+    def load(self):
+        # With preload_app this runs once in the master, before fork
+        import app as web
+
+        state = web.warm_up()
+        if state['error']:
+            print(f"⚠️ Warm-up failed: {state['error']}")
+        else:
+            print(f"✅ Warm-up complete in {state['duration_ms']} ms")
+
+        # Move everything allocated so far out of the GC's tracked generations,
+        # so collections in workers don't touch (and un-share) those pages
+        gc.freeze()
+        return web.app
+
+
+def post_fork(server, worker):
+    """Per-worker setup after fork"""
+    # Start workers with a clean young generation; frozen objects stay shared
+    gc.collect()
+
+
+def worker_int(worker):
+    """Log worker shutdowns triggered by recycling or SIGINT"""
+    worker.log.info(f"Worker {worker.pid} shutting down")
+
+
+def build_options(args):
+    """gunicorn settings from CLI arguments"""
+    return {
+        'bind': args.bind,
+        'workers': args.workers,
+        'worker_class': 'gthread',
+        'threads': args.threads,
+        'preload_app': True,
+        # Graceful recycling: a worker exits after finishing its current
+        # requests once it has served max_requests (+ jitter to stagger restarts)
+        'max_requests': args.max_requests,
+        'max_requests_jitter': args.max_requests_jitter,
+        'graceful_timeout': args.graceful_timeout,
+        'timeout': args.timeout,
+        'post_fork': post_fork,
+        'worker_int': worker_int,
+        'accesslog': '-',
+    }
+
+
+def main():
+    """Parse arguments and start the server"""
+    parser = argparse.ArgumentParser(description='Run the ATS Resume Analyzer API in production')
+    parser.add_argument('--bind', default=os.environ.get('BIND', '0.0.0.0:5000'))
+    parser.add_argument('--workers', type=int,
+                        default=int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count())))
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--max-requests', type=int, default=1000,
+                        help='Recycle a worker after this many requests (0 disables)')
+    parser.add_argument('--max-requests-jitter', type=int, default=100)
+    parser.add_argument('--graceful-timeout', type=int, default=30,
+                        help='Seconds a recycled worker gets to finish in-flight requests')
+    parser.add_argument('--timeout', type=int, default=120)
+    args = parser.parse_args()
+
+    ResumeAnalyzerServer(build_options(args)).run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,223 @@
+"""
+Admission Control Module
+Bounds how many CPU-heavy requests run at once, and how many may wait,
+so a traffic spike is turned away quickly (503 + Retry-After) instead of
+slowing every request down to the client's timeout
+"""
+
+import asyncio
+import collections
+import math
+import threading
+import time
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import ADMISSION_CONTROL
+
+
+# Upper bounds (seconds) of the wait-time histogram buckets
+WAIT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 15, 30)
+
+# Weight of the newest request in the average service time
+SERVICE_TIME_ALPHA = 0.2
+
+
+class Overloaded(Exception):
+    """A request was turned away; retry_after is a hint in whole seconds"""
+
+    def __init__(self, endpoint, retry_after, reason):
+        super().__init__(f"Server busy ({endpoint}), retry in {retry_after}s")
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class _Waiter:
+    """A queued request: a thread waits on `event`, a coroutine on `future`"""
+
+    __slots__ = ('event', 'loop', 'future', 'granted')
+
+    def __init__(self, event=None, loop=None, future=None):
+        self.event = event
+        self.loop = loop
+        self.future = future
+        self.granted = False
+
+
+def _wake(future):
+    if not future.done():
+        future.set_result(True)
+
+
+class AdmissionController:
+    """
+    Concurrency limit plus a bounded FIFO wait queue for one endpoint class
+
+    Threads (Flask) use acquire(), coroutines (Quart) use acquire_async();
+    both share the same slots and queue. A finished request hands its slot
+    straight to the oldest waiter, so queued requests are served in order
+    and new arrivals cannot jump the queue.
+    """
+
+    def __init__(self, name, max_concurrent, max_queue, max_wait_seconds, retry_after=5):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_wait_seconds = max_wait_seconds
+        self.retry_after = retry_after
+        self.active = 0
+        self.admitted = 0
+        self.shed = {'queue_full': 0, 'timeout': 0}
+        self.wait_counts = [0] * (len(WAIT_BUCKETS) + 1)
+        self.wait_sum = 0.0
+        self.service_seconds = None
+        self._waiters = collections.deque()
+        self._lock = threading.Lock()
+
+    @property
+    def queued(self):
+        return len(self._waiters)
+
+    def retry_after_seconds(self):
+        """Rough time until a new request would get a slot, from the average service time"""
+        if self.service_seconds is None:
+            return self.retry_after
+        backlog = (len(self._waiters) + 1) / self.max_concurrent
+        return min(120, max(1, math.ceil(self.service_seconds * backlog)))
+
+    def _enter(self, waiter):
+        """Take a free slot (True) or join the queue (False); caller holds the lock"""
+        if self.active < self.max_concurrent and not self._waiters:
+            self.active += 1
+            self._admit(0.0)
+            return True
+        if len(self._waiters) >= self.max_queue:
+            self.shed['queue_full'] += 1
+            raise Overloaded(self.name, self.retry_after_seconds(), 'queue_full')
+        self._waiters.append(waiter)
+        return False
+
+    def _admit(self, waited):
+        """Count an admission and its wait; caller holds the lock"""
+        self.admitted += 1
+        self.wait_sum += waited
+        for i, bound in enumerate(WAIT_BUCKETS):
+            if waited <= bound:
+                self.wait_counts[i] += 1
+                return
+        self.wait_counts[-1] += 1
+
+    def _finish_wait(self, waiter, started):
+        """Account for a waiter whose wait ended; raise if it never got a slot"""
+        with self._lock:
+            if not waiter.granted:
+                self._waiters.remove(waiter)
+                self.shed['timeout'] += 1
+                raise Overloaded(self.name, self.retry_after_seconds(), 'timeout')
+            self._admit(time.perf_counter() - started)
+
+    def acquire(self):
+        """
+        Block until a slot is free
+
+        Raises:
+            Overloaded: If the queue is full or the wait exceeds max_wait_seconds
+        """
+        started = time.perf_counter()
+        waiter = _Waiter(event=threading.Event())
+        with self._lock:
+            if self._enter(waiter):
+                return
+        waiter.event.wait(self.max_wait_seconds)
+        self._finish_wait(waiter, started)
+
+    async def acquire_async(self):
+        """Await a free slot (same rules as acquire)"""
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(loop=loop, future=loop.create_future())
+        with self._lock:
+            if self._enter(waiter):
+                return
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), self.max_wait_seconds)
+        except asyncio.TimeoutError:
+            pass
+        except asyncio.CancelledError:
+            # Client went away while queued: give back a slot handed over meanwhile
+            with self._lock:
+                granted = waiter.granted
+                if not granted:
+                    self._waiters.remove(waiter)
+            if granted:
+                self.release()
+            raise
+        self._finish_wait(waiter, started)
+
+    def release(self, service_seconds=None):
+        """Free a slot (handing it to the oldest waiter), optionally recording how long it was held"""
+        with self._lock:
+            if service_seconds is not None:
+                if self.service_seconds is None:
+                    self.service_seconds = service_seconds
+                else:
+                    self.service_seconds += SERVICE_TIME_ALPHA * (service_seconds - self.service_seconds)
+            if self._waiters:
+                waiter = self._waiters.popleft()
+                waiter.granted = True
+                if waiter.event is not None:
+                    waiter.event.set()
+                else:
+                    waiter.loop.call_soon_threadsafe(_wake, waiter.future)
+            else:
+                self.active -= 1
+
+
+def build_controllers(settings=None):
+    """One AdmissionController per endpoint class in ADMISSION_CONTROL"""
+    settings = ADMISSION_CONTROL if settings is None else settings
+    return {name: AdmissionController(name, **limits) for name, limits in settings.items()}
+
+
+def render_metrics(controllers):
+    """Prometheus text exposition of every controller's gauges and counters"""
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            label_text = ','.join(f'{key}="{val}"' for key, val in labels.items())
+            lines.append(f"{name}{{{label_text}}} {value}")
+
+    items = sorted(controllers.items())
+    metric('ats_admission_in_flight', 'gauge', 'Requests holding a slot',
+           [({'endpoint': name}, c.active) for name, c in items])
+    metric('ats_admission_queue_depth', 'gauge', 'Requests waiting for a slot',
+           [({'endpoint': name}, c.queued) for name, c in items])
+    metric('ats_admission_concurrency_limit', 'gauge', 'Slots per worker process',
+           [({'endpoint': name}, c.max_concurrent) for name, c in items])
+    metric('ats_admission_queue_limit', 'gauge', 'Wait queue size per worker process',
+           [({'endpoint': name}, c.max_queue) for name, c in items])
+    metric('ats_admission_admitted_total', 'counter', 'Requests given a slot',
+           [({'endpoint': name}, c.admitted) for name, c in items])
+    metric('ats_admission_shed_total', 'counter', 'Requests answered with 503',
+           [({'endpoint': name, 'reason': reason}, count)
+            for name, c in items for reason, count in sorted(c.shed.items())])
+    metric('ats_admission_service_seconds', 'gauge', 'Average time a slot is held',
+           [({'endpoint': name}, round(c.service_seconds, 4)) for name, c in items
+            if c.service_seconds is not None])
+
+    lines.append("# HELP ats_admission_wait_seconds Time admitted requests spent queued")
+    lines.append("# TYPE ats_admission_wait_seconds histogram")
+    for name, c in items:
+        cumulative = 0
+        for bound, count in zip(WAIT_BUCKETS + ('+Inf',), c.wait_counts):
+            cumulative += count
+            lines.append(f'ats_admission_wait_seconds_bucket{{endpoint="{name}",le="{bound}"}} {cumulative}')
+        lines.append(f'ats_admission_wait_seconds_sum{{endpoint="{name}"}} {round(c.wait_sum, 6)}')
+        lines.append(f'ats_admission_wait_seconds_count{{endpoint="{name}"}} {c.admitted}')
+    return '\n'.join(lines) + '\n'
@@ -1,9 +1,9 @@
-import re
-import textstat
+import asyncio
 import requests
-from datetime import datetime
-from dateutil import parser as date_parser
 from config.config import ACTION_VERBS
+from src.text_scanner import scan_text
+from src.readability import analyze_readability
+from src.date_ranges import format_month
 
 class AdvancedAnalyzer:
     """Advanced analysis features for resume evaluation"""
@@ -13,30 +13,14 @@ class AdvancedAnalyzer:
 
     def analyze_readability(self, text):
         """Calculate readability scores and tone"""
-        return {
-            'flesch_reading_ease': textstat.flesch_reading_ease(text),
-            'grade_level': textstat.flesch_kincaid_grade(text),
-            'reading_time': textstat.reading_time(text),
-            'word_count': textstat.lexicon_count(text)
-        }
+        return analyze_readability(text)
 
     def check_passive_voice(self, text):
         """Detect passive vs active voice patterns"""
-        # Passive voice usually has 'to be' verb + past participle
-        passive_patterns = [
-            r'\b(?:am|is|are|was|were|be|been|being)\b\s+\w+ed\b',
-            r'\bresponsible\s+for\b',
-            r'\bhelped\s+with\b',
-            r'\bassisted\s+in\b'
-        ]
-        
-        found_passive = []
+        # Passive voice usually has 'to be' verb + past participle, plus weak
+        # phrases like 'responsible for'; see text_scanner.SCAN_PATTERN
         lines = text.split('\n')
-        for line in lines:
-            for pattern in passive_patterns:
-                if re.search(pattern, line, re.IGNORECASE):
-                    found_passive.append(line.strip())
-                    break
+        found_passive = [lines[i].strip() for i in scan_text(text)['passive_lines']]
         
         # Calculate score (100 - (passive count * 5))
         score = max(0, 100 - (len(found_passive) * 5))
@@ -47,36 +31,27 @@ class AdvancedAnalyzer:
             'samples': found_passive[:5]
         }
 
+    def _months_between(self, start, end):
+        """Whole months from one 'YYYY-MM' to another"""
+        start_year, start_month = map(int, start.split('-'))
+        end_year, end_month = map(int, end.split('-'))
+        return (end_year - start_year) * 12 + end_month - start_month
+    
     def analyze_career_path(self, experience_data):
         """Analyze gaps, seniority, and growth"""
-        date_ranges = experience_data.get('date_ranges', [])
+        date_records = experience_data.get('date_records', [])
         titles = experience_data.get('detected_titles', [])
         
-        # 1. Gap Detector
+        # 1. Gap Detector ('YYYY-MM' strings sort chronologically)
         gaps = []
-        parsed_dates = []
-        
-        for dr in date_ranges:
-            try:
-                # Expecting something like "Jan 2020 - Dec 2021"
-                parts = re.split(r'\s*(?:-|to|until)\s*', dr)
-                if len(parts) == 2:
-                    start_str, end_str = parts[0], parts[1]
-                    start_date = date_parser.parse(start_str)
-                    end_date = datetime.now() if 'present' in end_str.lower() else date_parser.parse(end_str)
-                    parsed_dates.append((start_date, end_date))
-            except:
-                continue
-        
-        # Sort by start date
-        parsed_dates.sort(key=lambda x: x[0])
+        parsed_dates = sorted((record['start'], record['end']) for record in date_records)
         
         for i in range(len(parsed_dates) - 1):
             current_end = parsed_dates[i][1]
             next_start = parsed_dates[i+1][0]
-            diff = (next_start - current_end).days
-            if diff > 180: # 6 months
-                gaps.append(f"Gap of {diff // 30} months between {current_end.strftime('%b %Y')} and {next_start.strftime('%b %Y')}")
+            diff = self._months_between(current_end, next_start)
+            if diff >= 6:
+                gaps.append(f"Gap of {diff} months between {format_month(current_end)} and {format_month(next_start)}")
         
         # 2. Seniority Classifier
         seniority = "Entry-Level"
@@ -117,14 +92,17 @@ class AdvancedAnalyzer:
             'career_progression': progression
         }
 
+    def links_to_check(self, contact_info):
+        """(name, url) pairs for the profile links found in contact info"""
+        links = []
+        if contact_info.get('linkedin'): links.append(("LinkedIn", "https://" + contact_info['linkedin']))
+        if contact_info.get('github'): links.append(("GitHub", "https://" + contact_info['github']))
+        return links
+
     def validate_links(self, contact_info):
         """Validate LinkedIn and GitHub profile links"""
         results = []
-        links_to_check = []
-        if contact_info.get('linkedin'): links_to_check.append(("LinkedIn", "https://" + contact_info['linkedin']))
-        if contact_info.get('github'): links_to_check.append(("GitHub", "https://" + contact_info['github']))
-        
-        for name, url in links_to_check:
+        for name, url in self.links_to_check(contact_info):
             try:
                 # Basic check - no heavy redirect following for speed
                 response = requests.head(url, timeout=3, allow_redirects=True)
@@ -135,6 +113,26 @@ class AdvancedAnalyzer:
         
         return results
 
+    async def validate_links_async(self, contact_info, client):
+        """
+        Validate profile links concurrently
+        
+        Args:
+            contact_info (dict): Parsed contact info
+            client: An httpx.AsyncClient (or compatible) owned by the caller
+        """
+        async def check(name, url):
+            try:
+                response = await client.head(url, timeout=3, follow_redirects=True)
+                status = "Active" if response.status_code < 400 else "Broken"
+            except Exception:
+                status = "Timeout/Error"
+            return {'name': name, 'url': url, 'status': status}
+        
+        return list(await asyncio.gather(
+            *(check(name, url) for name, url in self.links_to_check(contact_info))
+        ))
+
     def identify_role_suitability(self, skills):
         """Map skills to professional job roles and calculate suitability"""
         all_skills = [s.lower() for s in skills.get('all_technical', [])]
@@ -5,24 +5,57 @@ Core analysis engine for resume scoring and matching
 
 import re
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import sys
 import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config.config import (
-    SCORING_WEIGHTS, SCORE_THRESHOLDS, STOP_WORDS, 
-    ACTION_VERBS, ATS_PITFALLS
-)
+from config.config import STOP_WORDS, ATS_FORMAT_RULES
 
 
 from src.advanced_analyzer import AdvancedAnalyzer
+from src.text_scanner import scan_text
+from src.resume_parser import section_ranges
+from src.config_store import current_config
+
+@lru_cache(maxsize=32)
+def resume_terms(resume_text):
+    """
+    All 1- to 3-word phrases of the resume, built once per text so each JD
+    keyword is a set lookup instead of a regex scan
+    """
+    tokens = re.findall(r'\b\w+\b', resume_text.lower())
+    terms = set(tokens)
+    for n in (2, 3):
+        terms.update(" ".join(tokens[i:i+n]) for i in range(len(tokens) - n + 1))
+    return frozenset(terms)
+
 
 class ATSAnalyzer:
     """Analyze resume against job description and ATS criteria"""
     
+    # Inputs each cached analysis stage reads: parser output keys plus the
+    # raw 'text' and 'job_description'. Used to skip stages on incremental edits.
+    STAGE_DEPENDENCIES = {
+        'keyword_match': {'text', 'job_description'},
+        'skills_match': {'skills', 'job_description'},
+        'format_check': {'text', 'sections', 'contact_info', 'statistics', 'layout'},
+        'impact_analysis': {'text', 'section_spans'},
+        'readability': {'text'},
+        'tone_analysis': {'text'},
+        'career_analysis': {'experience'},
+        'link_validation': {'contact_info'},
+        'role_suitability': {'skills'},
+        'career_roadmap': {'experience', 'skills'},
+    }
+    
+    # Sections where achievements are written; contact details and education
+    # years are left out of the impact scan
+    IMPACT_SECTIONS = ('summary', 'experience', 'projects', 'achievements')
+    
     def __init__(self):
-        self.weights = SCORING_WEIGHTS
         self.advanced = AdvancedAnalyzer()
         
     def calculate_keyword_match(self, resume_text, job_description):
@@ -33,7 +66,7 @@ class ATSAnalyzer:
         def get_clean_tokens(text):
             return re.findall(r'\b\w+\b', text.lower())
 
-        resume_text_lower = resume_text.lower()
+        resume_phrases = resume_terms(resume_text)
         jd_text_lower = job_description.lower()
         
         # 1. Bi-grams/Tri-grams extraction from JD
@@ -59,8 +92,7 @@ class ATSAnalyzer:
         missing_keywords = []
         
         for kw in all_potential_keywords:
-            pattern = r'\b' + re.escape(kw) + r'\b'
-            if re.search(pattern, resume_text_lower):
+            if kw in resume_phrases:
                 # Weight by frequency in JD
                 weight = jd_word_freq.get(kw, 1)
                 matched_keywords.append({'keyword': kw, 'weight': weight})
@@ -87,11 +119,9 @@ class ATSAnalyzer:
         if not job_description:
             return {'score': 0, 'matched_skills': [], 'missing_skills': []}
 
-        jd_lower = job_description.lower()
-        
         # Get all technical skills from resume
-        all_resume_skills = resume_skills.get('all_technical', [])
-        all_resume_skills += resume_skills.get('soft', [])
+        # Build a new list: parsed_resume is shared across JDs and must not be mutated
+        all_resume_skills = resume_skills.get('all_technical', []) + resume_skills.get('soft', [])
         
         if not all_resume_skills:
             return {
@@ -100,28 +130,12 @@ class ATSAnalyzer:
                 'missing_skills': []
             }
         
+        # Estimate required skills from JD (canonical names, so "k8s" meets "Kubernetes")
+        required_skills = [skill for skill, _ in current_config().skill_matcher.match(job_description)]
+        
         # Find which resume skills appear in JD
-        matched_skills = []
-        for skill in all_resume_skills:
-            pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-            if re.search(pattern, jd_lower):
-                matched_skills.append(skill)
-        
-        # Estimate required skills from JD
-        from config.config import TECHNICAL_SKILLS, SOFT_SKILLS
-        all_possible_skills = []
-        for category_skills in TECHNICAL_SKILLS.values():
-            all_possible_skills.extend(category_skills)
-        all_possible_skills.extend(SOFT_SKILLS)
-        
-        required_skills = []
-        for skill in all_possible_skills:
-            pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-            if re.search(pattern, jd_lower):
-                required_skills.append(skill)
-        
-        # Remove duplicates from required skills
-        required_skills = list(set(required_skills))
+        required_set = set(required_skills)
+        matched_skills = [skill for skill in all_resume_skills if skill in required_set]
         
         if not required_skills:
             score = 50  # Default score if no skills detected in JD
@@ -137,34 +151,26 @@ class ATSAnalyzer:
             'missing_skills': missing_skills
         }
     
-    def calculate_impact_score(self, resume_text):
+    def calculate_impact_score(self, resume_text, section_spans=None):
         """Analyze action verbs and quantifiable metrics"""
-        text_lower = resume_text.lower()
-        
-        # 1. Match Action Verbs
-        found_verbs = []
-        for verb in ACTION_VERBS:
-            pattern = r'\b' + re.escape(verb.lower()) + r'\b'
-            if re.search(pattern, text_lower):
-                found_verbs.append(verb)
-        
-        # 2. Match Quantifiable Metrics (%, $, numbers > 1)
-        # Look for percentages, dollar amounts, or numbers followed by descriptive words
-        metrics_patterns = [
-            r'\d+%',                    # Percentages
-            r'\$\d+',                   # Dollar amounts
-            r'\b\d{1,3}(?:,\d{3})*\b',  # Large numbers
-            r'\d+\s+(?:users|customers|clients|projects|employees|team members|revenue|growth|reduction|improvement)',
-            r'\bincreased\s+by\s+\d+',
-            r'\bsaved\s+\d+',
-            r'\breduced\s+by\s+\d+'
-        ]
+        config = current_config()
+        scan = scan_text(resume_text, config)
+        
+        # Only count what appears inside the impact sections (if any were found)
+        scopes = [(start, end) for name, span in (section_spans or {}).items()
+                  if name in self.IMPACT_SECTIONS for start, end in section_ranges(span)]
+        
+        def in_scope(offset):
+            return not scopes or any(start <= offset < end for start, end in scopes)
+        
+        # 1. Match Action Verbs (unique, in action_verbs order)
+        found_verbs = sorted(
+            {verb for offset, verb in scan['verbs'] if in_scope(offset)},
+            key=lambda verb: config.action_verb_rank[verb.lower()][0]
+        )
         
-        found_metrics = []
-        for pattern in metrics_patterns:
-            matches = re.findall(pattern, text_lower)
-            if matches:
-                found_metrics.extend(matches)
+        # 2. Match Quantifiable Metrics (%, $, numbers, "increased by N", ...)
+        found_metrics = [metric for offset, metric in scan['metrics'] if in_scope(offset)]
         
         # Calculate scores (out of 100)
         verb_score = min(len(found_verbs) * 5, 50)  # Up to 50 points for 10+ verbs
@@ -180,8 +186,16 @@ class ATSAnalyzer:
             'found_metrics_sample': found_metrics[:5]
         }
 
-    def check_format_ats_friendly(self, parsed_resume, resume_text):
-        """Check if resume format is ATS-friendly"""
+    def check_format_ats_friendly(self, parsed_resume, resume_text, layout=None):
+        """
+        Check if resume format is ATS-friendly
+        
+        Args:
+            parsed_resume (dict): Parsed resume data
+            resume_text (str): Full resume text
+            layout (dict): Layout signals from TextExtractor.extract_with_layout
+                (optional); without them, pitfalls are guessed from the text
+        """
         issues = []
         warnings = []
         score = 100
@@ -214,11 +228,14 @@ class ATSAnalyzer:
             issues.append("Resume too long (> 1200 words)")
             score -= 5
         
-        # Check for ATS pitfalls (graphics, icons, etc.)
-        for pitfall in ATS_PITFALLS:
-            if pitfall in resume_text.lower():
-                warnings.append(f"Detected potential ATS block: {pitfall}")
-                score -= 2
+        if layout:
+            score -= self._check_layout(layout, issues, warnings)
+        else:
+            # Check for ATS pitfalls (graphics, icons, etc.)
+            for pitfall in current_config()['ats_pitfalls']:
+                if pitfall in resume_text.lower():
+                    warnings.append(f"Detected potential ATS block: {pitfall}")
+                    score -= 2
         
         # Check for special characters that might confuse ATS
         special_chars = len(re.findall(r'[^\w\s\.\,\-\(\)\@\+\/]', resume_text))
@@ -226,12 +243,70 @@ class ATSAnalyzer:
             issues.append("Too many special characters/symbols")
             score -= 10
         
-        return {
+        result = {
             'score': max(0, score),
             'issues': issues,
             'warnings': warnings,
             'is_ats_friendly': score >= 70
         }
+        if layout:
+            result['layout'] = layout
+        return result
+    
+    def _check_layout(self, layout, issues, warnings):
+        """
+        Flag ATS pitfalls found in the document layout
+        
+        Returns:
+            int: Points to deduct from the format score
+        """
+        penalty = 0
+        
+        if layout.get('columns', 1) > 1:
+            pages = ", ".join(str(p) for p in layout.get('multi_column_pages', [])) or "all"
+            issues.append(f"Multi-column layout detected (page {pages}); ATS may read columns out of order")
+            penalty += 10
+        
+        if layout.get('tables'):
+            warnings.append(f"{layout['tables']} table(s) detected; ATS may scramble table content")
+            penalty += 5
+        
+        if layout.get('images'):
+            warnings.append(f"{layout['images']} image(s)/graphic(s) detected; their content is invisible to ATS")
+            penalty += 5
+        
+        if layout.get('text_boxes'):
+            warnings.append(f"{layout['text_boxes']} text box(es) detected; ATS often skips them")
+            penalty += 5
+        
+        for band in ('header', 'footer'):
+            if layout.get(f'{band}_text'):
+                warnings.append(f"Text in page {band} (\"{layout[f'{band}_text']}\"); keep key details in the body")
+                penalty += 2
+        
+        max_pages = ATS_FORMAT_RULES['max_pages']
+        if layout.get('pages', 0) > max_pages:
+            warnings.append(f"Resume is {layout['pages']} pages (recommended: {max_pages} or fewer)")
+            penalty += 5
+        
+        # Fonts carrying at least 5% of the text, compared by family prefix ("Arial-BoldMT" -> Arial)
+        recommended = [font.lower().replace(' ', '') for font in ATS_FORMAT_RULES['recommended_fonts']]
+        unusual = [
+            font['family'] for font in layout.get('fonts', [])
+            if font['share'] >= 0.05
+            and not font['family'].lower().replace(' ', '').startswith(tuple(recommended))
+        ]
+        if unusual:
+            warnings.append(f"Uncommon font(s): {', '.join(unusual)}; prefer {', '.join(ATS_FORMAT_RULES['recommended_fonts'])}")
+            penalty += 2
+        
+        low, high = ATS_FORMAT_RULES['recommended_font_size']
+        body_size = layout.get('font_sizes', {}).get('body')
+        if body_size and not low <= body_size <= high:
+            warnings.append(f"Body font size {body_size:g}pt (recommended: {low}-{high}pt)")
+            penalty += 2
+        
+        return penalty
     
     def calculate_completeness_score(self, parsed_resume):
         """Calculate completeness score based on information present"""
@@ -271,88 +346,140 @@ class ATSAnalyzer:
         
         return round(score, 2)
     
-    def analyze(self, resume_text, parsed_resume, job_description=""):
+    def stale_stages(self, changed):
+        """Return the analysis stages whose inputs intersect the changed keys"""
+        return {stage for stage, deps in self.STAGE_DEPENDENCIES.items() if deps & changed}
+    
+    def _stage_runner(self, previous, changed, on_stage=None):
         """
-        Perform complete ATS analysis
+        Build a helper that reuses a previous stage result when its inputs are
+        unchanged and reports every finished stage to `on_stage(name, result)`
+        """
+        stale = self.stale_stages(changed) if previous is not None and changed is not None else None
+        
+        def stage(name, compute):
+            if stale is not None and name not in stale and name in previous:
+                result = previous[name]
+            else:
+                result = compute()
+            if on_stage is not None:
+                on_stage(name, result)
+            return result
+        
+        return stage
+    
+    def pre_analyze(self, resume_text, parsed_resume, previous=None, changed=None, validate_links=True,
+                    on_stage=None, layout=None):
+        """
+        Run every analysis stage that does not depend on a job description.
+        Compute it once per resume and pass it to score_job_description for each JD.
         
         Args:
             resume_text (str): Full resume text
             parsed_resume (dict): Parsed resume data
-            job_description (str): Job description text (optional)
+            previous (dict): Earlier results for the same resume (optional)
+            changed (set): Inputs that changed since `previous`
+            validate_links (bool): Set False when the caller checks links
+                itself (e.g. asynchronously); 'link_validation' is left empty
+            on_stage (callable): Called as on_stage(name, result) when each stage finishes
+            layout (dict): Layout signals of the source document (optional)
             
         Returns:
-            dict: Complete analysis results with scores and recommendations
+            dict: Resume-only results and scores
         """
-        results = {
-            'scores': {},
-            'overall_score': 0,
-            'rating': '',
-            'recommendations': [],
-            'strengths': []
-        }
+        stage = self._stage_runner(previous, changed, on_stage)
+        results = {'scores': {}}
         
-        # 1. Keyword Match
-        if job_description:
-            keyword_match = self.calculate_keyword_match(resume_text, job_description)
-            results['keyword_match'] = keyword_match
-            results['scores']['keyword_match'] = keyword_match['score']
-            
-            skills_match = self.calculate_skills_match(parsed_resume['skills'], job_description)
-            results['skills_match'] = skills_match
-            results['scores']['skills_match'] = skills_match['score']
-        else:
-            results['scores']['keyword_match'] = 0
-            results['scores']['skills_match'] = 0
-        
-        # 2. Format & Pitfalls
-        format_check = self.check_format_ats_friendly(parsed_resume, resume_text)
+        # 1. Format & Pitfalls
+        format_check = stage('format_check', lambda: self.check_format_ats_friendly(parsed_resume, resume_text, layout))
         results['format_check'] = format_check
         results['scores']['format_ats_friendly'] = format_check['score']
         
-        # 3. Impact & Metrics
-        impact_results = self.calculate_impact_score(resume_text)
+        # 2. Impact & Metrics
+        impact_results = stage('impact_analysis', lambda: self.calculate_impact_score(resume_text, parsed_resume.get('section_spans')))
         results['impact_analysis'] = impact_results
         results['scores']['impact_score'] = impact_results['score']
         
-        # 4. Completeness
+        # 3. Completeness
         completeness = self.calculate_completeness_score(parsed_resume)
         results['scores']['completeness'] = completeness
         
-        # 5. Advanced Analysis - Readability & Tone
-        results['readability'] = self.advanced.analyze_readability(resume_text)
-        results['tone_analysis'] = self.advanced.check_passive_voice(resume_text)
+        # 4. Advanced Analysis - Readability & Tone
+        results['readability'] = stage('readability', lambda: self.advanced.analyze_readability(resume_text))
+        results['tone_analysis'] = stage('tone_analysis', lambda: self.advanced.check_passive_voice(resume_text))
         
-        # 6. Advanced Analysis - Career Path
-        results['career_analysis'] = self.advanced.analyze_career_path(parsed_resume.get('experience', {}))
+        # 5. Advanced Analysis - Career Path
+        results['career_analysis'] = stage('career_analysis', lambda: self.advanced.analyze_career_path(parsed_resume.get('experience', {})))
         
-        # 7. Advanced Analysis - Link Validation
-        results['link_validation'] = self.advanced.validate_links(parsed_resume.get('contact_info', {}))
+        # 6. Advanced Analysis - Link Validation
+        if validate_links:
+            results['link_validation'] = stage('link_validation', lambda: self.advanced.validate_links(parsed_resume.get('contact_info', {})))
+        else:
+            results['link_validation'] = []
         
-        # 8. Advanced Analysis - Role Suitability & Roadmap
-        results['role_suitability'] = self.advanced.identify_role_suitability(parsed_resume.get('skills', {}))
-        results['career_roadmap'] = self.advanced.generate_roadmap(
+        # 7. Advanced Analysis - Role Suitability & Roadmap
+        results['role_suitability'] = stage('role_suitability', lambda: self.advanced.identify_role_suitability(parsed_resume.get('skills', {})))
+        results['career_roadmap'] = stage('career_roadmap', lambda: self.advanced.generate_roadmap(
             results['career_analysis'].get('seniority_level', 'Entry-Level'),
             results['role_suitability']
-        )
+        ))
         
-        # 9. Experience Relevance (Basic heuristic for now)
+        # 8. Experience Relevance (Basic heuristic for now)
         exp = parsed_resume.get('experience', {})
         exp_score = 50
         if exp.get('has_experience_section'): exp_score += 20
         if exp.get('years_mentioned'): exp_score += 20
         results['scores']['experience_relevance'] = min(exp_score, 100)
         
-        # 6. Education
+        # 9. Education
         edu = parsed_resume.get('education', {})
         edu_score = 0
         if edu.get('degrees'): edu_score = 100
         elif edu.get('has_education_section'): edu_score = 50
         results['scores']['education'] = edu_score
         
+        return results
+    
+    def score_job_description(self, pre_analysis, resume_text, parsed_resume, job_description="",
+                              previous=None, changed=None, on_stage=None):
+        """
+        Add JD matching, the overall score, rating and recommendations to a pre-analysis.
+        `pre_analysis` is not modified, so one pre-analysis can be scored against many JDs.
+        
+        Returns:
+            dict: Complete analysis results with scores and recommendations
+        """
+        stage = self._stage_runner(previous, changed, on_stage)
+        results = dict(pre_analysis)
+        results.update({
+            'overall_score': 0,
+            'rating': '',
+            'recommendations': [],
+            'strengths': []
+        })
+        scores = {}
+        
+        # Keyword Match
+        if job_description:
+            keyword_match = stage('keyword_match', lambda: self.calculate_keyword_match(resume_text, job_description))
+            results['keyword_match'] = keyword_match
+            scores['keyword_match'] = keyword_match['score']
+            
+            skills_match = stage('skills_match', lambda: self.calculate_skills_match(parsed_resume['skills'], job_description))
+            results['skills_match'] = skills_match
+            scores['skills_match'] = skills_match['score']
+        else:
+            scores['keyword_match'] = 0
+            scores['skills_match'] = 0
+        
+        scores.update(pre_analysis['scores'])
+        results['scores'] = scores
+        
         # Calculate weighted overall score
+        config = current_config()
         overall = 0
         if job_description:
-            for score_key, weight in self.weights.items():
+            for score_key, weight in config['scoring_weights'].items():
                 overall += results['scores'].get(score_key, 0) * weight
         else:
             # Without JD, focus on impact, format and completeness
@@ -365,11 +492,12 @@ class ATSAnalyzer:
         results['overall_score'] = round(overall, 2)
         
         # Determine rating
-        if overall >= SCORE_THRESHOLDS['excellent']:
+        thresholds = config['score_thresholds']
+        if overall >= thresholds['excellent']:
             results['rating'] = 'Excellent'
-        elif overall >= SCORE_THRESHOLDS['good']:
+        elif overall >= thresholds['good']:
             results['rating'] = 'Good'
-        elif overall >= SCORE_THRESHOLDS['fair']:
+        elif overall >= thresholds['fair']:
             results['rating'] = 'Fair'
         else:
             results['rating'] = 'Needs Improvement'
@@ -380,6 +508,45 @@ class ATSAnalyzer:
         
         return results
     
+    def analyze(self, resume_text, parsed_resume, job_description="", previous=None, changed=None,
+                validate_links=True, on_stage=None, layout=None):
+        """
+        Perform complete ATS analysis
+        
+        Args:
+            resume_text (str): Full resume text
+            parsed_resume (dict): Parsed resume data
+            job_description (str): Job description text (optional)
+            previous (dict): Earlier results for the same resume (optional)
+            changed (set): Inputs that changed since `previous`; stages that
+                depend on none of them are reused instead of recomputed
+            validate_links (bool): Check profile links over HTTP (default True)
+            on_stage (callable): Called as on_stage(name, result) when each stage
+                finishes, e.g. to stream partial results
+            layout (dict): Layout signals from TextExtractor.extract_with_layout;
+                the format check uses them instead of guessing from the text
+            
+        Returns:
+            dict: Complete analysis results with scores and recommendations
+        """
+        pre_analysis = self.pre_analyze(
+            resume_text, parsed_resume, previous, changed, validate_links, on_stage, layout
+        )
+        return self.score_job_description(
+            pre_analysis, resume_text, parsed_resume, job_description, previous, changed, on_stage
+        )
+    
+    def score_job_descriptions(self, pre_analysis, resume_text, parsed_resume, job_descriptions, max_workers=8):
+        """Score one pre-analyzed resume against several JDs in parallel, keeping input order"""
+        if not job_descriptions:
+            return []
+        workers = max(1, min(max_workers, len(job_descriptions)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(
+                lambda jd: self.score_job_description(pre_analysis, resume_text, parsed_resume, jd),
+                job_descriptions
+            ))
+    
     def _generate_recommendations(self, results, parsed_resume, job_description):
         """Generate actionable recommendations"""
         recommendations = []
@@ -406,6 +573,12 @@ class ATSAnalyzer:
                 # Prioritize top 5 missing skills
                 recommendations.append(f"Add these missing keywords: {', '.join(missing_skills[:5])}")
         
+        # Near-miss spellings are invisible to exact-match ATS filters
+        fuzzy_skills = parsed_resume.get('skills', {}).get('fuzzy', [])
+        if fuzzy_skills:
+            fixes = [f"'{match['matched']}' -> '{match['skill']}'" for match in fuzzy_skills[:5]]
+            recommendations.append(f"Spell these skills the standard way so ATS filters find them: {', '.join(fixes)}")
+        
         # Section recommendations
         sections = parsed_resume.get('sections', {})
         if not sections.get('summary'):
@@ -0,0 +1,229 @@
+"""
+Batch Run Module
+Keeps the state of a batch analysis on disk so a crashed or interrupted
+run can be continued, and quarantines resumes that fail to analyze
+"""
+
+import json
+import os
+import time
+import traceback
+import uuid
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import BATCH_RUNS
+
+
+def export_record(analysis_results, parsed_resume):
+    """
+    The parts of an analysis the batch exports read (Excel row, Parquet row),
+    so a checkpointed result is a few KB instead of the full analysis
+    """
+    keyword_match = analysis_results.get('keyword_match')
+    skills_match = analysis_results.get('skills_match')
+    career = analysis_results.get('career_analysis', {})
+    skills = parsed_resume.get('skills', {})
+    analysis = {
+        'overall_score': analysis_results.get('overall_score'),
+        'rating': analysis_results.get('rating'),
+        'scores': analysis_results.get('scores', {}),
+        'recommendations': analysis_results.get('recommendations', []),
+        'strengths': analysis_results.get('strengths', []),
+        'career_analysis': {
+            'gaps': career.get('gaps', []),
+            'seniority_level': career.get('seniority_level'),
+            'growth_score': career.get('growth_score')
+        }
+    }
+    if skills_match:
+        analysis['skills_match'] = {
+            'matched_skills': skills_match.get('matched_skills', []),
+            'missing_skills': skills_match.get('missing_skills', [])
+        }
+    if keyword_match:
+        analysis['keyword_match'] = {
+            'matched_keywords': keyword_match.get('matched_keywords', []),
+            'total_jd_keywords': keyword_match.get('total_jd_keywords')
+        }
+    parsed = {
+        'name': parsed_resume.get('name'),
+        'contact_info': {'emails': parsed_resume.get('contact_info', {}).get('emails', [])},
+        'skills': {'all_technical': skills.get('all_technical', []), 'soft': skills.get('soft', [])},
+        'timeline': parsed_resume.get('timeline', {})
+    }
+    return analysis, parsed
+
+
+def _read_jsonl(path):
+    """
+    Records of a JSON-lines file. A line cut short by a crash is dropped
+    and the file is truncated after the last complete record, so appends
+    continue from a clean state.
+    """
+    records = []
+    if not os.path.exists(path):
+        return records
+    good_bytes = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break
+            good_bytes += len(line)
+    if good_bytes != os.path.getsize(path):
+        with open(path, 'r+b') as f:
+            f.truncate(good_bytes)
+    return records
+
+
+class BatchRun:
+    """
+    On-disk state of one batch run
+
+    Layout of `<runs dir>/<run id>/`:
+        run.json          inputs: files in order, job description, outputs
+        results.jsonl     one export_record() per completed item
+        errors.jsonl      quarantined items with the exception and traceback
+        checkpoint.json   progress counters as of the last checkpoint
+
+    Both .jsonl files are append-only and are flushed to disk every
+    `checkpoint_every` items, so a crash loses at most that many results,
+    which are simply analyzed again when the run is resumed.
+    """
+
+    def __init__(self, run_dir, checkpoint_every=None):
+        self.run_dir = run_dir
+        self.run_id = os.path.basename(run_dir)
+        self.checkpoint_every = checkpoint_every or BATCH_RUNS['checkpoint_every']
+        with open(os.path.join(run_dir, 'run.json'), encoding='utf-8') as f:
+            self.info = json.load(f)
+        self.results_path = os.path.join(run_dir, 'results.jsonl')
+        self.errors_path = os.path.join(run_dir, 'errors.jsonl')
+
+        self.done = {record['item'] for record in _read_jsonl(self.results_path)}
+        self.failed = {record['item'] for record in _read_jsonl(self.errors_path)}
+        self._results = open(self.results_path, 'a', encoding='utf-8')
+        self._errors = open(self.errors_path, 'a', encoding='utf-8')
+        self._since_checkpoint = 0
+
+    @classmethod
+    def create(cls, files, job_description_path=None, output='excel', runs_dir=None):
+        """Start a new run over the given files"""
+        runs_dir = runs_dir or BATCH_RUNS['path']
+        run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        run_dir = os.path.join(runs_dir, run_id)
+        os.makedirs(run_dir)
+        info = {
+            'run_id': run_id,
+            'created': time.time(),
+            'files': [os.path.abspath(path) for path in files],
+            'job_description_path': os.path.abspath(job_description_path) if job_description_path else None,
+            'output': output,
+            'outputs': {}
+        }
+        with open(os.path.join(run_dir, 'run.json'), 'w', encoding='utf-8') as f:
+            json.dump(info, f)
+        return cls(run_dir)
+
+    @classmethod
+    def open(cls, run_id, runs_dir=None):
+        """
+        Reopen an earlier run
+
+        Raises:
+            ValueError: If no run with that id exists
+        """
+        run_dir = os.path.join(runs_dir or BATCH_RUNS['path'], run_id)
+        if not os.path.exists(os.path.join(run_dir, 'run.json')):
+            raise ValueError(f"No batch run '{run_id}' in {runs_dir or BATCH_RUNS['path']}")
+        return cls(run_dir)
+
+    @property
+    def files(self):
+        return self.info['files']
+
+    def pending(self):
+        """(item number, path) of every file neither completed nor quarantined"""
+        finished = self.done | self.failed
+        return [(item, path) for item, path in enumerate(self.files) if item not in finished]
+
+    def complete(self, item, source, analysis_results, parsed_resume):
+        """Record a finished item"""
+        analysis, parsed = export_record(analysis_results, parsed_resume)
+        record = {'item': item, 'source': source, 'analysis': analysis, 'parsed': parsed}
+        self._results.write(json.dumps(record, default=str) + '\n')
+        self.done.add(item)
+        self._tick()
+
+    def fail(self, item, source, error):
+        """Quarantine an item that raised, with the exception and traceback"""
+        record = {
+            'item': item,
+            'source': source,
+            'error_type': type(error).__name__,
+            'error': str(error),
+            'traceback': ''.join(traceback.format_exception(type(error), error, error.__traceback__)),
+            'failed_at': time.time()
+        }
+        self._errors.write(json.dumps(record) + '\n')
+        self.failed.add(item)
+        self._tick()
+
+    def _tick(self):
+        self._since_checkpoint += 1
+        if self._since_checkpoint >= self.checkpoint_every:
+            self.checkpoint()
+
+    def checkpoint(self):
+        """Flush both result files to disk and record the progress counters"""
+        for f in (self._results, self._errors):
+            f.flush()
+            os.fsync(f.fileno())
+        self._since_checkpoint = 0
+        state = {
+            'completed': len(self.done),
+            'failed': len(self.failed),
+            'total': len(self.files),
+            'updated': time.time()
+        }
+        tmp_path = os.path.join(self.run_dir, 'checkpoint.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, os.path.join(self.run_dir, 'checkpoint.json'))
+
+    def results(self):
+        """(analysis, parsed resume, source) of completed items in file order, read lazily"""
+        self.checkpoint()
+        # Workers append in completion order; index the line offsets by item
+        # and read the records back in input order
+        offsets = []
+        with open(self.results_path, 'rb') as f:
+            offset = 0
+            for line in f:
+                item = json.loads(line)['item']
+                offsets.append((item, offset))
+                offset += len(line)
+        offsets.sort()
+        with open(self.results_path, 'rb') as f:
+            for _, offset in offsets:
+                f.seek(offset)
+                record = json.loads(f.readline())
+                yield record['analysis'], record['parsed'], record['source']
+
+    def set_output(self, kind, path):
+        """Remember where an export of this run was written"""
+        self.info['outputs'][kind] = path
+        tmp_path = os.path.join(self.run_dir, 'run.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.info, f)
+        os.replace(tmp_path, os.path.join(self.run_dir, 'run.json'))
+
+    def close(self):
+        self.checkpoint()
+        self._results.close()
+        self._errors.close()
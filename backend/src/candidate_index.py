@@ -0,0 +1,383 @@
+"""
+Candidate Index Module
+Finds the resumes in a stored pool that best fit a job description.
+Resumes are embedded as hashed TF-IDF vectors reduced by truncated SVD and
+searched through an inverted-file (IVF) index; only the nearest candidates
+are re-ranked with the analyzer's keyword and skill scorers.
+"""
+
+import json
+import math
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import CANDIDATE_INDEX
+from src.result_cache import content_hash
+
+
+class CandidateIndex:
+    """
+    Resume pool in SQLite plus an IVF vector index built from it
+
+    Layout of `index_dir`:
+        candidates.sqlite3   resume text and parsed skills
+        CURRENT              name of the live index generation
+        gen-<n>/             meta.json, projection.npz, lists.npz,
+                             vectors.npy and ids.npy (ordered by IVF list)
+
+    build() writes a new generation and then switches CURRENT, so searches
+    running during a rebuild keep using the previous one.
+    """
+
+    def __init__(self, index_dir, dimensions=None, hash_features=None, fit_sample=None, nprobe=None):
+        self.index_dir = index_dir
+        self.dimensions = dimensions or CANDIDATE_INDEX['dimensions']
+        self.hash_features = hash_features or CANDIDATE_INDEX['hash_features']
+        self.fit_sample = fit_sample or CANDIDATE_INDEX['fit_sample']
+        self.nprobe = nprobe or CANDIDATE_INDEX['nprobe']
+        self.db_path = os.path.join(index_dir, 'candidates.sqlite3')
+        self._local = threading.local()
+        self._loaded = None
+        self._load_lock = threading.Lock()
+
+        os.makedirs(index_dir, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS candidates (
+                    id INTEGER PRIMARY KEY,
+                    resume_hash TEXT UNIQUE NOT NULL,
+                    name TEXT,
+                    filename TEXT,
+                    text TEXT NOT NULL,
+                    skills TEXT NOT NULL,
+                    added REAL NOT NULL
+                )
+            """)
+
+    def _connect(self):
+        """One connection per thread and per process"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def add(self, resume_text, parsed_resume, filename=None):
+        """
+        Store an analyzed resume (identical texts are stored once)
+
+        Returns:
+            int: Candidate id
+        """
+        resume_hash = content_hash(resume_text)
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR IGNORE INTO candidates (resume_hash, name, filename, text, skills, added) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (resume_hash, parsed_resume.get('name'), filename, resume_text,
+             json.dumps(parsed_resume.get('skills', {})), time.time())
+        )
+        return conn.execute("SELECT id FROM candidates WHERE resume_hash = ?", (resume_hash,)).fetchone()[0]
+
+    def count(self):
+        """Number of stored resumes"""
+        return self._connect().execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+
+    def get(self, candidate_ids):
+        """id -> {'name', 'filename', 'text', 'skills'} for the given ids"""
+        found = {}
+        conn = self._connect()
+        ids = list(candidate_ids)
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            rows = conn.execute(
+                f"SELECT id, name, filename, text, skills FROM candidates WHERE id IN ({','.join('?' * len(chunk))})",
+                chunk
+            )
+            for candidate_id, name, filename, text, skills in rows:
+                found[candidate_id] = {'name': name, 'filename': filename, 'text': text, 'skills': json.loads(skills)}
+        return found
+
+    def _iter_texts(self, batch_size=2000, sample=None):
+        """Yield (ids, texts) batches in id order, or of a random sample"""
+        conn = self._connect()
+        if sample is not None:
+            # Pick ids first so the random sort does not carry every resume text
+            ids = [row[0] for row in conn.execute(
+                "SELECT id FROM candidates ORDER BY RANDOM() LIMIT ?", (sample,)
+            )]
+            for start in range(0, len(ids), batch_size):
+                records = self.get(ids[start:start + batch_size])
+                yield list(records), [record['text'] for record in records.values()]
+            return
+        last_id = 0
+        while True:
+            batch = conn.execute(
+                "SELECT id, text FROM candidates WHERE id > ? ORDER BY id LIMIT ?", (last_id, batch_size)
+            ).fetchall()
+            if not batch:
+                return
+            last_id = batch[-1][0]
+            yield [row[0] for row in batch], [row[1] for row in batch]
+
+    def _hasher(self, hash_features):
+        from sklearn.feature_extraction.text import HashingVectorizer
+        return HashingVectorizer(
+            n_features=hash_features, ngram_range=(1, 2), stop_words='english',
+            alternate_sign=False, norm=None, dtype=np.float32
+        )
+
+    def _tfidf(self, hasher, texts, idf):
+        """Sublinear TF-IDF rows, L2-normalized"""
+        from sklearn.preprocessing import normalize
+        counts = hasher.transform(texts)
+        # Scale stored values in place; multiply() would broadcast to every column
+        counts.data = np.log1p(counts.data) * idf[counts.indices]
+        return normalize(counts)
+
+    def _embed(self, hasher, texts, idf, projection):
+        """Dense unit vectors (float32) for a batch of texts; projection is (features, dimensions)"""
+        vectors = np.asarray(self._tfidf(hasher, texts, idf) @ projection, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        return vectors / norms
+
+    def build(self, progress=None):
+        """
+        Fit the projection and IVF lists on a sample, embed every stored
+        resume and publish the result as a new generation
+
+        Args:
+            progress (callable): Called as progress(done, total) while embedding
+
+        Returns:
+            dict: The new generation's meta data
+        """
+        from sklearn.cluster import MiniBatchKMeans
+        from sklearn.decomposition import TruncatedSVD
+
+        total = self.count()
+        if not total:
+            raise ValueError("The candidate pool is empty")
+        hasher = self._hasher(self.hash_features)
+
+        # 1. IDF and SVD from a sample
+        sample_ids, sample_texts = [], []
+        for ids, texts in self._iter_texts(sample=self.fit_sample):
+            sample_ids.extend(ids)
+            sample_texts.extend(texts)
+        counts = hasher.transform(sample_texts)
+        document_frequency = np.bincount(counts.indices, minlength=self.hash_features)
+        idf = (np.log((1 + len(sample_texts)) / (1 + document_frequency)) + 1).astype(np.float32)
+
+        dimensions = max(1, min(self.dimensions, len(sample_texts) - 1, self.hash_features - 1))
+        svd = TruncatedSVD(n_components=dimensions, algorithm='randomized', random_state=0)
+        svd.fit(self._tfidf(hasher, sample_texts, idf))
+        # Row-major (features, dimensions): sparse rows gather contiguous rows of it
+        projection = np.ascontiguousarray(svd.components_.T, dtype=np.float32)
+
+        # 2. IVF centroids (spherical: unit vectors compared by dot product)
+        nlist = max(1, min(int(math.sqrt(total)), len(sample_texts)))
+        sample_vectors = self._embed(hasher, sample_texts, idf, projection)
+        kmeans = MiniBatchKMeans(n_clusters=nlist, batch_size=4096, n_init=3, random_state=0)
+        kmeans.fit(sample_vectors)
+        centroids = kmeans.cluster_centers_.astype(np.float32)
+        centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+
+        # 3. Embed everything and assign lists
+        generation = self._next_generation()
+        # Unique name, so a work dir left by an interrupted build never collides
+        work_dir = tempfile.mkdtemp(prefix=generation + '.', suffix='.tmp', dir=self.index_dir)
+        os.chmod(work_dir, 0o755)  # mkdtemp is owner-only; servers may run as another user
+        try:
+            vectors = np.lib.format.open_memmap(
+                os.path.join(work_dir, 'unsorted.npy'), mode='w+', dtype=np.float32, shape=(total, dimensions)
+            )
+            all_ids = np.zeros(total, dtype=np.int64)
+            lists = np.zeros(total, dtype=np.int32)
+            done = 0
+            for ids, texts in self._iter_texts():
+                batch = self._embed(hasher, texts, idf, projection)
+                end = min(done + len(ids), total)
+                batch, ids = batch[:end - done], ids[:end - done]
+                vectors[done:end] = batch
+                all_ids[done:end] = ids
+                lists[done:end] = np.argmax(batch @ centroids.T, axis=1)
+                done = end
+                if progress:
+                    progress(done, total)
+                if done >= total:
+                    break
+
+            # 4. Store vectors grouped by list so a probe reads one contiguous slice
+            order = np.argsort(lists[:done], kind='stable')
+            offsets = np.zeros(nlist + 1, dtype=np.int64)
+            np.cumsum(np.bincount(lists[:done], minlength=nlist), out=offsets[1:])
+            sorted_vectors = np.lib.format.open_memmap(
+                os.path.join(work_dir, 'vectors.npy'), mode='w+', dtype=np.float32, shape=(done, dimensions)
+            )
+            for start in range(0, done, 65536):
+                sorted_vectors[start:start + 65536] = vectors[order[start:start + 65536]]
+            sorted_vectors.flush()
+            del sorted_vectors, vectors
+            os.remove(os.path.join(work_dir, 'unsorted.npy'))
+            np.save(os.path.join(work_dir, 'ids.npy'), all_ids[:done][order])
+            np.savez(os.path.join(work_dir, 'projection.npz'), idf=idf, projection=projection)
+            np.savez(os.path.join(work_dir, 'lists.npz'), centroids=centroids, offsets=offsets)
+
+            meta = {
+                'generation': generation,
+                'count': int(done),
+                'dimensions': int(dimensions),
+                'hash_features': int(self.hash_features),
+                'nlist': int(nlist),
+                'max_id': int(all_ids[:done].max()),
+                'built_at': time.time()
+            }
+            with open(os.path.join(work_dir, 'meta.json'), 'w') as f:
+                json.dump(meta, f)
+
+            # 5. Publish: rename the generation, then point CURRENT at it
+            final_dir = os.path.join(self.index_dir, generation)
+            os.replace(work_dir, final_dir)
+        except BaseException:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            raise
+        current_tmp = os.path.join(self.index_dir, 'CURRENT.tmp')
+        with open(current_tmp, 'w') as f:
+            f.write(generation)
+        os.replace(current_tmp, os.path.join(self.index_dir, 'CURRENT'))
+        self._remove_old_generations(generation)
+        return meta
+
+    def _next_generation(self):
+        numbers = [int(name[4:]) for name in os.listdir(self.index_dir)
+                   if name.startswith('gen-') and name[4:].isdigit()]
+        return f"gen-{max(numbers, default=0) + 1}"
+
+    def _remove_old_generations(self, keep):
+        # Processes that already mapped an old generation keep reading it until they reload
+        for name in os.listdir(self.index_dir):
+            if name.startswith('gen-') and name != keep:
+                shutil.rmtree(os.path.join(self.index_dir, name), ignore_errors=True)
+
+    def _current(self):
+        """Arrays of the live generation, reloaded when CURRENT changes"""
+        try:
+            with open(os.path.join(self.index_dir, 'CURRENT')) as f:
+                generation = f.read().strip()
+        except FileNotFoundError:
+            raise ValueError("The candidate index has not been built yet")
+
+        loaded = self._loaded
+        if loaded is None or loaded['generation'] != generation:
+            with self._load_lock:
+                loaded = self._loaded
+                if loaded is None or loaded['generation'] != generation:
+                    path = os.path.join(self.index_dir, generation)
+                    with open(os.path.join(path, 'meta.json')) as f:
+                        meta = json.load(f)
+                    projection = np.load(os.path.join(path, 'projection.npz'))
+                    lists = np.load(os.path.join(path, 'lists.npz'))
+                    loaded = {
+                        'generation': generation,
+                        'meta': meta,
+                        'hasher': self._hasher(meta['hash_features']),
+                        'idf': projection['idf'],
+                        'projection': projection['projection'],
+                        'centroids': lists['centroids'],
+                        'offsets': lists['offsets'],
+                        'vectors': np.load(os.path.join(path, 'vectors.npy'), mmap_mode='r'),
+                        'ids': np.load(os.path.join(path, 'ids.npy'), mmap_mode='r')
+                    }
+                    self._loaded = loaded
+        return loaded
+
+    def search(self, job_description, top_k=100, nprobe=None):
+        """
+        Nearest stored resumes to a job description
+
+        Args:
+            job_description (str): Job description text
+            top_k (int): Number of candidates to return
+            nprobe (int): IVF lists to scan; more is slower and closer to exact
+
+        Returns:
+            list: (candidate id, cosine similarity) pairs, best first
+        """
+        index = self._current()
+        query = self._embed(index['hasher'], [job_description], index['idf'], index['projection'])[0]
+
+        centroids = index['centroids']
+        nprobe = min(nprobe or self.nprobe, len(centroids))
+        probe = np.argpartition(-(centroids @ query), nprobe - 1)[:nprobe]
+
+        offsets = index['offsets']
+        slices = [(offsets[i], offsets[i + 1]) for i in probe if offsets[i + 1] > offsets[i]]
+        if not slices:
+            return []
+        positions = np.concatenate([np.arange(start, end) for start, end in slices])
+        scores = np.concatenate([index['vectors'][start:end] @ query for start, end in slices])
+
+        top_k = min(top_k, len(scores))
+        best = np.argpartition(-scores, top_k - 1)[:top_k]
+        best = best[np.argsort(-scores[best])]
+        ids = index['ids']
+        return [(int(ids[positions[i]]), float(scores[i])) for i in best]
+
+    def shortlist(self, job_description, analyzer, top_k=100, nprobe=None):
+        """
+        Retrieve the nearest candidates and re-rank them with the analyzer's
+        keyword and skill match scores (weighted as in scoring_weights)
+
+        Returns:
+            list: Dicts with 'id', 'name', 'filename', 'similarity',
+                  'keyword_match', 'skills_match' and 'score', best first
+        """
+        from src.config_store import current_config
+
+        weights = current_config()['scoring_weights']
+        keyword_weight = weights.get('keyword_match', 0)
+        skills_weight = weights.get('skills_match', 0)
+        total_weight = (keyword_weight + skills_weight) or 1
+
+        hits = self.search(job_description, top_k, nprobe)
+        records = self.get(candidate_id for candidate_id, _ in hits)
+        ranked = []
+        for candidate_id, similarity in hits:
+            record = records.get(candidate_id)
+            if record is None:
+                continue
+            keyword = analyzer.calculate_keyword_match(record['text'], job_description)['score']
+            skills = analyzer.calculate_skills_match(record['skills'], job_description)['score']
+            ranked.append({
+                'id': candidate_id,
+                'name': record['name'],
+                'filename': record['filename'],
+                'similarity': round(similarity, 4),
+                'keyword_match': keyword,
+                'skills_match': skills,
+                'score': round((keyword * keyword_weight + skills * skills_weight) / total_weight, 2)
+            })
+        ranked.sort(key=lambda candidate: candidate['score'], reverse=True)
+        return ranked
+
+    def status(self):
+        """Pool size and the live generation's meta data (None before the first build)"""
+        try:
+            meta = self._current()['meta']
+        except ValueError:
+            meta = None
+        return {'stored': self.count(), 'index': meta}
@@ -0,0 +1,179 @@
+"""
+Columnar Export Module
+Appends analysis results to a Parquet dataset (a folder of Parquet files)
+for pandas, DuckDB or Spark, one flat row per analyzed resume
+"""
+
+import os
+import time
+import uuid
+from datetime import datetime, timezone
+import sys
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import ANALYZER_VERSION, COLUMNAR_EXPORT
+from src.config_store import current_config
+
+
+def score_keys():
+    """Names of the live scoring weights (they can change on a config reload)"""
+    return list(current_config()['scoring_weights'])
+
+
+def result_schema(keys=None):
+    """Arrow schema of one exported row; one score_<name> column per scoring weight"""
+    keys = score_keys() if keys is None else keys
+    strings = pa.list_(pa.string())
+    return pa.schema(
+        [
+            ('analyzed_at', pa.timestamp('ms', tz='UTC')),
+            ('run_id', pa.string()),
+            ('source', pa.string()),
+            ('candidate', pa.string()),
+            ('analyzer_version', pa.int32()),
+            ('overall_score', pa.float64()),
+            ('rating', pa.string())
+        ]
+        + [(f"score_{key}", pa.float64()) for key in keys]
+        + [
+            ('technical_skills', strings),
+            ('soft_skills', strings),
+            ('matched_skills', strings),
+            ('missing_skills', strings),
+            ('keywords_matched', pa.int32()),
+            ('jd_keywords', pa.int32()),
+            ('roles', pa.int32()),
+            ('experience_months', pa.int32()),
+            ('avg_tenure_months', pa.float64()),
+            ('gap_count', pa.int32()),
+            ('seniority', pa.string()),
+            ('growth_score', pa.float64()),
+            ('timeline_risks', strings),
+            ('recommendation_count', pa.int32())
+        ]
+    )
+
+
+def result_row(analysis_results, parsed_resume, source=None, keys=None):
+    """Flatten one analysis into a dict of the result_schema(keys) columns (except run_id)"""
+    keys = score_keys() if keys is None else keys
+    scores = analysis_results.get('scores', {})
+    skills = parsed_resume.get('skills', {})
+    skills_match = analysis_results.get('skills_match', {})
+    keyword_match = analysis_results.get('keyword_match', {})
+    timeline = parsed_resume.get('timeline', {})
+    career = analysis_results.get('career_analysis', {})
+    roles = timeline.get('roles', [])
+    months = timeline.get('total_experience_months', 0)
+
+    row = {
+        'analyzed_at': datetime.now(timezone.utc),
+        'source': source,
+        'candidate': parsed_resume.get('name'),
+        'analyzer_version': ANALYZER_VERSION,
+        'overall_score': analysis_results.get('overall_score'),
+        'rating': analysis_results.get('rating')
+    }
+    for key in keys:
+        row[f"score_{key}"] = scores.get(key)
+    row.update({
+        'technical_skills': list(skills.get('all_technical', [])),
+        'soft_skills': list(skills.get('soft', [])),
+        'matched_skills': list(skills_match.get('matched_skills', [])),
+        'missing_skills': list(skills_match.get('missing_skills', [])),
+        'keywords_matched': len(keyword_match['matched_keywords']) if keyword_match else None,
+        'jd_keywords': keyword_match.get('total_jd_keywords'),
+        'roles': len(roles),
+        'experience_months': months,
+        'avg_tenure_months': round(months / len(roles), 1) if roles else None,
+        'gap_count': len(career.get('gaps', [])),
+        'seniority': career.get('seniority_level'),
+        'growth_score': career.get('growth_score'),
+        'timeline_risks': list(timeline.get('risks', [])),
+        'recommendation_count': len(analysis_results.get('recommendations', []))
+    })
+    return row
+
+
+class ParquetResultWriter:
+    """
+    Buffers result rows column by column and writes them as Parquet row groups
+
+    Every writer creates its own file in the dataset folder, so concurrent
+    runs never touch each other's output. The file is written under a
+    hidden name and renamed when the writer closes; pandas
+    (read_parquet(folder)) and DuckDB (read_parquet('folder/*.parquet'))
+    therefore only ever see complete files, and can read just the columns
+    and row groups a query needs.
+
+    Usage:
+        with ParquetResultWriter(dataset_dir) as writer:
+            writer.add(analysis_results, parsed_resume, source)
+    """
+
+    def __init__(self, dataset_dir=None, row_group_size=None, compression=None, run_id=None):
+        if pa is None:
+            raise RuntimeError("Parquet export needs the pyarrow package (pip install pyarrow)")
+        dataset_dir = dataset_dir or COLUMNAR_EXPORT['path']
+        self.dataset_dir = dataset_dir
+        self.row_group_size = row_group_size or COLUMNAR_EXPORT['row_group_size']
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self.rows = 0
+        # Columns are fixed per file; a run started after a reload gets the new weights
+        self.score_keys = score_keys()
+        self.schema = result_schema(self.score_keys)
+        self._buffer = {name: [] for name in self.schema.names}
+
+        os.makedirs(dataset_dir, exist_ok=True)
+        name = f"results-{time.strftime('%Y%m%d-%H%M%S')}-{self.run_id}.parquet"
+        self.filepath = os.path.join(dataset_dir, name)
+        self._tmp_path = os.path.join(dataset_dir, f".{name}.tmp")
+        self._writer = pq.ParquetWriter(
+            self._tmp_path, self.schema,
+            compression=compression or COLUMNAR_EXPORT['compression']
+        )
+
+    def add(self, analysis_results, parsed_resume, source=None):
+        """Buffer one analysis; a row group is written once row_group_size rows are waiting"""
+        row = result_row(analysis_results, parsed_resume, source, self.score_keys)
+        row['run_id'] = self.run_id
+        for name, column in self._buffer.items():
+            column.append(row[name])
+        self.rows += 1
+        if len(self._buffer['run_id']) >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered rows as one row group"""
+        if not self._buffer['run_id']:
+            return
+        table = pa.Table.from_pydict(self._buffer, schema=self.schema)
+        self._writer.write_table(table, row_group_size=self.row_group_size)
+        self._buffer = {name: [] for name in self.schema.names}
+
+    def close(self):
+        """Write the remaining rows and the footer, then publish the file"""
+        if self._writer is None:
+            return self.filepath
+        self.flush()
+        self._writer.close()
+        self._writer = None
+        if self.rows:
+            os.replace(self._tmp_path, self.filepath)
+        else:
+            os.remove(self._tmp_path)
+        return self.filepath if self.rows else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
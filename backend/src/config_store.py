@@ -0,0 +1,225 @@
+"""
+Config Store Module
+Live-tunable analysis settings: config.py defaults plus an optional JSON
+overrides file, compiled into immutable snapshots that are swapped in when
+the overrides file or the external skills taxonomy changes
+"""
+
+import json
+import os
+import threading
+import time
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import (
+    SCORING_WEIGHTS, SCORE_THRESHOLDS, ACTION_VERBS, ATS_PITFALLS,
+    TECHNICAL_SKILLS, SOFT_SKILLS, SKILL_ALIASES, SKILLS_TAXONOMY,
+    CONFIG_OVERRIDES, FUZZY_SKILLS, compute_config_version
+)
+from src.skill_taxonomy import builtin_entries, load_matcher, merge_entries, read_taxonomy_file
+from src.fuzzy_skills import FuzzySkillIndex
+
+
+# Settings an overrides file may replace, with their defaults and JSON type
+TUNABLE_SETTINGS = {
+    'scoring_weights': (SCORING_WEIGHTS, dict),
+    'score_thresholds': (SCORE_THRESHOLDS, dict),
+    'action_verbs': (ACTION_VERBS, list),
+    'ats_pitfalls': (ATS_PITFALLS, list),
+    'technical_skills': (TECHNICAL_SKILLS, dict),
+    'soft_skills': (SOFT_SKILLS, list),
+    'skill_aliases': (SKILL_ALIASES, dict)
+}
+
+
+def read_overrides(path):
+    """
+    Load and check an overrides file
+
+    Returns:
+        dict: Setting name -> replacement value
+
+    Raises:
+        ValueError: If the file is not a JSON object of known settings
+    """
+    with open(path, encoding='utf-8') as f:
+        try:
+            overrides = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON in {path}: {e}")
+    if not isinstance(overrides, dict):
+        raise ValueError(f"{path} must contain a JSON object")
+    for name, value in overrides.items():
+        if name not in TUNABLE_SETTINGS:
+            raise ValueError(f"Unknown setting '{name}' in {path}")
+        expected = TUNABLE_SETTINGS[name][1]
+        if not isinstance(value, expected):
+            raise ValueError(f"Setting '{name}' in {path} must be a JSON {expected.__name__}")
+    missing = set(SCORE_THRESHOLDS) - set(overrides.get('score_thresholds', SCORE_THRESHOLDS))
+    if missing:
+        raise ValueError(f"score_thresholds in {path} is missing {sorted(missing)}")
+    return overrides
+
+
+class ConfigSnapshot:
+    """One generation of settings and the matchers compiled from them; treat as read-only"""
+
+    def __init__(self, settings, version, skill_matcher, skill_entries, taxonomy_path=None):
+        self.settings = settings
+        self.version = version
+        self.skill_matcher = skill_matcher
+        self.skill_entries = skill_entries
+        self.taxonomy_path = taxonomy_path
+        # lowercase verb -> (position in action_verbs, canonical spelling)
+        self.action_verb_rank = {verb.lower(): (i, verb) for i, verb in enumerate(settings['action_verbs'])}
+        self._fuzzy_index = None
+        self._fuzzy_lock = threading.Lock()
+
+    def __getitem__(self, name):
+        return self.settings[name]
+
+    @property
+    def fuzzy_index(self):
+        """FuzzySkillIndex over the same taxonomy as skill_matcher (built on first use)"""
+        if self._fuzzy_index is None:
+            with self._fuzzy_lock:
+                if self._fuzzy_index is None:
+                    entries = self.skill_entries
+                    if self.taxonomy_path:
+                        entries = merge_entries(entries, read_taxonomy_file(self.taxonomy_path))
+                    self._fuzzy_index = FuzzySkillIndex(
+                        entries,
+                        max_distance=FUZZY_SKILLS['max_distance'],
+                        distance_thresholds=FUZZY_SKILLS['distance_thresholds'],
+                        max_ngram=FUZZY_SKILLS['max_ngram'],
+                        prefix_length=FUZZY_SKILLS['prefix_length']
+                    )
+        return self._fuzzy_index
+
+
+class ConfigStore:
+    """
+    Holds the current ConfigSnapshot and replaces it when watched files change
+
+    Readers never wait: current() returns whichever snapshot is live, and a
+    reload builds the next one on the watcher thread before swapping the
+    reference. Listeners added with subscribe() are told about each new
+    snapshot, e.g. to move result caches to the new version.
+    """
+
+    def __init__(self, overrides_path=None, taxonomy_path=None, snapshot_dir=None, poll_seconds=2.0):
+        self.overrides_path = overrides_path
+        self.taxonomy_path = taxonomy_path
+        self.snapshot_dir = snapshot_dir
+        self.poll_seconds = poll_seconds
+        self._snapshot = None
+        self._stamps = None
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._watcher_pid = None
+        if hasattr(os, 'register_at_fork'):
+            # A lock held by the parent's watcher thread would never be released in the child
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def current(self):
+        """The live snapshot (built on first use)"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._stamps = self._file_stamps()
+                    self._snapshot = self._build()
+                snapshot = self._snapshot
+        if self._watcher_pid != os.getpid():
+            self._start_watcher()
+        return snapshot
+
+    def subscribe(self, callback):
+        """Call callback(snapshot) after every swap"""
+        self._listeners.append(callback)
+
+    def reload(self, force=False):
+        """
+        Rebuild the snapshot if a watched file changed since the last build
+
+        A file that fails to load is reported and the previous snapshot stays
+        live until the file changes again.
+
+        Returns:
+            bool: True if a snapshot with a new version was swapped in
+        """
+        with self._lock:
+            stamps = self._file_stamps()
+            if stamps == self._stamps and not force:
+                return False
+            self._stamps = stamps
+            try:
+                snapshot = self._build()
+            except (OSError, ValueError, KeyError) as e:
+                print(f"⚠️ Config reload failed, keeping version {self._snapshot.version if self._snapshot else None}: {e}")
+                return False
+            previous = self._snapshot
+            if previous is not None and previous.version == snapshot.version:
+                return False
+            self._snapshot = snapshot
+
+        print(f"✓ Config version {previous.version if previous else None} -> {snapshot.version}")
+        for callback in list(self._listeners):
+            callback(snapshot)
+        return True
+
+    def _build(self):
+        """Compile a snapshot from the defaults and the current files"""
+        overrides = read_overrides(self.overrides_path) if self.overrides_path else {}
+        settings = {name: overrides.get(name, default) for name, (default, _) in TUNABLE_SETTINGS.items()}
+        entries = builtin_entries(settings['technical_skills'], settings['soft_skills'], settings['skill_aliases'])
+        matcher = load_matcher(self.taxonomy_path, self.snapshot_dir, entries)
+        return ConfigSnapshot(settings, compute_config_version(overrides), matcher, entries, self.taxonomy_path)
+
+    def _file_stamps(self):
+        """(mtime, size) of each watched file, None for a missing one"""
+        stamps = []
+        for path in (self.overrides_path, self.taxonomy_path):
+            try:
+                info = os.stat(path) if path else None
+                stamps.append((info.st_mtime_ns, info.st_size) if info else None)
+            except OSError:
+                stamps.append(None)
+        return tuple(stamps)
+
+    def _start_watcher(self):
+        """Poll the watched files from a daemon thread (one per process)"""
+        with self._lock:
+            if self._watcher_pid == os.getpid():
+                return
+            self._watcher_pid = os.getpid()
+        if self.poll_seconds <= 0 or not (self.overrides_path or self.taxonomy_path):
+            return
+        threading.Thread(target=self._watch, name='config-watcher', daemon=True).start()
+
+    def _watch(self):
+        while True:
+            time.sleep(self.poll_seconds)
+            try:
+                self.reload()
+            except Exception as e:
+                print(f"⚠️ Config watcher error: {e}")
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+        self._watcher_pid = None
+
+
+config_store = ConfigStore(
+    CONFIG_OVERRIDES['path'],
+    SKILLS_TAXONOMY['source'],
+    SKILLS_TAXONOMY['snapshot_dir'],
+    CONFIG_OVERRIDES['poll_seconds']
+)
+
+
+def current_config():
+    """Live ConfigSnapshot of this process"""
+    return config_store.current()
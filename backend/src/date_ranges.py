@@ -0,0 +1,92 @@
+"""
+Date Range Module
+Finds employment date ranges ("Jan 2020 - Present", "03/2019 to 2021") with one compiled pattern
+"""
+
+import re
+from datetime import date
+from functools import lru_cache
+
+
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+MONTH_NAMES = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+MONTH_WORD = (
+    r'(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?'
+    r'|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?'
+)
+
+
+def _date(prefix):
+    """A month name or number (optional) followed by a four-digit year"""
+    return (
+        rf'(?:(?P<{prefix}_month>{MONTH_WORD})\s*,?\s*|(?P<{prefix}_num>\d{{1,2}})\s*[/.-]\s*)?'
+        rf'(?P<{prefix}_year>(?:19|20)\d{{2}})'
+    )
+
+
+DATE_RANGE_PATTERN = re.compile(
+    rf'\b{_date("start")}\s*(?:-|–|—|to|until|till)\s*'
+    rf'(?:{_date("end")}|(?P<current>present|current|now|today|date))\b',
+    re.IGNORECASE
+)
+
+
+def format_month(year_month):
+    """'2020-01' -> 'Jan 2020'"""
+    year, month = year_month.split('-')
+    return f"{MONTH_NAMES[int(month) - 1]} {year}"
+
+
+def _month(match, prefix, default):
+    """Month number of one side of a range, or the default for a bare year"""
+    word = match.group(f'{prefix}_month')
+    if word:
+        return MONTHS[word[:3].lower()]
+    number = match.group(f'{prefix}_num')
+    if number and 1 <= int(number) <= 12:
+        return int(number)
+    return default
+
+
+@lru_cache(maxsize=64)
+def _scan(text, today):
+    """Parse the ranges of one text; `today` (months since year 0) ends current roles"""
+    records = []
+    for match in DATE_RANGE_PATTERN.finditer(text):
+        start = int(match.group('start_year')) * 12 + _month(match, 'start', 1) - 1
+        is_current = match.group('current') is not None
+        if is_current:
+            end = today
+        else:
+            end = int(match.group('end_year')) * 12 + _month(match, 'end', 12) - 1
+        if end < start:
+            continue
+        records.append({
+            'text': match.group(0),
+            'start': f"{start // 12}-{start % 12 + 1:02d}",
+            'end': f"{end // 12}-{end % 12 + 1:02d}",
+            'is_current': is_current,
+            'span_months': end - start
+        })
+    return tuple(records)
+
+
+def extract_date_ranges(text):
+    """
+    Find every date range in the text
+
+    Args:
+        text (str): Resume text
+
+    Returns:
+        list: Records in text order with 'text' (as written), 'start' and
+              'end' ('YYYY-MM'; a bare start year counts from January, a bare
+              end year to December, and current roles end this month),
+              'is_current' and 'span_months'
+    """
+    today = date.today()
+    return [dict(record) for record in _scan(text, today.year * 12 + today.month - 1)]
@@ -0,0 +1,373 @@
+"""
+Folder Watcher Module
+Analyzes resumes dropped into a folder. A SQLite manifest of each file's
+size, modification time and content hash decides what is new or changed,
+and only those files are sent to a pool of analysis processes.
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import WATCH_FOLDER
+from src.result_cache import content_hash
+
+RESUME_EXTENSIONS = ('.pdf', '.docx', '.doc')
+
+
+def file_hash(path):
+    """SHA-256 hex digest of a file's bytes, read in blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class IngestManifest:
+    """What has been seen in a watched folder, persisted in SQLite"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                content_hash TEXT NOT NULL,
+                status TEXT NOT NULL,
+                report TEXT,
+                error TEXT,
+                updated REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_files_hash ON files (content_hash)")
+
+    def stamps(self):
+        """path -> (size, mtime_ns, content hash) of every known file"""
+        return {
+            path: (size, mtime_ns, digest)
+            for path, size, mtime_ns, digest in
+            self._conn.execute("SELECT path, size, mtime_ns, content_hash FROM files")
+        }
+
+    def analyzed_copy(self, digest):
+        """Report of an already analyzed file with this content, or None"""
+        row = self._conn.execute(
+            "SELECT report FROM files WHERE content_hash = ? AND status = 'analyzed' LIMIT 1",
+            (digest,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def record(self, path, size, mtime_ns, digest, status, report=None, error=None):
+        """Insert or replace the entry for one file"""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO files (path, size, mtime_ns, content_hash, status, report, error, updated) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (path, size, mtime_ns, digest, status, report, error, time.time())
+        )
+
+    def forget(self, paths):
+        """Drop entries for files that no longer exist"""
+        self._conn.executemany("DELETE FROM files WHERE path = ?", [(path,) for path in paths])
+
+    def counts(self):
+        """status -> number of files"""
+        return dict(self._conn.execute("SELECT status, COUNT(*) FROM files GROUP BY status"))
+
+    def close(self):
+        self._conn.close()
+
+
+# Per-process analyzers, created once by _init_worker
+_worker = {}
+
+
+def _init_worker():
+    from src.text_extractor import TextExtractor
+    from src.resume_parser import ResumeParser
+    from src.ats_analyzer import ATSAnalyzer
+
+    _worker['extractor'] = TextExtractor()
+    _worker['parser'] = ResumeParser()
+    _worker['analyzer'] = ATSAnalyzer()
+
+
+def _analyze_file(path, job_description):
+    """Extract, parse and analyze one resume inside a pool process"""
+    # A rejected file fails here and is recorded as 'failed' with the reasons
+    report = _worker['extractor'].preflight(path)
+    if report['action'] == 'reject':
+        raise ValueError("; ".join(report['reasons']))
+    resume_text, layout = _worker['extractor'].extract_with_layout(path, max_pages=report['max_pages'])
+    parsed_resume = _worker['parser'].parse(resume_text)
+    analysis_results = _worker['analyzer'].analyze(resume_text, parsed_resume, job_description, layout=layout)
+    return analysis_results, parsed_resume
+
+
+class FolderWatcher:
+    """
+    Polls a folder (and its subfolders) and analyzes new or changed resumes
+
+    Each scan stats every file and compares (size, mtime) with the manifest,
+    a dictionary lookup per file, so unchanged files are never opened. Files
+    whose stamps moved are hashed: same bytes as before only refreshes the
+    stamps, and bytes already analyzed under another name are recorded as a
+    duplicate of that report. Everything else is analyzed in worker
+    processes, and the reports are written by report_generator.
+    """
+
+    def __init__(self, folder, report_generator, job_description="", output_format='json',
+                 manifest_path=None, workers=None, poll_seconds=None, settle_seconds=None):
+        """
+        Args:
+            folder (str): Folder to watch
+            report_generator (ReportGenerator): Writes each file's reports
+            job_description (str): Job description text every resume is scored against
+            output_format (str): 'text', 'json', 'excel' or 'all'
+            manifest_path (str): SQLite manifest (default: one per folder and
+                job description in the report folder)
+            workers (int): Analysis processes (default: WATCH_FOLDER['workers'])
+            poll_seconds (float): Pause between scans
+            settle_seconds (float): Skip files modified this recently, they
+                may still be being copied into the folder
+        """
+        self.folder = os.path.abspath(folder)
+        self.report_generator = report_generator
+        self.job_description = job_description
+        self.output_format = output_format
+        self.workers = workers or WATCH_FOLDER['workers'] or os.cpu_count()
+        self.poll_seconds = WATCH_FOLDER['poll_seconds'] if poll_seconds is None else poll_seconds
+        self.settle_seconds = WATCH_FOLDER['settle_seconds'] if settle_seconds is None else settle_seconds
+        if manifest_path is None:
+            key = content_hash(f"{self.folder}\n{job_description}")[:12]
+            manifest_path = os.path.join(report_generator.output_dir, f"watch-{key}.sqlite3")
+        self.manifest = IngestManifest(manifest_path)
+        self._stamps = self.manifest.stamps()
+        self._pool = None
+
+    def _files(self):
+        """(path, size, mtime_ns) of every resume file under the folder"""
+        pending = [self.folder]
+        while pending:
+            try:
+                entries = os.scandir(pending.pop())
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.name.startswith(('.', '~$')):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif entry.name.lower().endswith(RESUME_EXTENSIONS):
+                            info = entry.stat()
+                            yield entry.path, info.st_size, info.st_mtime_ns
+                    except OSError:
+                        continue
+
+    def scan_once(self):
+        """
+        Analyze everything new or changed since the last scan
+
+        Returns:
+            dict: Files per outcome ('analyzed', 'failed', 'duplicate',
+                  'unchanged', 'settling', 'removed')
+        """
+        summary = dict.fromkeys(('analyzed', 'failed', 'duplicate', 'unchanged', 'settling', 'removed'), 0)
+        settle_before = time.time_ns() - int(self.settle_seconds * 1e9)
+        seen = set()
+        queue = []
+        # content hash -> queued path, and later copies of the same bytes
+        queued = {}
+        copies = []
+
+        for path, size, mtime_ns in self._files():
+            seen.add(path)
+            known = self._stamps.get(path)
+            if known is not None and known[:2] == (size, mtime_ns):
+                summary['unchanged'] += 1
+                continue
+            if mtime_ns > settle_before:
+                summary['settling'] += 1
+                continue
+            try:
+                digest = file_hash(path)
+            except OSError:
+                continue
+            if known is not None and known[2] == digest:
+                # Touched or copied over with the same bytes
+                self._remember(path, size, mtime_ns, digest, 'unchanged')
+                summary['unchanged'] += 1
+                continue
+            report = self.manifest.analyzed_copy(digest)
+            if report is not None:
+                self._remember(path, size, mtime_ns, digest, 'duplicate', report=report)
+                summary['duplicate'] += 1
+                continue
+            if digest in queued:
+                copies.append((path, size, mtime_ns, digest))
+                continue
+            queued[digest] = path
+            queue.append((path, size, mtime_ns, digest))
+
+        removed = [path for path in self._stamps if path not in seen]
+        if removed:
+            self.manifest.forget(removed)
+            for path in removed:
+                del self._stamps[path]
+            summary['removed'] = len(removed)
+
+        if queue:
+            self._analyze(queue, summary)
+        for path, size, mtime_ns, digest in copies:
+            report = self.manifest.analyzed_copy(digest)
+            if report is not None:
+                self._remember(path, size, mtime_ns, digest, 'duplicate', report=report)
+                summary['duplicate'] += 1
+            else:
+                error = f"Same content as {os.path.relpath(queued[digest], self.folder)}, which failed"
+                self._remember(path, size, mtime_ns, digest, 'failed', error=error)
+                summary['failed'] += 1
+        return summary
+
+    def _analyze(self, queue, summary):
+        """Run the queued files through the pool, a few per worker at a time"""
+        crashed = self._run_pool(queue, summary, self.workers * 2)
+        # A worker that dies (segfault, out of memory) fails every file in
+        # flight with it. Rerun those one at a time: only a file that kills
+        # a worker on its own is quarantined.
+        for item in crashed:
+            if self._run_pool([item], summary, 1):
+                self._quarantine(item, summary)
+
+    def _run_pool(self, queue, summary, max_in_flight):
+        """
+        Analyze queued files with at most max_in_flight of them in the pool
+
+        Returns:
+            list: Files lost to a dead worker process, left unrecorded; the
+                  pool is replaced and the rest of the queue carries on
+        """
+        crashed = []
+        in_flight = {}
+        queue = iter(queue)
+        while True:
+            for item in queue:
+                try:
+                    future = self._executor().submit(_analyze_file, item[0], self.job_description)
+                except BrokenProcessPool:
+                    # Broke after the last wait(): whatever was in flight is lost
+                    crashed.extend(in_flight.values())
+                    in_flight.clear()
+                    self._reset_pool()
+                    future = self._executor().submit(_analyze_file, item[0], self.job_description)
+                in_flight[future] = item
+                if len(in_flight) >= max_in_flight:
+                    break
+            if not in_flight:
+                return crashed
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            broken = False
+            for future in done:
+                path, size, mtime_ns, digest = item = in_flight.pop(future)
+                name = os.path.relpath(path, self.folder)
+                try:
+                    analysis_results, parsed_resume = future.result()
+                    report = self._write_reports(path, digest, analysis_results, parsed_resume)
+                except BrokenProcessPool:
+                    crashed.append(item)
+                    broken = True
+                    continue
+                except Exception as e:
+                    self._remember(path, size, mtime_ns, digest, 'failed', error=str(e))
+                    summary['failed'] += 1
+                    print(f"✗ {name}: {str(e)}")
+                    continue
+                self._remember(path, size, mtime_ns, digest, 'analyzed', report=report)
+                summary['analyzed'] += 1
+                print(f"✓ {name}: {analysis_results['overall_score']}/100 ({analysis_results['rating']})")
+            if broken:
+                crashed.extend(in_flight.values())
+                in_flight.clear()
+                self._reset_pool()
+
+    def _quarantine(self, item, summary):
+        """Record a file that crashed a worker process by itself"""
+        path, size, mtime_ns, digest = item
+        error = "Analysis process crashed on this file (e.g. out of memory)"
+        self._remember(path, size, mtime_ns, digest, 'failed', error=error)
+        summary['failed'] += 1
+        print(f"✗ {os.path.relpath(path, self.folder)}: {error}")
+
+    def _executor(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        return self._pool
+
+    def _reset_pool(self):
+        """Drop a broken pool; the next submit starts a fresh one"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _write_reports(self, path, digest, analysis_results, parsed_resume):
+        """Write the requested report formats and return their paths (';'-separated)"""
+        base = f"{os.path.splitext(os.path.basename(path))[0]}_{digest[:12]}"
+        generator = self.report_generator
+        if self.output_format == 'all':
+            reports = generator.generate_all_reports(analysis_results, parsed_resume, base)
+            return ';'.join(reports[kind] for kind in ('text', 'json', 'excel'))
+        if self.output_format == 'text':
+            return generator.generate_text_report(analysis_results, parsed_resume, f"{base}.txt")[0]
+        if self.output_format == 'excel':
+            return generator.generate_excel_report(analysis_results, parsed_resume, f"{base}.xlsx")
+        return generator.generate_json_report(analysis_results, parsed_resume, f"{base}.json")[0]
+
+    def _remember(self, path, size, mtime_ns, digest, status, report=None, error=None):
+        self.manifest.record(path, size, mtime_ns, digest, status, report, error)
+        self._stamps[path] = (size, mtime_ns, digest)
+
+    def run(self, once=False):
+        """Scan until interrupted (or a single time with once=True)"""
+        try:
+            while True:
+                started = time.perf_counter()
+                try:
+                    summary = self.scan_once()
+                except Exception as e:
+                    # Keep watching; the files involved are retried next scan
+                    if once:
+                        raise
+                    print(f"✗ Scan failed: {str(e)}")
+                    time.sleep(self.poll_seconds)
+                    continue
+                if summary['analyzed'] or summary['failed'] or summary['duplicate'] or summary['removed'] or once:
+                    print(f"🔁 Scan: {summary['analyzed']} analyzed, {summary['failed']} failed, "
+                          f"{summary['duplicate']} duplicates, {summary['unchanged']} unchanged, "
+                          f"{summary['settling']} still copying, {summary['removed']} removed "
+                          f"({time.perf_counter() - started:.1f}s)")
+                if once:
+                    return summary
+                time.sleep(self.poll_seconds)
+        except KeyboardInterrupt:
+            print("\nStopped watching.")
+        finally:
+            self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+        self.manifest.close()
@@ -0,0 +1,170 @@
+"""
+Fuzzy Skills Module
+Typo-tolerant skill lookup ("Javascrpt", "Node JS", "Scikit Learn") through a
+symmetric-delete index, with a per-document time budget
+"""
+
+import re
+import time
+from functools import lru_cache
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.skill_taxonomy import TOKEN_PATTERN
+
+
+def compact(text):
+    """Lowercase letters, digits, '+' and '#' only: "Node.js" and "Node JS" both give "nodejs" """
+    return re.sub(r'[^\w+#]|_', '', text.lower())
+
+
+@lru_cache(maxsize=8192)
+def deletes(word, distance):
+    """Every string reachable from word by removing up to `distance` characters"""
+    found = {word}
+    edge = {word}
+    for _ in range(distance):
+        edge = {item[:i] + item[i + 1:] for item in edge for i in range(len(item))}
+        found |= edge
+    return frozenset(found)
+
+
+def edit_distance(a, b, limit):
+    """Optimal string alignment distance (adjacent swaps count once), or limit + 1 if above limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class FuzzySkillIndex:
+    """
+    Symmetric-delete index over the compacted spellings of every skill and alias
+
+    Only deletes of the first `prefix_length` characters are indexed, which
+    keeps the index to a few dozen keys per spelling; candidates are then
+    checked against the full spelling.
+    """
+
+    def __init__(self, entries, max_distance=2, distance_thresholds=(7, 10), max_ngram=3, prefix_length=7):
+        """
+        Args:
+            entries (list): (canonical, aliases, category) in taxonomy order
+            max_distance (int): Most edits allowed for any spelling
+            distance_thresholds (tuple): Characters the text needs before
+                1, 2, ... edits are allowed; shorter words must match exactly
+                once compacted, so "reach" is never read as "React"
+            max_ngram (int): Longest run of text tokens tried as one spelling
+            prefix_length (int): Characters of each spelling that are indexed
+        """
+        self.max_distance = max_distance
+        self.distance_thresholds = tuple(distance_thresholds)[:max_distance]
+        self.max_ngram = max_ngram
+        self.prefix_length = prefix_length
+        self.entries = [(canonical, category) for canonical, _, category in entries]
+
+        # compacted spelling -> entry id (first entry wins, as in the exact matcher)
+        self.spellings = {}
+        for entry_id, (canonical, aliases, _) in enumerate(entries):
+            for phrase in [canonical] + list(aliases):
+                key = compact(phrase)
+                if key:
+                    self.spellings.setdefault(key, entry_id)
+
+        # delete of a spelling's prefix -> spellings it came from, deep enough
+        # for the longest text that may still be that many edits away
+        self.index = {}
+        for key in self.spellings:
+            distance = self.allowed_distance(len(key) + self.max_distance)
+            for variant in deletes(key[:self.prefix_length], distance):
+                self.index.setdefault(variant, []).append(key)
+
+    def allowed_distance(self, length):
+        """Edits allowed for text of this many characters"""
+        return sum(1 for threshold in self.distance_thresholds if length >= threshold)
+
+    def lookup(self, candidate):
+        """(entry id, distance) of the closest spelling, or None"""
+        entry_id = self.spellings.get(candidate)
+        if entry_id is not None:
+            return entry_id, 0
+        limit = self.allowed_distance(len(candidate))
+        if not limit:
+            return None
+
+        best = None
+        seen = set()
+        for variant in deletes(candidate[:self.prefix_length], limit):
+            for key in self.index.get(variant, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                distance = edit_distance(candidate, key, limit)
+                if distance <= limit and (best is None or distance < best[1]):
+                    best = (self.spellings[key], distance)
+        return best
+
+    def match(self, text, exclude=(), budget_ms=None):
+        """
+        Find skills written with small typos or different spacing/punctuation
+
+        Args:
+            text (str): Resume text
+            exclude (iterable): Canonical names already found exactly
+            budget_ms (float): Stop looking after this long (None = no limit)
+
+        Returns:
+            tuple: (matches, complete). Matches are dicts with 'skill',
+                   'category', 'matched' (the text as written) and 'distance'
+                   (0 = same letters, spaced or punctuated differently), in
+                   taxonomy order. `complete` is False if the budget ran out.
+        """
+        deadline = time.perf_counter() + budget_ms / 1000 if budget_ms is not None else None
+        excluded = set(exclude)
+        tokens = [(match.start(), match.end(), compact(match.group(0))) for match in TOKEN_PATTERN.finditer(text)]
+        checked = set()
+        best = {}
+        complete = True
+
+        for i in range(len(tokens)):
+            if deadline is not None and time.perf_counter() > deadline:
+                complete = False
+                break
+            candidate = ''
+            for j in range(i, min(i + self.max_ngram, len(tokens))):
+                # A spelling never continues onto the next line
+                if j > i and '\n' in text[tokens[j - 1][1]:tokens[j][0]]:
+                    break
+                candidate += tokens[j][2]
+                if candidate in checked or candidate.isdigit():
+                    continue
+                checked.add(candidate)
+                found = self.lookup(candidate)
+                if found is None:
+                    continue
+                entry_id, distance = found
+                canonical, category = self.entries[entry_id]
+                if canonical in excluded:
+                    continue
+                if entry_id not in best or distance < best[entry_id]['distance']:
+                    best[entry_id] = {
+                        'skill': canonical,
+                        'category': category,
+                        'matched': text[tokens[i][0]:tokens[j][1]],
+                        'distance': distance
+                    }
+
+        return [best[entry_id] for entry_id in sorted(best)], complete
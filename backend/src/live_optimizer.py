@@ -0,0 +1,282 @@
+"""
+Live Optimizer Module
+Keeps analyzed resumes in a SQLite session store shared by every worker
+process on the host and re-scores edits incrementally
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import SECTION_HEADERS
+from src.config_store import current_config
+
+
+class SessionConflict(Exception):
+    """Other workers kept saving the session while an edit was being applied"""
+
+
+class SessionStore:
+    """
+    Optimizer sessions in SQLite (WAL), so an edit can land on any worker
+
+    Every row carries a revision; save() only succeeds against the revision
+    it read, so concurrent edits of one session from different workers are
+    applied one after the other instead of overwriting each other.
+    """
+
+    def __init__(self, db_path, max_sessions=200, ttl_seconds=1800):
+        self.db_path = db_path
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self._connect().execute("""
+            CREATE TABLE IF NOT EXISTS optimizer_sessions (
+                id TEXT PRIMARY KEY,
+                revision INTEGER NOT NULL,
+                state TEXT NOT NULL,
+                updated REAL NOT NULL
+            )
+        """)
+        self._connect().execute(
+            "CREATE INDEX IF NOT EXISTS idx_optimizer_sessions_updated ON optimizer_sessions (updated)"
+        )
+
+    def _connect(self):
+        """One connection per thread and per process (connections must not cross a fork)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def create(self, session_id, state):
+        """Store a new session and evict expired and overflowing ones"""
+        now = time.time()
+        conn = self._connect()
+        conn.execute(
+            "INSERT INTO optimizer_sessions (id, revision, state, updated) VALUES (?, 0, ?, ?)",
+            (session_id, json.dumps(state, default=str), now)
+        )
+        conn.execute("DELETE FROM optimizer_sessions WHERE updated < ?", (now - self.ttl_seconds,))
+        overflow = conn.execute("SELECT COUNT(*) FROM optimizer_sessions").fetchone()[0] - self.max_sessions
+        if overflow > 0:
+            conn.execute(
+                "DELETE FROM optimizer_sessions WHERE id IN "
+                "(SELECT id FROM optimizer_sessions ORDER BY updated LIMIT ?)",
+                (overflow,)
+            )
+
+    def load(self, session_id):
+        """
+        Returns:
+            tuple: (state, revision), or (None, None) for an unknown or expired session
+        """
+        row = self._connect().execute(
+            "SELECT state, revision FROM optimizer_sessions WHERE id = ? AND updated >= ?",
+            (session_id, time.time() - self.ttl_seconds)
+        ).fetchone()
+        if row is None:
+            return None, None
+        return json.loads(row[0]), row[1]
+
+    def save(self, session_id, state, revision):
+        """Replace the state if nobody saved since `revision` was read; returns success"""
+        cursor = self._connect().execute(
+            "UPDATE optimizer_sessions SET state = ?, revision = revision + 1, updated = ? "
+            "WHERE id = ? AND revision = ?",
+            (json.dumps(state, default=str), time.time(), session_id, revision)
+        )
+        return cursor.rowcount == 1
+
+    def delete(self, session_id):
+        cursor = self._connect().execute("DELETE FROM optimizer_sessions WHERE id = ?", (session_id,))
+        return cursor.rowcount == 1
+
+
+class LiveOptimizer:
+    """Iterative Live Optimizer: sessions of analyzed resumes re-scored edit by edit"""
+
+    # Parser outputs that depend on the whole document rather than on the
+    # matches inside the edited lines, so they are always refreshed
+    GLOBAL_FIELDS = ('statistics', 'section_spans')
+
+    # extract_name only looks at the first few lines
+    NAME_LINES = 5
+
+    # Attempts at an edit when other workers keep saving the same session first
+    EDIT_ATTEMPTS = 5
+
+    def __init__(self, parser, analyzer, db_path, max_sessions=200, ttl_seconds=1800):
+        self.parser = parser
+        self.analyzer = analyzer
+        self.sessions = SessionStore(db_path, max_sessions, ttl_seconds)
+
+    def create_session(self, resume_text, job_description=""):
+        """
+        Run a full analysis and keep its intermediate results for later edits
+
+        Returns:
+            tuple: (session_id, parsed_resume, analysis_results)
+        """
+        config_version = current_config().version
+        parsed_resume = self.parser.parse(resume_text)
+        results = self.analyzer.analyze(resume_text, parsed_resume, job_description)
+
+        session_id = uuid.uuid4().hex
+        self.sessions.create(session_id, {
+            'lines': resume_text.split('\n'),
+            'job_description': job_description,
+            'parsed': parsed_resume,
+            'results': results,
+            'config_version': config_version
+        })
+        return session_id, parsed_resume, results
+
+    def close_session(self, session_id):
+        """Drop a session and its cached results"""
+        return self.sessions.delete(session_id)
+
+    def apply_edit(self, session_id, new_text, section=None, start_line=None, end_line=None):
+        """
+        Replace a section body or a line range and re-score the resume
+
+        Args:
+            session_id (str): Session returned by create_session
+            new_text (str): Replacement text for the edited lines
+            section (str): Section name from SECTION_HEADERS (optional)
+            start_line (int): First replaced line, 0-based (optional)
+            end_line (int): Line after the last replaced line (optional)
+
+        Returns:
+            dict: Updated scores plus which parser outputs and stages were recomputed
+        """
+        started = time.perf_counter()
+
+        # Edits to one session are applied in order, whichever worker receives them
+        for _ in range(self.EDIT_ATTEMPTS):
+            session, revision = self.sessions.load(session_id)
+            if session is None:
+                raise KeyError(f"Unknown or expired session: {session_id}")
+            edited_start, new_lines, changed_fields, changed, session = self._rescore(
+                session, new_text, section, start_line, end_line
+            )
+            if self.sessions.save(session_id, session, revision):
+                break
+        else:
+            raise SessionConflict("Session is being edited concurrently; retry the edit")
+        results = session['results']
+
+        return {
+            'overall_score': results['overall_score'],
+            'rating': results['rating'],
+            'scores': results['scores'],
+            'recommendations': results['recommendations'],
+            'strengths': results['strengths'],
+            'edited_lines': [edited_start, edited_start + len(new_lines)],
+            'recomputed': {
+                'parser': sorted(changed_fields),
+                'analysis': sorted(self.analyzer.stale_stages(changed))
+            },
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 2)
+        }
+
+    def _rescore(self, session, new_text, section, start_line, end_line):
+        """Apply one edit to a loaded session state and re-run what it affects"""
+        lines = session['lines']
+        if section is not None:
+            start_line, end_line = self._section_line_range(lines, section)
+        start_line, end_line = self._validate_range(lines, start_line, end_line)
+
+        new_lines = new_text.split('\n') if new_text else []
+        # Skills, date ranges and phone numbers can match across a line break,
+        # so the comparison includes one unchanged line on each side
+        before = lines[max(0, start_line - 1):start_line]
+        after = lines[end_line:end_line + 1]
+        old_segment = "\n".join(before + lines[start_line:end_line] + after)
+        new_segment = "\n".join(before + new_lines + after)
+        lines = lines[:start_line] + new_lines + lines[end_line:]
+        resume_text = "\n".join(lines)
+
+        config_version = current_config().version
+        if config_version == session['config_version']:
+            changed_fields = self._affected_fields(old_segment, new_segment, start_line)
+            parsed_resume = dict(session['parsed'])
+            parsed_resume.update(self.parser.parse_fields(resume_text, changed_fields))
+            previous = session['results']
+        else:
+            # Settings were reloaded: earlier results were computed under the old ones
+            changed_fields = set(self.parser.field_extractors())
+            parsed_resume = self.parser.parse(resume_text)
+            previous = None
+
+        changed = set(changed_fields) | {'text'}
+        results = self.analyzer.analyze(
+            resume_text, parsed_resume, session['job_description'],
+            previous=previous, changed=changed
+        )
+
+        session = dict(session, lines=lines, parsed=parsed_resume, results=results,
+                       config_version=config_version)
+        return start_line, new_lines, changed_fields, changed, session
+
+    def _affected_fields(self, old_segment, new_segment, start_line):
+        """
+        Find parser outputs that an edit can change.
+
+        The extractors report what they find anywhere in the text, so when the
+        removed and inserted lines yield the same result, the whole-document
+        result is unchanged too.
+        """
+        extractors = self.parser.field_extractors()
+        affected = set(self.GLOBAL_FIELDS)
+
+        if start_line < self.NAME_LINES:
+            affected.add('name')
+
+        # Adding or removing a header moves the spans that scoped extractors read
+        old_headers = list(self.parser.segment_sections(old_segment))
+        new_headers = list(self.parser.segment_sections(new_segment))
+        if old_headers != new_headers:
+            affected.update(self.parser.FIELD_SCOPES)
+            affected.update(self.parser.DATE_FIELDS)
+
+        for field, extract in extractors.items():
+            if field in affected:
+                continue
+            if extract(old_segment) != extract(new_segment):
+                affected.add(field)
+
+        return affected
+
+    def _section_line_range(self, lines, section):
+        """Return the body lines (header excluded) of a named section"""
+        if section not in SECTION_HEADERS:
+            raise ValueError(f"Unknown section: {section}")
+
+        span = self.parser.segment_sections("\n".join(lines)).get(section)
+        if span is None:
+            raise ValueError(f"Section not found in resume: {section}")
+        return span['start_line'] + 1, span['end_line']
+
+    def _validate_range(self, lines, start_line, end_line):
+        """Check a [start_line, end_line) range against the current document"""
+        if start_line is None:
+            raise ValueError("Provide either a section or start_line")
+        if end_line is None:
+            end_line = start_line + 1
+        start_line, end_line = int(start_line), int(end_line)
+        if start_line < 0 or end_line < start_line or start_line > len(lines):
+            raise ValueError(f"Invalid line range [{start_line}, {end_line}) for {len(lines)} lines")
+        return start_line, min(end_line, len(lines))
@@ -0,0 +1,120 @@
+"""
+Readability Module
+Flesch scores, reading time and word count from one pass over the text
+
+Uses the same formulas, word/sentence rules and rounding as textstat 0.7.3
+(English), and the same pyphen hyphenation dictionary for syllables, so
+results match textstat exactly when pyphen is installed (pyphen ships with
+the requirements). Without pyphen a vowel-group heuristic is used; on
+typical resumes its syllables-per-word average stays within one 0.1 step of
+textstat's, i.e. within about ±8.5 Flesch reading-ease points and ±1.2
+grade levels.
+"""
+
+import math
+import re
+from functools import lru_cache
+
+try:
+    from pyphen import Pyphen
+    _hyphenator = Pyphen(lang='en_US')
+except ImportError:
+    _hyphenator = None
+
+
+# Bounded word -> syllables table shared by every request in the process
+SYLLABLE_CACHE_SIZE = 50000
+
+# English constants used by textstat
+FRE_BASE = 206.835
+FRE_SENTENCE_LENGTH = 1.015
+FRE_SYLLABLES_PER_WORD = 84.6
+MS_PER_CHAR = 14.69
+
+PUNCTUATION_PATTERN = re.compile(r'[^\w\s]')
+WORD_CHAR_PATTERN = re.compile(r'\w')
+SENTENCE_PATTERN = re.compile(r'\b[^.!?]+[.!?]*')
+VOWEL_GROUP_PATTERN = re.compile(r'[aeiouy]+')
+
+
+def _round(number, points=0):
+    """Round half away from zero, like textstat's legacy rounding"""
+    p = 10 ** points
+    return float(math.floor((number * p) + math.copysign(0.5, number))) / p
+
+
+@lru_cache(maxsize=SYLLABLE_CACHE_SIZE)
+def count_syllables(word):
+    """Count syllables in a lowercase, punctuation-free word"""
+    if _hyphenator is not None:
+        return len(_hyphenator.positions(word)) + 1
+
+    groups = len(VOWEL_GROUP_PATTERN.findall(word))
+    # Silent endings: "managed", "services", "pipeline" (but not "tested", "table")
+    if groups > 1 and (
+        (word.endswith('ed') and not word.endswith(('ted', 'ded')))
+        or (word.endswith('es') and not word.endswith(('ses', 'xes', 'zes', 'ces', 'ges')))
+        or (word.endswith('e') and not word.endswith(('le', 'ee')))
+    ):
+        groups -= 1
+    return max(1, groups)
+
+
+def _sentence_count(text):
+    """Count sentences, ignoring fragments of two words or fewer"""
+    sentences = 0
+    for fragment in SENTENCE_PATTERN.findall(text):
+        words = sum(1 for token in fragment.split() if WORD_CHAR_PATTERN.search(token))
+        if words > 2:
+            sentences += 1
+    return max(1, sentences)
+
+
+def analyze_readability(text):
+    """
+    Compute readability metrics together
+
+    Args:
+        text (str): Resume text
+
+    Returns:
+        dict: flesch_reading_ease, grade_level, reading_time (seconds), word_count
+    """
+    tokens = text.split()
+
+    # Reading time counts raw characters per whitespace token
+    reading_time = _round(sum(len(token) for token in tokens) * MS_PER_CHAR / 1000, 2)
+
+    # A token counts as a word if something is left after removing punctuation
+    word_count = 0
+    syllables = 0
+    for token in tokens:
+        word = PUNCTUATION_PATTERN.sub('', token.lower())
+        if word:
+            word_count += 1
+            syllables += count_syllables(word)
+
+    if word_count == 0:
+        return {
+            'flesch_reading_ease': _round(FRE_BASE, 2),
+            'grade_level': _round(-15.59, 1),
+            'reading_time': reading_time,
+            'word_count': 0
+        }
+
+    sentence_length = _round(word_count / _sentence_count(text), 1)
+    syllables_per_word = _round(syllables / word_count, 1)
+
+    flesch_reading_ease = (
+        FRE_BASE
+        - FRE_SENTENCE_LENGTH * sentence_length
+        - FRE_SYLLABLES_PER_WORD * syllables_per_word
+    )
+    grade_level = 0.39 * sentence_length + 11.8 * syllables_per_word - 15.59
+
+    return {
+        'flesch_reading_ease': _round(flesch_reading_ease, 2),
+        'grade_level': _round(grade_level, 1),
+        'reading_time': reading_time,
+        'word_count': word_count
+    }
@@ -7,6 +7,95 @@ import json
 import pandas as pd
 from datetime import datetime
 import os
+import sys
+
+from openpyxl import Workbook
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config_store import current_config
+
+
+# Excel refuses longer cell values
+EXCEL_CELL_LIMIT = 32767
+
+
+class BatchExcelWriter:
+    """
+    Streams one row per candidate into a single workbook
+
+    Uses openpyxl's write-only mode: each row is serialized to a temporary
+    file as soon as it is added, so memory stays flat however many
+    candidates are exported. Rows cannot be revisited once written.
+
+    Usage:
+        with BatchExcelWriter(path) as writer:
+            for analysis_results, parsed_resume, source in results:
+                writer.add(analysis_results, parsed_resume, source)
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        # Live weights, so columns follow a config reload
+        self.score_keys = list(current_config()['scoring_weights'])
+        self.rows = 0
+        self._workbook = Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet('Candidates')
+        self._sheet.freeze_panes = 'A2'
+        self._sheet.append(
+            ['Candidate', 'File', 'Overall Score', 'Rating']
+            + [key.replace('_', ' ').title() for key in self.score_keys]
+            + ['Email', 'Technical Skills', 'Soft Skills', 'Matched JD Skills',
+               'Missing JD Skills', 'Recommendations', 'Strengths']
+        )
+
+    def add(self, analysis_results, parsed_resume, source=None):
+        """Append the row for one analyzed resume"""
+        scores = analysis_results.get('scores', {})
+        skills = parsed_resume.get('skills', {})
+        skills_match = analysis_results.get('skills_match', {})
+        emails = parsed_resume.get('contact_info', {}).get('emails', [])
+
+        row = [
+            parsed_resume.get('name') or 'Not Found',
+            source,
+            analysis_results.get('overall_score'),
+            analysis_results.get('rating')
+        ]
+        row += [scores.get(key) for key in self.score_keys]
+        row += [
+            emails[0] if emails else None,
+            ', '.join(skills.get('all_technical', [])),
+            ', '.join(skills.get('soft', [])),
+            ', '.join(skills_match.get('matched_skills', [])),
+            ', '.join(skills_match.get('missing_skills', [])),
+            '\n'.join(analysis_results.get('recommendations', [])),
+            '\n'.join(analysis_results.get('strengths', []))
+        ]
+        self._sheet.append([self._cell(value) for value in row])
+        self.rows += 1
+
+    @staticmethod
+    def _cell(value):
+        """Strip characters Excel rejects and cut text to the cell size limit"""
+        if isinstance(value, str):
+            return ILLEGAL_CHARACTERS_RE.sub('', value)[:EXCEL_CELL_LIMIT]
+        return value
+
+    def close(self):
+        """Write the workbook to disk (only once)"""
+        if self._workbook is not None:
+            self._workbook.save(self.filepath)
+            self._workbook = None
+        return self.filepath
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
 
 
 class ReportGenerator:
@@ -256,6 +345,24 @@ DETAILED SCORES:
         
         return None
     
+    def generate_batch_excel_report(self, results, filename):
+        """
+        Write one workbook with a row per candidate
+
+        Args:
+            results (iterable): (analysis_results, parsed_resume, source file)
+                tuples; may be a generator so results never pile up in memory
+            filename (str): Workbook name inside output_dir
+
+        Returns:
+            tuple: (filepath, number of rows written)
+        """
+        filepath = os.path.join(self.output_dir, filename)
+        with BatchExcelWriter(filepath) as writer:
+            for analysis_results, parsed_resume, source in results:
+                writer.add(analysis_results, parsed_resume, source)
+        return filepath, writer.rows
+    
     def generate_all_reports(self, analysis_results, parsed_resume, base_filename='resume_analysis'):
         """Generate all report formats"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
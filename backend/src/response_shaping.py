@@ -0,0 +1,201 @@
+"""
+Response Shaping Module
+Trims /analyze payloads to the fields a client asks for (fields=, profile=,
+compact=), serializes them quickly and compresses JSON responses according
+to the client's Accept-Encoding
+"""
+
+import gzip
+import json
+import os
+import sys
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import RESPONSE_PROFILES, RESPONSE_COMPRESSION
+
+
+# Copies of data found elsewhere in the payload, left out by compact mode:
+# the recruiter view repeats results' strengths, score and roadmap steps,
+# its email/phone come from results.contact_info, and the heatmap only
+# counts key_sections.skills. The text report restates the whole analysis.
+COMPACT_DROPS = (
+    'results.full_report',
+    'recruiter_insights.candidate_details.email',
+    'recruiter_insights.candidate_details.phone',
+    'recruiter_insights.resume_quality.strengths',
+    'recruiter_insights.ats_compatibility.score',
+    'recruiter_insights.improvement_suggestions.content_improvements',
+    'recruiter_insights.skill_heatmap'
+)
+
+FULL_REPORT_PATH = 'results.full_report'
+
+
+def _truthy(value):
+    return str(value).lower() in ('1', 'true', 'yes', 'on')
+
+
+class ResponseShape:
+    """
+    What a client asked /analyze to return
+
+    fields:  comma-separated dotted paths ('results.scores,recruiter_insights')
+    profile: a name from RESPONSE_PROFILES; combined with fields if both are given
+    compact: leave out COMPACT_DROPS (a path also listed in fields is kept)
+    """
+
+    def __init__(self, fields=None, compact=False):
+        self.fields = fields
+        self.compact = compact
+
+    @classmethod
+    def from_args(cls, args):
+        """
+        Read fields/profile/compact from query arguments
+
+        Raises:
+            ValueError: For an unknown profile or an empty field path
+                (unknown paths are rejected by apply)
+        """
+        fields = None
+        profile = args.get('profile')
+        if profile:
+            if profile not in RESPONSE_PROFILES:
+                raise ValueError(f"Unknown profile '{profile}'; choose from {sorted(RESPONSE_PROFILES)}")
+            if RESPONSE_PROFILES[profile] is not None:
+                fields = list(RESPONSE_PROFILES[profile])
+        if args.get('fields'):
+            requested = [path.strip() for path in args['fields'].split(',')]
+            if not all(requested):
+                raise ValueError("fields must be comma-separated paths such as results.scores")
+            if fields is not None or not profile:
+                fields = (fields or []) + requested
+        return cls(fields, _truthy(args.get('compact', '')))
+
+    def wants(self, path):
+        """True if the shaped response will contain `path`"""
+        if self.compact and path in COMPACT_DROPS and not (self.fields and path in self.fields):
+            return False
+        if self.fields is None:
+            return True
+        return any(path == field or path.startswith(field + '.') or field.startswith(path + '.')
+                   for field in self.fields)
+
+    @property
+    def include_report(self):
+        """Whether the text report has to be generated at all"""
+        return self.wants(FULL_REPORT_PATH)
+
+    def apply(self, payload):
+        """
+        Return the payload reduced to the requested fields
+
+        Raises:
+            ValueError: If a field path does not start with a top-level key of the payload
+        """
+        if self.fields is not None:
+            unknown = [path for path in self.fields if path.split('.')[0] not in payload]
+            if unknown:
+                raise ValueError(f"Unknown fields {unknown}; paths start with one of {sorted(payload)}")
+            shaped = {'success': payload.get('success', True)}
+            for path in self.fields:
+                _copy_path(payload, shaped, path.split('.'))
+            payload = shaped
+        if self.compact:
+            keep = set(self.fields or ())
+            for path in COMPACT_DROPS:
+                if path not in keep:
+                    _drop_path(payload, path.split('.'))
+        return payload
+
+
+def _copy_path(source, target, keys):
+    """Copy source[k1][k2]... into target, creating the intermediate dicts; missing paths are skipped"""
+    for key in keys[:-1]:
+        if not isinstance(source, dict) or key not in source:
+            return
+        source = source[key]
+        existing = target.get(key)
+        if not isinstance(existing, dict):
+            existing = target[key] = {}
+        target = existing
+    if isinstance(source, dict) and keys[-1] in source:
+        target[keys[-1]] = source[keys[-1]]
+
+
+def _drop_path(payload, keys):
+    """
+    Remove payload[k1][k2]... if present. Every dict on a COMPACT_DROPS path
+    is built per request by build_analysis_response, so popping from it
+    never alters a cached result.
+    """
+    for key in keys[:-1]:
+        payload = payload.get(key) if isinstance(payload, dict) else None
+    if isinstance(payload, dict):
+        payload.pop(keys[-1], None)
+
+
+def dumps(payload):
+    """Serialize to compact UTF-8 JSON bytes (orjson when available)"""
+    if orjson is not None:
+        return orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(payload, default=str, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def negotiate_encoding(accept_encoding):
+    """
+    Pick 'br', 'gzip' or None from an Accept-Encoding header
+
+    Brotli is preferred when it is installed; q=0 rules an encoding out.
+    """
+    offered = {}
+    for part in (accept_encoding or '').split(','):
+        name, _, params = part.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        offered[name] = quality
+
+    def accepted(encoding):
+        return offered.get(encoding, offered.get('*', 0.0)) > 0
+
+    if brotli is not None and accepted('br'):
+        return 'br'
+    if accepted('gzip'):
+        return 'gzip'
+    return None
+
+
+def compress(body, encoding):
+    """Compress bytes with the negotiated encoding"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=RESPONSE_COMPRESSION['brotli_quality'])
+    return gzip.compress(body, compresslevel=RESPONSE_COMPRESSION['gzip_level'])
+
+
+def should_compress(status_code, mimetype, headers, body_length):
+    """Only sizable, successful JSON bodies that are not already encoded"""
+    return (
+        200 <= status_code < 300 and status_code != 204
+        and mimetype == 'application/json'
+        and 'Content-Encoding' not in headers
+        and body_length >= RESPONSE_COMPRESSION['min_bytes']
+    )
@@ -0,0 +1,174 @@
+"""
+Result Cache Module
+Memoizes (resume, job description, config version) -> analysis results
+in a SQLite database shared by every worker process on the host
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Hits update the LRU access time in batches of this many keys, or this
+# often, instead of writing on every read
+ACCESS_FLUSH_ENTRIES = 100
+ACCESS_FLUSH_SECONDS = 30
+
+
+def content_hash(data):
+    """SHA-256 hex digest of bytes or text"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data or b'').hexdigest()
+
+
+class ResultCache:
+    """Size-bounded analysis result cache backed by SQLite in WAL mode"""
+
+    def __init__(self, db_path, config_version, max_entries=5000, ttl_seconds=24 * 3600):
+        self.db_path = db_path
+        self.config_version = config_version
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+        self._touched = {}
+        self._touched_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS results (
+                    key TEXT PRIMARY KEY,
+                    config_version TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    created REAL NOT NULL,
+                    accessed REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_results_accessed ON results (accessed)")
+            # When each config version was first used here, to tell older versions from newer ones
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS config_versions (
+                    version TEXT PRIMARY KEY,
+                    first_seen REAL NOT NULL
+                )
+            """)
+            conn.execute(
+                "INSERT OR IGNORE INTO config_versions (version, first_seen) VALUES (?, ?)",
+                (config_version, time.time())
+            )
+        self.purge_stale()
+
+    def _connect(self):
+        """One connection per thread and per process (connections must not cross a fork)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def make_key(self, resume_hash, job_description=""):
+        """Cache key for a resume content hash and a job description"""
+        return f"{resume_hash}:{content_hash(job_description)}:{self.config_version}"
+
+    def get(self, key):
+        """Return the cached value for key, or None"""
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT value, created FROM results WHERE key = ? AND config_version = ?",
+                (key, self.config_version)
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            if now - row[1] > self.ttl_seconds:
+                conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                return None
+            self._touch(key, now)
+            return json.loads(row[0])
+        except sqlite3.Error:
+            # A cache failure must never fail the request
+            return None
+
+    def _touch(self, key, now):
+        """Record a hit; access times are written in batches (see ACCESS_FLUSH_*)"""
+        with self._touched_lock:
+            self._touched[key] = now
+            if (len(self._touched) < ACCESS_FLUSH_ENTRIES
+                    and time.monotonic() - self._last_flush < ACCESS_FLUSH_SECONDS):
+                return
+            touched, self._touched = self._touched, {}
+            self._last_flush = time.monotonic()
+        try:
+            self._connect().executemany(
+                "UPDATE results SET accessed = ? WHERE key = ? AND accessed < ?",
+                [(accessed, key, accessed) for key, accessed in touched.items()]
+            )
+        except sqlite3.Error:
+            pass
+
+    def put(self, key, value):
+        """Store a JSON-serializable value and evict the least recently used overflow"""
+        try:
+            now = time.time()
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO results (key, config_version, value, created, accessed) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, self.config_version, json.dumps(value, default=str), now, now)
+            )
+            overflow = conn.execute("SELECT COUNT(*) FROM results").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                conn.execute(
+                    "DELETE FROM results WHERE key IN "
+                    "(SELECT key FROM results ORDER BY accessed LIMIT ?)",
+                    (overflow,)
+                )
+        except sqlite3.Error:
+            pass
+
+    def set_config_version(self, config_version):
+        """Switch to a new config version and drop entries computed under older ones"""
+        self.config_version = config_version
+        try:
+            # A switch makes the version the newest, also when rolling back to an earlier one
+            self._connect().execute(
+                "INSERT OR REPLACE INTO config_versions (version, first_seen) VALUES (?, ?)",
+                (config_version, time.time())
+            )
+        except sqlite3.Error:
+            pass
+        self.purge_stale()
+
+    def purge_stale(self):
+        """
+        Delete entries past their TTL or from config versions older than ours.
+        Newer versions are kept: during a rolling reload, workers still on the
+        old version must not delete what the reloaded ones store.
+        """
+        try:
+            conn = self._connect()
+            older = (
+                "SELECT version FROM config_versions WHERE first_seen < "
+                "(SELECT first_seen FROM config_versions WHERE version = ?)"
+            )
+            conn.execute(
+                f"DELETE FROM results WHERE created < ? OR config_version IN ({older})",
+                (time.time() - self.ttl_seconds, self.config_version)
+            )
+            conn.execute(f"DELETE FROM config_versions WHERE version IN ({older})", (self.config_version,))
+        except sqlite3.Error:
+            pass
+
+    def clear(self):
+        """Remove every entry"""
+        with self._touched_lock:
+            self._touched = {}
+        self._connect().execute("DELETE FROM results")
@@ -11,21 +11,62 @@ import os
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config.config import (
-    TECHNICAL_SKILLS, SOFT_SKILLS, EDUCATION_KEYWORDS,
-    EXPERIENCE_KEYWORDS, SECTION_HEADERS
-)
+from config.config import EDUCATION_KEYWORDS, EXPERIENCE_KEYWORDS, SECTION_HEADERS, FUZZY_SKILLS
+from src.date_ranges import extract_date_ranges
+from src.skill_taxonomy import SOFT_CATEGORY
+from src.config_store import current_config
+
+
+def section_ranges(span):
+    """(start, end) offsets of every block of a section, repeated headers included"""
+    return span.get('ranges') or [(span['start'], span['end'])]
+
+
+def scoped_text(text, section_spans, sections):
+    """
+    Join the text of the given sections in document order.
+    Falls back to the whole text when none of them were found.
+    """
+    if not sections or not section_spans:
+        return text
+    spans = sorted(
+        (start, end)
+        for name in sections if name in section_spans
+        for start, end in section_ranges(section_spans[name])
+    )
+    if not spans:
+        return text
+    return "\n".join(text[start:end] for start, end in spans)
 
 
 class ResumeParser:
     """Parse resume text and extract structured information"""
     
+    # Sections each extractor is restricted to (whole text if none are found)
+    FIELD_SCOPES = {
+        'education': ('education',),
+        'timeline': ('experience',)
+    }
+    
+    # Extractors that share the date ranges found in the experience section
+    DATE_FIELDS = ('experience', 'timeline')
+    DATE_SCOPE = ('experience',)
+    
+    # Words that may follow a header on a header line ("Employment History")
+    HEADER_QUALIFIERS = {'history', 'details', 'information', 'overview', 'highlights', 'me', 'section'}
+    
     def __init__(self):
         self.email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
         self.phone_pattern = r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
         self.linkedin_pattern = r'linkedin\.com/in/[\w-]+'
         self.github_pattern = r'github\.com/[\w-]+'
         
+        # Header -> section ("academic projects" is a projects header, not education)
+        self.header_sections = {
+            header: section_name for section_name, headers in SECTION_HEADERS.items() for header in headers
+        }
+        self.headers_by_length = sorted(self.header_sections, key=len, reverse=True)
+        
     def extract_contact_info(self, text):
         """Extract contact information from resume"""
         contact_info = {
@@ -67,32 +108,33 @@ class ResumeParser:
         return "Not Found"
     
     def extract_skills(self, text):
-        """Extract technical and soft skills from resume"""
-        text_lower = text.lower()
+        """
+        Extract technical and soft skills (aliases count as the canonical skill).
+        Near misses such as "Javascrpt" or "Scikit Learn" are listed separately
+        under 'fuzzy' and do not count as skills.
+        """
+        config = current_config()
         found_skills = {
             'technical': {},
             'soft': [],
-            'all_technical': []
+            'all_technical': [],
+            'fuzzy': [],
+            'fuzzy_complete': True
         }
         
-        # Extract technical skills by category
-        for category, skills in TECHNICAL_SKILLS.items():
-            found_in_category = []
-            for skill in skills:
-                # Use word boundaries for better matching
-                pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-                if re.search(pattern, text_lower):
-                    found_in_category.append(skill)
-                    found_skills['all_technical'].append(skill)
-            
-            if found_in_category:
-                found_skills['technical'][category] = found_in_category
-        
-        # Extract soft skills
-        for skill in SOFT_SKILLS:
-            pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-            if re.search(pattern, text_lower):
+        # Matches come back in taxonomy order, so categories keep their config order
+        exact = config.skill_matcher.match(text)
+        for skill, category in exact:
+            if category == SOFT_CATEGORY:
                 found_skills['soft'].append(skill)
+            else:
+                found_skills['technical'].setdefault(category, []).append(skill)
+                found_skills['all_technical'].append(skill)
+        
+        if FUZZY_SKILLS['enabled']:
+            found_skills['fuzzy'], found_skills['fuzzy_complete'] = config.fuzzy_index.match(
+                text, exclude=[skill for skill, _ in exact], budget_ms=FUZZY_SKILLS['budget_ms']
+            )
         
         return found_skills
     
@@ -118,8 +160,14 @@ class ResumeParser:
                                          for header in SECTION_HEADERS['education'])
         }
     
-    def extract_experience(self, text):
-        """Extract work experience information with dates and titles"""
+    def extract_experience(self, text, date_records=None):
+        """
+        Extract work experience information with dates and titles
+        
+        Args:
+            text (str): Resume text
+            date_records (list): Date ranges of the experience section (found in text if None)
+        """
         text_lower = text.lower()
         
         # 1. Extract years of experience mentioned (e.g., "5 years of experience", "Total 5+ years")
@@ -133,8 +181,8 @@ class ResumeParser:
                 experience_years.extend(matches)
         
         # 2. Extract specific date ranges (e.g., "Jan 2020 - Present", "2018 to 2019")
-        date_range_pattern = r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4}\s*(?:-|to|until)\s*(?:Present|(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4})'
-        date_ranges = re.findall(date_range_pattern, text, re.IGNORECASE)
+        if date_records is None:
+            date_records = extract_date_ranges(text)
         
         # 3. Simple Title detection (often near start of lines in experience section)
         # Looking for common job title suffixes/suffixes
@@ -155,7 +203,8 @@ class ResumeParser:
         return {
             'years_mentioned': experience_years,
             'keywords_found': experience_keywords_found,
-            'date_ranges': date_ranges,
+            'date_ranges': [record['text'] for record in date_records],
+            'date_records': date_records,
             'detected_titles': titles[:10],
             'has_experience_section': any(re.search(r'\b' + re.escape(header) + r'\b', text_lower) 
                                           for header in SECTION_HEADERS['experience'])
@@ -177,6 +226,87 @@ class ResumeParser:
         
         return sections_found
     
+    def match_section_header(self, line):
+        """
+        Return the section a line is a header for, or None
+        
+        An exact header wins, then the longest header the line starts with,
+        provided the rest is joined with '&'/'and' ("Education & Training"),
+        is another header or a qualifier such as "history". Lines with
+        content after a colon are entries, not headers.
+        
+        >>> parser = ResumeParser()
+        >>> [parser.match_section_header(line) for line in
+        ...  ['Academic Projects', 'WORK EXPERIENCE:', 'Skills & Certifications', 'Technical Skills Summary']]
+        ['projects', 'experience', 'skills', 'skills']
+        >>> [parser.match_section_header(line) for line in
+        ...  ['Education Technology Inc', 'About the team', 'Skills: Python, Java']]
+        [None, None, None]
+        """
+        _, colon, rest = line.partition(':')
+        if colon and rest.strip():
+            return None
+        cleaned = re.sub(r'[^a-z& ]', ' ', line.lower())
+        cleaned = " ".join(cleaned.split())
+        if not cleaned or len(cleaned.split()) > 4:
+            return None
+        if cleaned in self.header_sections:
+            return self.header_sections[cleaned]
+        for header in self.headers_by_length:
+            if cleaned.startswith(header + ' '):
+                remainder = cleaned[len(header) + 1:]
+                joined = re.match(r'(?:&|and) ', remainder)
+                if joined or remainder in self.header_sections or remainder in self.HEADER_QUALIFIERS:
+                    return self.header_sections[header]
+        return None
+    
+    def segment_sections(self, text):
+        """
+        Split the resume into sections at header lines
+        
+        Returns:
+            dict: section name -> span with character offsets ('start', 'end'),
+                  line numbers ('start_line', 'end_line', end exclusive) and the
+                  header line of its first block, plus 'ranges': the (start, end)
+                  offsets of every block, since a header can appear more than
+                  once. Spans include the header line and are listed in
+                  document order.
+        
+        >>> spans = ResumeParser().segment_sections("Experience\\nA\\nEducation\\nB\\nExperience\\nC")
+        >>> spans['experience']['ranges'], spans['education']['ranges']
+        ([[0, 12], [25, 37]], [[13, 24]])
+        """
+        spans = {}
+        current = None
+        offset = 0
+        lines = text.split('\n')
+        
+        for i, line in enumerate(lines):
+            section_name = self.match_section_header(line)
+            if section_name is not None:
+                if current is not None:
+                    current['ranges'][-1][1] = offset - 1
+                    if len(current['ranges']) == 1:
+                        current['end'] = offset - 1
+                        current['end_line'] = i
+                if section_name in spans:
+                    # A repeated header continues its section
+                    current = spans[section_name]
+                    current['ranges'].append([offset, len(text)])
+                else:
+                    current = {
+                        'header': line.strip(),
+                        'start': offset,
+                        'end': len(text),
+                        'start_line': i,
+                        'end_line': len(lines),
+                        'ranges': [[offset, len(text)]]
+                    }
+                    spans[section_name] = current
+            offset += len(line) + 1
+        
+        return spans
+    
     def get_word_count(self, text):
         """Get word count statistics"""
         words = text.split()
@@ -186,86 +316,33 @@ class ResumeParser:
             'sentences': len(re.findall(r'[.!?]+', text))
         }
 
-    def extract_experience_timeline(self, text):
+    def extract_experience_timeline(self, text, date_records=None):
         """
         Extract detailed timeline from experience section
-        """
-        from datetime import datetime
-        
-        text_lower = text.lower()
-        month_map = {
-            'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
-            'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
-            'january': 1, 'february': 2, 'march': 3, 'april': 4, 'may': 5, 'june': 6,
-            'july': 7, 'august': 8, 'september': 9, 'october': 10, 'november': 11, 'december': 12,
-            'sept': 9 
-        }
         
-        timeline = []
+        Args:
+            text (str): Experience section text
+            date_records (list): Date ranges of the experience section (found in text if None)
+        """
         total_months = 0
         risks = []
         
-        current_year = datetime.now().year
-        current_month = datetime.now().month
-
-        # Regex for dates: "Jan 2020 - Present", "01/2019 to 03/2021"
-        try:
-           date_pattern = r'((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?|(?:\d{1,2}[/-]))?\s*(\d{4})\s*(?:-|to|until)\s*((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?|(?:\d{1,2}[/-]))?\s*(\d{4}|Present|Current|Now)'
-           matches = re.findall(date_pattern, text, re.IGNORECASE)
-        except:
-           matches = []
+        if date_records is None:
+            date_records = extract_date_ranges(text)
         
         parsed_ranges = []
-
-        for match in matches:
-            # (start_month, start_year, end_month, end_year)
-            # Findall returns tuple of groups
-            # Unpack robustly
-            if len(match) < 4: continue
-            
-            s_m_str, s_y_str, e_m_str, e_y_str = match[0], match[1], match[2], match[3]
-            
-            try:
-                # Start Date
-                s_month = 1
-                if s_m_str:
-                    clean_s = re.sub(r'[^a-zA-Z0-9]', '', s_m_str).lower()[:3]
-                    if clean_s.isdigit():
-                        s_month = int(clean_s)
-                    else:
-                        s_month = month_map.get(clean_s, 1)
-                
-                s_year = int(s_y_str)
-                
-                # End Date
-                e_month = 12
-                e_year = current_year
-                
-                if e_y_str.lower() in ['present', 'current', 'now']:
-                    e_month = current_month
-                    e_year = current_year
-                else:
-                    e_year = int(e_y_str)
-                    if e_m_str:
-                        clean_e = re.sub(r'[^a-zA-Z0-9]', '', e_m_str).lower()[:3]
-                        if clean_e.isdigit():
-                            e_month = int(clean_e)
-                        else:
-                            e_month = month_map.get(clean_e, 12)
-
-                # Duration
-                months = (e_year - s_year) * 12 + (e_month - s_month)
-                
-                if months > 0 and months < 480: # Valid range (0 to 40 years)
-                    parsed_ranges.append({
-                        'start': f"{s_month}/{s_year}",
-                        'end': f"{e_month}/{e_year}" if e_y_str.lower() not in ['present','current','now'] else "Present",
-                        'months': months,
-                        'years': round(months/12, 1)
-                    })
-                    total_months += months
-            except:
-                continue
+        for record in date_records:
+            months = record['span_months']
+            if months > 0 and months < 480: # Valid range (0 to 40 years)
+                start_year, start_month = record['start'].split('-')
+                end_year, end_month = record['end'].split('-')
+                parsed_ranges.append({
+                    'start': f"{int(start_month)}/{start_year}",
+                    'end': "Present" if record['is_current'] else f"{int(end_month)}/{end_year}",
+                    'months': months,
+                    'years': round(months/12, 1)
+                })
+                total_months += months
                 
         # Basic Risk analysis
         if total_months > 0:
@@ -282,6 +359,41 @@ class ResumeParser:
             'risks': risks
         }
     
+    def field_extractors(self):
+        """Map each parsed output key to the method that produces it"""
+        return {
+            'section_spans': self.segment_sections,
+            'name': self.extract_name,
+            'contact_info': self.extract_contact_info,
+            'skills': self.extract_skills,
+            'education': self.extract_education,
+            'experience': self.extract_experience,
+            'timeline': self.extract_experience_timeline,
+            'sections': self.detect_sections,
+            'statistics': self.get_word_count
+        }
+    
+    def parse_fields(self, text, fields):
+        """Extract only the requested parsed output keys"""
+        extractors = self.field_extractors()
+        section_spans = self.segment_sections(text)
+        parsed = {}
+        date_records = None
+        for field in fields:
+            if field == 'section_spans':
+                parsed[field] = section_spans
+            elif field in self.DATE_FIELDS:
+                # Dates outside the experience section (education, certifications)
+                # are not employment, so both fields read the same records
+                if date_records is None:
+                    date_records = extract_date_ranges(scoped_text(text, section_spans, self.DATE_SCOPE))
+                field_text = scoped_text(text, section_spans, self.FIELD_SCOPES.get(field))
+                parsed[field] = extractors[field](field_text, date_records=date_records)
+            else:
+                field_text = scoped_text(text, section_spans, self.FIELD_SCOPES.get(field))
+                parsed[field] = extractors[field](field_text)
+        return parsed
+    
     def parse(self, text):
         """
         Main parsing method that extracts all information from resume
@@ -292,15 +404,6 @@ class ResumeParser:
         Returns:
             dict: Parsed resume information
         """
-        parsed_data = {
-            'name': self.extract_name(text),
-            'contact_info': self.extract_contact_info(text),
-            'skills': self.extract_skills(text),
-            'education': self.extract_education(text),
-            'experience': self.extract_experience(text),
-            'timeline': self.extract_experience_timeline(text),
-            'sections': self.detect_sections(text),
-            'statistics': self.get_word_count(text)
-        }
+        parsed_data = self.parse_fields(text, self.field_extractors().keys())
         
         return parsed_data
\ No newline at end of file
@@ -0,0 +1,234 @@
+"""
+Singleflight Module
+Coalesces identical analyses that are in flight at the same time (a
+double-click, a client retry): the first request computes, later ones wait
+for its result. Threads of one process share an in-memory registry; worker
+processes on the host coordinate through per-key lock files and then read
+the leader's result from the shared result cache.
+"""
+
+import asyncio
+import hashlib
+import os
+import threading
+import time
+import sys
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import SINGLEFLIGHT
+
+# Pause between attempts to take a lock file held by another process
+LOCK_POLL_SECONDS = 0.05
+
+
+class _Call:
+    """An in-flight computation other threads can wait on"""
+
+    __slots__ = ('event', 'value', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class _FileLock:
+    __slots__ = ('fd', 'path', 'waited')
+
+    def __init__(self, fd, path, waited):
+        self.fd = fd
+        self.path = path
+        self.waited = waited
+
+
+class SingleFlight:
+    """
+    Runs at most one computation per key at a time on this host
+
+    do(key, compute, lookup):
+      - another thread already computing the key: wait and share its result
+        (or its exception); the result is shared, so treat it as read-only
+      - another process computing the key (its lock file is held): wait for
+        the lock, then return lookup() if that process stored a result
+      - otherwise: compute() while holding the lock file
+
+    Lock files are removed by their holder before unlocking; a waiter that
+    ends up locking a removed file notices and opens the new one. Without
+    fcntl (Windows) only threads of one process are coalesced.
+    """
+
+    def __init__(self, lock_dir=None, wait_seconds=None):
+        self.lock_dir = lock_dir or SINGLEFLIGHT['lock_dir']
+        self.wait_seconds = SINGLEFLIGHT['wait_seconds'] if wait_seconds is None else wait_seconds
+        self.stats = {'computed': 0, 'coalesced': 0, 'shared_across_processes': 0}
+        self._calls = {}
+        self._async_calls = {}
+        self._lock = threading.Lock()
+        os.makedirs(self.lock_dir, exist_ok=True)
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def do(self, key, compute, lookup=None):
+        """
+        Return compute() for key, sharing it with concurrent callers
+
+        Args:
+            key (str): Identifies the computation (e.g. a result cache key)
+            compute (callable): Produces the value; should store it where
+                lookup() finds it so other processes can reuse it
+            lookup (callable): Returns the value stored by another process, or None
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            if call.event.wait(self.wait_seconds):
+                self._count('coalesced')
+                if call.error is not None:
+                    raise call.error
+                return call.value
+            return compute()
+
+        try:
+            call.value = self._run_locked(key, compute, lookup)
+            return call.value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    def _run_locked(self, key, compute, lookup):
+        handle = self._acquire_file(key)
+        try:
+            if handle is not None and handle.waited and lookup is not None:
+                value = lookup()
+                if value is not None:
+                    self._count('shared_across_processes')
+                    return value
+            self._count('computed')
+            return compute()
+        finally:
+            self._release_file(handle)
+
+    async def do_async(self, key, compute, lookup=None):
+        """
+        Coroutine version of do() for an asyncio server
+
+        Args:
+            key (str): Identifies the computation
+            compute (callable): Coroutine function producing the value
+            lookup (callable): Blocking function returning a value stored by
+                another process, or None (run in the default executor)
+        """
+        loop = asyncio.get_running_loop()
+        future = self._async_calls.get(key)
+        if future is not None:
+            try:
+                value = await asyncio.wait_for(asyncio.shield(future), self.wait_seconds)
+            except asyncio.TimeoutError:
+                return await compute()
+            except asyncio.CancelledError:
+                # The leader's client went away (the shield keeps our own
+                # cancellation from touching the shared future)
+                if future.cancelled():
+                    return await compute()
+                raise
+            self._count('coalesced')
+            return value
+
+        future = self._async_calls[key] = loop.create_future()
+        try:
+            handle = await loop.run_in_executor(None, self._acquire_file, key)
+            try:
+                value = None
+                if handle is not None and handle.waited and lookup is not None:
+                    value = await loop.run_in_executor(None, lookup)
+                    if value is not None:
+                        self._count('shared_across_processes')
+                if value is None:
+                    self._count('computed')
+                    value = await compute()
+            finally:
+                self._release_file(handle)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            if not future.done():
+                future.set_exception(e)
+                # Followers re-raise it; don't warn when there are none
+                future.exception()
+            raise
+        finally:
+            del self._async_calls[key]
+
+    def _acquire_file(self, key):
+        """
+        Exclusive lock on the key's lock file, waiting up to wait_seconds
+
+        Returns:
+            _FileLock or None: None if locking is unavailable or timed out
+                (the caller then simply computes)
+        """
+        if fcntl is None:
+            return None
+        path = os.path.join(self.lock_dir, hashlib.sha256(key.encode('utf-8')).hexdigest()[:32] + '.lock')
+        deadline = time.monotonic() + self.wait_seconds
+        waited = False
+        while True:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    waited = True
+                    if time.monotonic() > deadline:
+                        os.close(fd)
+                        return None
+                    time.sleep(LOCK_POLL_SECONDS)
+            try:
+                if os.fstat(fd).st_ino == os.stat(path).st_ino:
+                    return _FileLock(fd, path, waited)
+            except FileNotFoundError:
+                pass
+            # Locked a file its previous holder already removed; use the new one
+            os.close(fd)
+
+    @staticmethod
+    def _release_file(handle):
+        if handle is None:
+            return
+        try:
+            os.unlink(handle.path)
+        except OSError:
+            pass
+        fcntl.flock(handle.fd, fcntl.LOCK_UN)
+        os.close(handle.fd)
+
+    def metrics_text(self):
+        """Prometheus counters of this process"""
+        lines = [
+            "# HELP ats_singleflight_total Analyses by how they were served",
+            "# TYPE ats_singleflight_total counter"
+        ]
+        with self._lock:
+            for outcome, count in sorted(self.stats.items()):
+                lines.append(f'ats_singleflight_total{{outcome="{outcome}"}} {count}')
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,308 @@
+"""
+Skill Taxonomy Module
+Matches canonical skills and their aliases against text using a token trie
+that is compiled once into a binary snapshot and memory-mapped at startup
+"""
+
+import csv
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import tempfile
+from functools import lru_cache
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import TECHNICAL_SKILLS, SOFT_SKILLS, SKILL_ALIASES, SKILLS_TAXONOMY
+
+
+# Category reported under skills['soft'] rather than skills['technical']
+SOFT_CATEGORY = 'soft'
+
+# Keeps "c++", "c#", "node.js" and "asp.net" whole; "CI/CD" becomes "ci", "cd"
+TOKEN_PATTERN = re.compile(r'\w(?:[\w+#.]*[\w+#])?')
+
+# Bump when the snapshot layout or tokenization changes
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_MAGIC = b'ATSSKIL1'
+
+# magic, slot count, node count, entry count, category count, longest phrase in tokens
+HEADER = struct.Struct('<8sIIIII')
+# edge key (0 = empty), child node
+SLOT = struct.Struct('<QI')
+# entry id of the phrase ending at this node, or -1
+NODE = struct.Struct('<i')
+# string pool offset, length, category index
+ENTRY = struct.Struct('<IHH')
+# string pool offset, length
+CATEGORY = struct.Struct('<IH')
+
+EDGE_MIX = 0x9E3779B97F4A7C15
+KEY_MASK = (1 << 64) - 1
+
+
+def tokenize(text):
+    """Lowercase match tokens of a skill phrase or a document"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def token_hash(token):
+    """64-bit hash of one token"""
+    return int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def edge_key(parent, token_hashed):
+    """Hash-table key of the trie edge from a node over a token (never 0)"""
+    return ((token_hashed ^ (parent * EDGE_MIX)) & KEY_MASK) or 1
+
+
+def builtin_entries(technical_skills=None, soft_skills=None, skill_aliases=None):
+    """(canonical, aliases, category) for the skill lists (config defaults if omitted)"""
+    technical_skills = TECHNICAL_SKILLS if technical_skills is None else technical_skills
+    soft_skills = SOFT_SKILLS if soft_skills is None else soft_skills
+    skill_aliases = SKILL_ALIASES if skill_aliases is None else skill_aliases
+    entries = []
+    for category, skills in technical_skills.items():
+        for skill in skills:
+            entries.append((skill, skill_aliases.get(skill, []), category))
+    for skill in soft_skills:
+        entries.append((skill, skill_aliases.get(skill, []), SOFT_CATEGORY))
+    return entries
+
+
+def read_taxonomy_file(path):
+    """
+    Read an external taxonomy
+
+    JSON: a list of {"canonical": ..., "aliases": [...], "category": ...}.
+    CSV: columns canonical, aliases ('|'-separated) and category.
+
+    Returns:
+        list: (canonical, aliases, category) tuples
+    """
+    entries = []
+    if path.lower().endswith('.json'):
+        with open(path, encoding='utf-8') as f:
+            rows = json.load(f)
+        for row in rows:
+            entries.append((row['canonical'], list(row.get('aliases') or []), row.get('category') or 'other'))
+    else:
+        with open(path, encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                aliases = [alias.strip() for alias in (row.get('aliases') or '').split('|') if alias.strip()]
+                entries.append((row['canonical'].strip(), aliases, (row.get('category') or '').strip() or 'other'))
+    return entries
+
+
+def merge_entries(base, extra):
+    """Add extra entries to base; aliases of a skill already in base are merged into it"""
+    merged = {}
+    for canonical, aliases, category in list(base) + list(extra):
+        key = canonical.lower()
+        if key in merged:
+            merged[key][1].extend(aliases)
+        else:
+            merged[key] = (canonical, list(aliases), category)
+    return list(merged.values())
+
+
+def compile_snapshot(entries, path):
+    """
+    Compile taxonomy entries into a snapshot file
+
+    The trie is keyed on tokens, so lookups cost one hash probe per token
+    whatever the taxonomy size. Edges are stored in an open-addressing table
+    of 64-bit keys; token strings are not kept, so an unrelated token
+    colliding with a real edge is possible but has odds around 2**-64.
+    The file is written next to its target and renamed into place, so
+    concurrent workers never see a partial snapshot.
+    """
+    categories = []
+    category_index = {}
+    edges = {}
+    node_entries = [-1]
+    max_tokens = 0
+
+    for entry_id, (canonical, aliases, category) in enumerate(entries):
+        if category not in category_index:
+            category_index[category] = len(categories)
+            categories.append(category)
+        for phrase in [canonical] + list(aliases):
+            tokens = tokenize(phrase)
+            if not tokens:
+                continue
+            max_tokens = max(max_tokens, len(tokens))
+            node = 0
+            for token in tokens:
+                key = edge_key(node, token_hash(token))
+                child = edges.get(key)
+                if child is None:
+                    child = len(node_entries)
+                    node_entries.append(-1)
+                    edges[key] = child
+                node = child
+            # First entry wins when two skills share a spelling
+            if node_entries[node] < 0:
+                node_entries[node] = entry_id
+
+    slot_count = max(8, len(edges) * 2)
+    slots = [(0, 0)] * slot_count
+    for key, child in edges.items():
+        slot = key % slot_count
+        while slots[slot][0]:
+            slot = (slot + 1) % slot_count
+        slots[slot] = (key, child)
+
+    pool = bytearray()
+
+    def intern(text):
+        data = text.encode('utf-8')
+        offset = len(pool)
+        pool.extend(data)
+        return offset, len(data)
+
+    entry_table = bytearray()
+    for canonical, _, category in entries:
+        offset, length = intern(canonical)
+        entry_table += ENTRY.pack(offset, length, category_index[category])
+    category_table = bytearray()
+    for category in categories:
+        category_table += CATEGORY.pack(*intern(category))
+
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(HEADER.pack(SNAPSHOT_MAGIC, slot_count, len(node_entries), len(entries),
+                                len(categories), max_tokens))
+            f.write(b''.join(SLOT.pack(key, child) for key, child in slots))
+            f.write(b''.join(NODE.pack(entry) for entry in node_entries))
+            f.write(entry_table)
+            f.write(category_table)
+            f.write(pool)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class SkillMatcher:
+    """Read-only view of a compiled snapshot"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.slot_count, node_count, self.entry_count, category_count, self.max_tokens = \
+            HEADER.unpack_from(self._buf, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"Not a skills snapshot: {path}")
+
+        self._slots_at = HEADER.size
+        self._nodes_at = self._slots_at + self.slot_count * SLOT.size
+        self._entries_at = self._nodes_at + node_count * NODE.size
+        categories_at = self._entries_at + self.entry_count * ENTRY.size
+        self._pool_at = categories_at + category_count * CATEGORY.size
+
+        self.categories = [
+            self._string(*CATEGORY.unpack_from(self._buf, categories_at + i * CATEGORY.size))
+            for i in range(category_count)
+        ]
+        self.match = lru_cache(maxsize=64)(self._match)
+
+    def _string(self, offset, length):
+        start = self._pool_at + offset
+        return self._buf[start:start + length].decode('utf-8')
+
+    def _child(self, node, token_hashed):
+        """Node reached from `node` over a token, or None"""
+        key = edge_key(node, token_hashed)
+        slot = key % self.slot_count
+        while True:
+            stored, child = SLOT.unpack_from(self._buf, self._slots_at + slot * SLOT.size)
+            if stored == key:
+                return child
+            if not stored:
+                return None
+            slot = (slot + 1) % self.slot_count
+
+    def entry(self, entry_id):
+        """(canonical, category) of an entry"""
+        offset, length, category = ENTRY.unpack_from(self._buf, self._entries_at + entry_id * ENTRY.size)
+        return self._string(offset, length), self.categories[category]
+
+    def _match(self, text):
+        """
+        Find every skill mentioned in the text
+
+        Args:
+            text (str): Resume or job description text
+
+        Returns:
+            tuple: (canonical, category) pairs in taxonomy order, each once.
+                   Overlapping phrases all count ("Tailwind CSS" also finds "CSS").
+        """
+        hashes = {}
+        stream = []
+        for token in tokenize(text):
+            hashed = hashes.get(token)
+            if hashed is None:
+                hashed = hashes[token] = token_hash(token)
+            stream.append(hashed)
+
+        found = set()
+        for i in range(len(stream)):
+            node = 0
+            for hashed in stream[i:i + self.max_tokens]:
+                node = self._child(node, hashed)
+                if node is None:
+                    break
+                entry_id = NODE.unpack_from(self._buf, self._nodes_at + node * NODE.size)[0]
+                if entry_id >= 0:
+                    found.add(entry_id)
+        return tuple(self.entry(entry_id) for entry_id in sorted(found))
+
+    def close(self):
+        self._buf.close()
+
+
+def taxonomy_fingerprint(entries, source_path=None):
+    """Identifies the snapshot built from the given entries plus an optional external file"""
+    digest = hashlib.sha256()
+    digest.update(str(SNAPSHOT_FORMAT).encode())
+    digest.update(json.dumps(entries).encode('utf-8'))
+    if source_path:
+        with open(source_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def load_matcher(source_path=None, snapshot_dir=None, entries=None):
+    """
+    Map the snapshot for this taxonomy, compiling it first if it does not exist
+
+    Args:
+        source_path (str): External JSON/CSV taxonomy merged over the entries
+        snapshot_dir (str): Where snapshots are kept (one file per fingerprint)
+        entries (list): Base (canonical, aliases, category) entries;
+            builtin_entries() if omitted
+
+    Returns:
+        SkillMatcher
+    """
+    entries = builtin_entries() if entries is None else entries
+    snapshot_dir = snapshot_dir or SKILLS_TAXONOMY['snapshot_dir']
+    path = os.path.join(snapshot_dir, f"skills-{taxonomy_fingerprint(entries, source_path)}.bin")
+    if not os.path.exists(path):
+        if source_path:
+            entries = merge_entries(entries, read_taxonomy_file(source_path))
+        compile_snapshot(entries, path)
+    return SkillMatcher(path)
@@ -1,11 +1,99 @@
 """
 Text Extractor Module
-Handles extraction of text from PDF and DOCX files
+Handles extraction of text from PDF, DOCX and legacy DOC files
 """
 
 import pdfplumber
-from docx import Document
 import os
+import re
+import shutil
+import struct
+import subprocess
+import tempfile
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+from collections import Counter
+from itertools import islice
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdfdocument import PDFDocument, PDFPasswordIncorrect
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdftypes import resolve1
+from pdfminer.psparser import PSLiteral
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import PREFLIGHT_LIMITS
+
+try:
+    import olefile
+except ImportError:
+    olefile = None
+
+
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+
+# Run-level elements that stand for characters in WordprocessingML
+DOCX_RUN_CHARS = {
+    W_NS + 'tab': '\t',
+    W_NS + 'br': '\n',
+    W_NS + 'cr': '\n',
+    W_NS + 'noBreakHyphen': '-'
+}
+
+# Magic bytes of an OLE2 compound file (legacy .doc, or an encrypted .docx)
+OLE_MAGIC = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+
+# Seconds an external .doc converter may run
+DOC_CONVERTER_TIMEOUT = 30
+
+# Pre-flight opens the resources of at most this many pages and extrapolates
+PREFLIGHT_SAMPLE_PAGES = 25
+
+# Text characters per byte of an uncompressed page content stream, and the
+# typical expansion of Flate / ASCII85 encoded streams (measured on resumes)
+CONTENT_TEXT_RATIO = 0.3
+STREAM_EXPANSION = {'FlateDecode': 4.0, 'ASCII85Decode': 0.8, 'LZWDecode': 2.5}
+
+# Text characters per byte of uncompressed WordprocessingML
+DOCX_TEXT_RATIO = 0.15
+
+# Text-showing operators (Tj, TJ, ', ") after a string or array operand
+PDF_TEXT_OPERATOR = re.compile(rb'[)>\]]\s*(?:Tj|TJ|\'|")')
+
+# Content streams decoded to confirm a text layer (fonts alone are not proof)
+TEXT_LAYER_PROBE_PAGES = 3
+
+DOCX_PAGES_PATTERN = re.compile(rb'<Pages>(\d+)</Pages>')
+DOCX_CHARACTERS_PATTERN = re.compile(rb'<CharactersWithSpaces>(\d+)</CharactersWithSpaces>')
+
+# Layout detection (PDF points): characters are binned horizontally and a
+# column needs a gutter no character crosses, enough lines and enough text
+COLUMN_BIN = 4
+MIN_GUTTER = 12
+MIN_COLUMN_LINES = 5
+MIN_COLUMN_SHARE = 0.2
+
+# A page's first / last line counts as header / footer inside these bands
+HEADER_FOOTER_BAND = 0.1
+
+DIGITS_PATTERN = re.compile(r'\d+')
+
+A_NS = '{http://schemas.openxmlformats.org/drawingml/2006/main}'
+V_NS = '{urn:schemas-microsoft-com:vml}'
+
+# Word binary special characters -> plain text
+DOC_CHAR_MAP = {
+    '\r': '\n',     # paragraph end
+    '\x07': '\n',   # table cell / row end
+    '\x0b': '\n',   # line break
+    '\x0c': '\n',   # page / section break
+    '\x1e': '-',     # non-breaking hyphen
+    '\x1f': '',      # optional hyphen
+    '\xa0': ' '
+}
 
 
 class TextExtractor:
@@ -14,47 +102,676 @@ class TextExtractor:
     def __init__(self):
         self.supported_formats = ['.pdf', '.docx', '.doc']
     
-    def extract_from_pdf(self, file_path):
-        """Extract text from PDF file"""
+    def extract_from_pdf(self, file_path, max_pages=None, layout=None):
+        """
+        Extract text from PDF file (only the first max_pages pages if given).
+        Pass a dict as `layout` to have it filled with layout signals
+        gathered from the same page objects.
+        """
         try:
-            text = ""
+            texts = []
+            page_layouts = []
             with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
+                for page in pdf.pages[:max_pages]:
                     page_text = page.extract_text()
                     if page_text:
-                        text += page_text + "\n"
-            return text.strip()
+                        texts.append(page_text)
+                    if layout is not None:
+                        page_layouts.append(self._pdf_page_layout(page))
+                    self._release_page(page)
+            if layout is not None:
+                layout.update(self._summarize_pdf_layout(page_layouts))
+            return "\n".join(texts).strip()
         except Exception as e:
             raise Exception(f"Error extracting PDF: {str(e)}")
     
-    def extract_from_docx(self, file_path):
-        """Extract text from DOCX file"""
+    def _release_page(self, page):
+        """
+        Free what a finished page holds: pdfplumber's cached layout and
+        objects, and its text maps (an lru_cache on the class that would
+        otherwise keep up to 128 pages alive)
+        """
+        page.flush_cache()
+        if hasattr(page.get_textmap, 'cache_clear'):
+            page.get_textmap.cache_clear()
+    
+    def extract_with_layout(self, file_path, max_pages=None):
+        """
+        Extract text together with layout signals for the format check
+        
+        Returns:
+            tuple: (text, layout) where layout is a dict (see _empty_layout),
+                   or None when the format carries no layout information
+        """
+        file_ext = os.path.splitext(file_path)[1].lower()
+        layout = self._empty_layout(file_ext.lstrip('.'))
+        
+        if file_ext == '.pdf':
+            return self.extract_from_pdf(file_path, max_pages, layout), layout
+        if file_ext == '.docx' or (file_ext == '.doc' and zipfile.is_zipfile(file_path)):
+            return self.extract_from_docx(file_path, layout), layout
+        return self.extract(file_path, max_pages), None
+    
+    def _empty_layout(self, source):
+        """Layout signal record shared by every format"""
+        return {
+            'source': source,
+            'pages': 0,
+            'columns': 1,
+            'multi_column_pages': [],
+            'tables': 0,
+            'table_regions': [],
+            'images': 0,
+            'text_boxes': 0,
+            'fonts': [],
+            'font_sizes': {},
+            'header_text': None,
+            'footer_text': None
+        }
+    
+    def _pdf_page_layout(self, page):
+        """Layout features of one pdfplumber page"""
+        width, height = float(page.width), float(page.height)
+        chars = [c for c in page.chars if c['text'].strip()]
+        
+        families = Counter(c['fontname'].split('+')[-1] for c in chars)
+        sizes = Counter(round(c['size'], 1) for c in chars)
+        
+        # First and last text lines, when they sit in the page margins
+        lines = {}
+        for c in chars:
+            lines.setdefault(round(c['top']), []).append(c)
+        header = footer = ""
+        if lines:
+            top, bottom = min(lines), max(lines)
+            if top <= height * HEADER_FOOTER_BAND:
+                header = self._line_text(lines[top])
+            if bottom >= height * (1 - HEADER_FOOTER_BAND) and bottom != top:
+                footer = self._line_text(lines[bottom])
+        
+        return {
+            'columns': self._count_columns(chars, width),
+            'tables': [[round(v, 1) for v in table.bbox] for table in page.find_tables()],
+            'images': len(page.images),
+            'families': families,
+            'sizes': sizes,
+            # Page numbers differ between pages; compare the rest
+            'header': DIGITS_PATTERN.sub('#', header),
+            'footer': DIGITS_PATTERN.sub('#', footer)
+        }
+    
+    def _line_text(self, chars):
+        """Text of one line of characters, with spaces restored from gaps"""
+        text = ""
+        previous = None
+        for c in sorted(chars, key=lambda c: c['x0']):
+            if previous is not None and c['x0'] - previous['x1'] > c['size'] * 0.2:
+                text += " "
+            text += c['text']
+            previous = c
+        return text
+    
+    def _count_columns(self, chars, width):
+        """Count text columns separated by vertical gutters that no character crosses"""
+        if not chars:
+            return 1
+        
+        coverage = [0] * (int(width // COLUMN_BIN) + 2)
+        for c in chars:
+            for b in range(max(0, int(c['x0'] // COLUMN_BIN)), min(len(coverage), int(c['x1'] // COLUMN_BIN) + 1)):
+                coverage[b] += 1
+        
+        # Split the covered range at every wide enough gap
+        segments = []
+        start, gap = None, 0
+        for b, covered in enumerate(coverage):
+            if covered:
+                if start is None or gap * COLUMN_BIN >= MIN_GUTTER:
+                    segments.append([b * COLUMN_BIN, None])
+                segments[-1][1] = (b + 1) * COLUMN_BIN
+                start, gap = b, 0
+            elif start is not None:
+                gap += 1
+        
+        columns = 0
+        for x0, x1 in segments:
+            inside = [c for c in chars if x0 <= c['x0'] < x1]
+            lines = {round(c['top']) for c in inside}
+            if len(inside) >= len(chars) * MIN_COLUMN_SHARE and len(lines) >= MIN_COLUMN_LINES:
+                columns += 1
+        return max(1, columns)
+    
+    def _summarize_pdf_layout(self, page_layouts):
+        """Combine per-page layout features into one record"""
+        layout = self._empty_layout('pdf')
+        families, sizes = Counter(), Counter()
+        for number, page in enumerate(page_layouts, start=1):
+            if page['columns'] > 1:
+                layout['multi_column_pages'].append(number)
+            layout['columns'] = max(layout['columns'], page['columns'])
+            layout['table_regions'].extend({'page': number, 'bbox': bbox} for bbox in page['tables'])
+            layout['images'] += page['images']
+            families.update(page['families'])
+            sizes.update(page['sizes'])
+        
+        layout['pages'] = len(page_layouts)
+        layout['tables'] = len(layout['table_regions'])
+        self._summarize_fonts(layout, families, sizes)
+        
+        # Header / footer text repeated on most pages
+        if len(page_layouts) > 1:
+            for band in ('header', 'footer'):
+                text, count = Counter(p[band] for p in page_layouts).most_common(1)[0]
+                if text and count >= max(2, len(page_layouts) / 2):
+                    layout[f'{band}_text'] = text
+        return layout
+    
+    def _summarize_fonts(self, layout, families, sizes):
+        """Font families by share of characters plus body / min / max size"""
+        total = sum(families.values())
+        layout['fonts'] = [
+            {'family': family, 'share': round(count / total, 3)}
+            for family, count in families.most_common()
+        ] if total else []
+        if sizes:
+            layout['font_sizes'] = {
+                'body': sizes.most_common(1)[0][0],
+                'min': min(sizes),
+                'max': max(sizes)
+            }
+    
+    def extract_from_docx(self, file_path, layout=None):
+        """
+        Extract text from a DOCX file.
+        Stream-parses word/document.xml in document order, so paragraphs and
+        table cells come out as they appear and memory stays flat. Pass a
+        dict as `layout` to have it filled with layout signals from the
+        same pass.
+        """
         try:
-            doc = Document(file_path)
-            text = []
+            with zipfile.ZipFile(file_path) as archive:
+                stats = {'families': Counter(), 'sizes': Counter()} if layout is not None else None
+                with archive.open('word/document.xml') as document_xml:
+                    text = "\n".join(self._iter_docx_paragraphs(document_xml, stats))
+                if layout is not None:
+                    layout.update(self._summarize_docx_layout(archive, stats))
+                return text
+        except zipfile.BadZipFile:
+            if self._is_ole_file(file_path):
+                raise Exception("Error extracting DOCX: file is encrypted or in legacy .doc format")
+            raise Exception("Error extracting DOCX: not a valid DOCX file")
+        except Exception as e:
+            raise Exception(f"Error extracting DOCX: {str(e)}")
+    
+    def _summarize_docx_layout(self, archive, stats):
+        """Layout record from the document.xml pass plus header / footer parts"""
+        layout = self._empty_layout('docx')
+        for key in ('tables', 'images', 'text_boxes'):
+            layout[key] = stats.get(key, 0)
+        layout['columns'] = stats.get('columns', 1)
+        
+        # Without direct formatting, runs use the document defaults
+        if not stats['families'] and 'word/styles.xml' in archive.namelist():
+            defaults = ET.fromstring(archive.read('word/styles.xml')).find(f'{W_NS}docDefaults')
+            if defaults is not None:
+                for elem in defaults.iter():
+                    self._record_docx_layout(stats, elem.tag, elem)
+        self._summarize_fonts(layout, stats['families'], stats['sizes'])
+        
+        names = archive.namelist()
+        for band in ('header', 'footer'):
+            texts = []
+            for name in sorted(n for n in names if re.match(rf'word/{band}\d*\.xml$', n)):
+                with archive.open(name) as part:
+                    texts.extend(self._iter_docx_paragraphs(part))
+            if texts:
+                layout[f'{band}_text'] = " ".join(" ".join(texts).split())
+        
+        if 'docProps/app.xml' in names:
+            pages = DOCX_PAGES_PATTERN.search(archive.read('docProps/app.xml'))
+            if pages:
+                layout['pages'] = int(pages.group(1))
+        return layout
+    
+    def _iter_docx_paragraphs(self, document_xml, stats=None):
+        """
+        Yield the non-empty paragraphs of a document.xml stream in order.
+        If `stats` is a dict, table, image, text box, column and font
+        counts are recorded in it along the way.
+        """
+        open_paragraphs = []  # text buffers; text boxes nest paragraphs
+        tags = []             # open element tags
+        merged_cells = []     # per open table cell: continues a vertical merge?
+        fallback_depth = 0    # inside mc:Fallback (duplicate of mc:Choice content)
+        body = None
+        
+        for event, elem in ET.iterparse(document_xml, events=('start', 'end')):
+            tag = elem.tag
+            
+            if event == 'start':
+                tags.append(tag)
+                if tag == W_NS + 'p':
+                    open_paragraphs.append([])
+                elif tag == W_NS + 'tc':
+                    merged_cells.append(False)
+                elif tag == MC_FALLBACK:
+                    fallback_depth += 1
+                elif tag == W_NS + 'body':
+                    body = elem
+                continue
             
-            # Extract text from paragraphs
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    text.append(paragraph.text)
+            tags.pop()
+            parent = tags[-1] if tags else None
             
-            # Extract text from tables
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        if cell.text.strip():
-                            text.append(cell.text)
+            if stats is not None and not fallback_depth:
+                self._record_docx_layout(stats, tag, elem)
             
-            return "\n".join(text)
+            if tag == W_NS + 't':
+                if open_paragraphs and elem.text:
+                    open_paragraphs[-1].append(elem.text)
+            elif tag in DOCX_RUN_CHARS:
+                # w:tab also defines tab stops inside w:pPr; only runs hold text
+                if open_paragraphs and parent == W_NS + 'r':
+                    open_paragraphs[-1].append(DOCX_RUN_CHARS[tag])
+            elif tag == W_NS + 'vMerge':
+                # Only the first cell of a vertical merge ("restart") owns the text
+                if merged_cells and elem.get(W_NS + 'val', 'continue') != 'restart':
+                    merged_cells[-1] = True
+            elif tag == W_NS + 'p':
+                text = "".join(open_paragraphs.pop())
+                if not fallback_depth and not any(merged_cells) and text.strip():
+                    yield text
+                elem.clear()
+            elif tag == W_NS + 'tc':
+                merged_cells.pop()
+            elif tag == W_NS + 'tr':
+                elem.clear()
+            elif tag == MC_FALLBACK:
+                fallback_depth -= 1
+            
+            # Drop finished top-level blocks so the tree never grows
+            if body is not None and parent == W_NS + 'body':
+                body.clear()
+    
+    def _record_docx_layout(self, stats, tag, elem):
+        """Count layout features of one closed WordprocessingML element"""
+        if tag == W_NS + 'tbl':
+            stats['tables'] = stats.get('tables', 0) + 1
+        elif tag in (A_NS + 'blip', V_NS + 'imagedata'):
+            stats['images'] = stats.get('images', 0) + 1
+        elif tag == W_NS + 'txbxContent':
+            stats['text_boxes'] = stats.get('text_boxes', 0) + 1
+        elif tag == W_NS + 'cols':
+            stats['columns'] = max(stats.get('columns', 1), int(elem.get(W_NS + 'num', 1)))
+        elif tag == W_NS + 'rFonts':
+            family = elem.get(W_NS + 'ascii') or elem.get(W_NS + 'hAnsi')
+            if family:
+                stats['families'][family] += 1
+        elif tag == W_NS + 'sz':
+            stats['sizes'][int(elem.get(W_NS + 'val', 0)) / 2] += 1
+    
+    def extract_from_doc(self, file_path):
+        """
+        Extract text from a legacy Word 97-2003 .doc file.
+        Uses antiword, catdoc or LibreOffice when installed, otherwise reads
+        the binary piece table directly (needs olefile).
+        """
+        # Many ".doc" uploads are DOCX files with the wrong extension
+        if zipfile.is_zipfile(file_path):
+            return self.extract_from_docx(file_path)
+        
+        text = self._convert_doc_externally(file_path)
+        if text is not None:
+            return text.strip()
+        
+        if olefile is None:
+            raise Exception("Error extracting DOC: install antiword, catdoc, LibreOffice or the olefile package")
+        
+        try:
+            with olefile.OleFileIO(file_path) as ole:
+                word_document = ole.openstream('WordDocument').read()
+                table_name = '1Table' if struct.unpack_from('<H', word_document, 0x0A)[0] & 0x0200 else '0Table'
+                if not ole.exists(table_name):
+                    raise ValueError(f"missing {table_name} stream")
+                table = ole.openstream(table_name).read()
+            return self._doc_text_from_streams(word_document, table)
         except Exception as e:
-            raise Exception(f"Error extracting DOCX: {str(e)}")
+            raise Exception(f"Error extracting DOC: {str(e)}")
+    
+    def _convert_doc_externally(self, file_path):
+        """Convert a .doc with the first available command-line tool, or return None"""
+        for tool, args in (('antiword', ['-w', '0']), ('catdoc', ['-w'])):
+            executable = shutil.which(tool)
+            if executable:
+                try:
+                    result = subprocess.run(
+                        [executable, *args, file_path],
+                        capture_output=True, timeout=DOC_CONVERTER_TIMEOUT
+                    )
+                except subprocess.TimeoutExpired:
+                    continue
+                if result.returncode == 0 and result.stdout.strip():
+                    return result.stdout.decode('utf-8', errors='replace')
+        
+        executable = shutil.which('soffice') or shutil.which('libreoffice')
+        if executable:
+            with tempfile.TemporaryDirectory() as out_dir:
+                try:
+                    subprocess.run(
+                        [executable, '--headless', '--convert-to', 'txt:Text', '--outdir', out_dir, file_path],
+                        capture_output=True, timeout=DOC_CONVERTER_TIMEOUT
+                    )
+                except subprocess.TimeoutExpired:
+                    return None
+                out_path = os.path.join(out_dir, os.path.splitext(os.path.basename(file_path))[0] + '.txt')
+                if os.path.exists(out_path):
+                    with open(out_path, encoding='utf-8', errors='replace') as f:
+                        return f.read()
+        return None
+    
+    def _doc_text_from_streams(self, word_document, table):
+        """
+        Rebuild the main document text of a Word 97+ binary file from its
+        WordDocument and table streams, following the piece table (CLX).
+        """
+        if struct.unpack_from('<H', word_document, 0)[0] != 0xA5EC:
+            raise ValueError("not a Word 97-2003 document")
+        if struct.unpack_from('<H', word_document, 0x0A)[0] & 0x0100:
+            raise ValueError("document is encrypted")
+        
+        # FIB: length of the main text in characters, and location of the CLX
+        main_text_chars = struct.unpack_from('<i', word_document, 0x4C)[0]
+        fc_clx, lcb_clx = struct.unpack_from('<II', word_document, 0x1A2)
+        clx = table[fc_clx:fc_clx + lcb_clx]
+        
+        # Skip property blocks (Prc, 0x01) to reach the piece table (Pcdt, 0x02)
+        pos = 0
+        while pos < len(clx) and clx[pos] == 0x01:
+            pos += 3 + struct.unpack_from('<h', clx, pos + 1)[0]
+        if pos >= len(clx) or clx[pos] != 0x02:
+            raise ValueError("piece table not found")
+        lcb = struct.unpack_from('<I', clx, pos + 1)[0]
+        plc = clx[pos + 5:pos + 5 + lcb]
+        
+        pieces = (lcb - 4) // 12
+        cps = struct.unpack_from(f'<{pieces + 1}I', plc, 0)
+        parts = []
+        for i in range(pieces):
+            start_cp, end_cp = cps[i], min(cps[i + 1], main_text_chars)
+            if start_cp >= end_cp:
+                break
+            fc = struct.unpack_from('<I', plc, (pieces + 1) * 4 + i * 8 + 2)[0]
+            count = end_cp - start_cp
+            if fc & 0x40000000:
+                offset = (fc & ~0x40000000) // 2
+                parts.append(word_document[offset:offset + count].decode('cp1252', errors='replace'))
+            else:
+                parts.append(word_document[fc:fc + count * 2].decode('utf-16-le', errors='replace'))
+        
+        return self._clean_doc_text("".join(parts))
+    
+    def _clean_doc_text(self, text):
+        """Drop field instructions and map Word control characters to plain text"""
+        out = []
+        field_stack = []  # per open field: still in its instruction part?
+        for ch in text:
+            if ch == '\x13':
+                field_stack.append(True)
+            elif ch == '\x14':
+                if field_stack:
+                    field_stack[-1] = False
+            elif ch == '\x15':
+                if field_stack:
+                    field_stack.pop()
+            elif any(field_stack):
+                continue
+            elif ch in DOC_CHAR_MAP:
+                out.append(DOC_CHAR_MAP[ch])
+            elif ch >= ' ' or ch in '\t\n':
+                out.append(ch)
+        
+        lines = (line.rstrip() for line in "".join(out).split('\n'))
+        return "\n".join(line for line in lines if line.strip())
+    
+    def _is_ole_file(self, file_path):
+        """Check for the OLE2 compound file signature"""
+        with open(file_path, 'rb') as f:
+            return f.read(8) == OLE_MAGIC
+    
+    def inspect(self, file_path):
+        """
+        Cheap pre-flight look at a document before full extraction.
+        Reads only the PDF trailer, cross-reference table and page tree (plus
+        the content streams of the first pages to confirm a text layer), or
+        the DOCX zip directory.
+        
+        Args:
+            file_path (str): Path to the document file
+            
+        Returns:
+            dict: format, size_bytes, pages, has_text_layer, encrypted,
+                  needs_password, image_count, font_count,
+                  estimated_text_chars and elapsed_ms. Values that cannot be
+                  known without extraction are None.
+        """
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+        
+        started = time.perf_counter()
+        file_ext = os.path.splitext(file_path)[1].lower()
+        report = {
+            'format': file_ext.lstrip('.'),
+            'size_bytes': os.path.getsize(file_path),
+            'pages': None,
+            'has_text_layer': None,
+            'encrypted': False,
+            'needs_password': False,
+            'image_count': None,
+            'font_count': None,
+            'estimated_text_chars': None
+        }
+        
+        if file_ext == '.pdf':
+            report.update(self._inspect_pdf(file_path))
+        elif zipfile.is_zipfile(file_path):
+            report.update(self._inspect_docx(file_path))
+        elif self._is_ole_file(file_path):
+            report.update(self._inspect_ole(file_path, file_ext))
+        
+        report['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        return report
+    
+    def preflight(self, file_path, limits=None):
+        """
+        Inspect a document and decide how to process it
+        
+        Args:
+            file_path (str): Path to the document file
+            limits (dict): Overrides for PREFLIGHT_LIMITS
+            
+        Returns:
+            dict: inspect() report plus 'action' ('extract', 'truncate' or
+                  'reject'), 'reasons' and 'max_pages' to pass to extract()
+        """
+        limits = {**PREFLIGHT_LIMITS, **(limits or {})}
+        report = self.inspect(file_path)
+        reasons = []
+        action = 'extract'
+        pages = report['pages'] or 0
+        
+        if report['needs_password']:
+            reasons.append("Document is password-protected")
+        if limits['require_text_layer'] and report['format'] == 'pdf' and report['has_text_layer'] is False:
+            reasons.append("PDF has no text layer (scanned image); upload a text-based PDF or DOCX")
+        if pages > limits['reject_pages']:
+            reasons.append(f"Document has {pages} pages (limit {limits['reject_pages']})")
+        if (report['estimated_text_chars'] or 0) > limits['max_text_chars']:
+            reasons.append(f"Document text is too large (~{report['estimated_text_chars']} characters)")
+        
+        if reasons:
+            action = 'reject'
+        elif report['format'] == 'pdf' and pages > limits['max_pages']:
+            action = 'truncate'
+            reasons.append(f"Only the first {limits['max_pages']} of {pages} pages are analyzed")
+        if action != 'reject' and report['format'] == 'pdf' and report['has_text_layer'] is None:
+            reasons.append("No text found on the first pages; the PDF may be partly scanned")
+        
+        report.update({
+            'action': action,
+            'reasons': reasons,
+            'max_pages': limits['max_pages'] if action == 'truncate' else None
+        })
+        return report
+    
+    def _inspect_pdf(self, file_path):
+        """Page count, fonts, images and content size from the PDF object graph"""
+        try:
+            with open(file_path, 'rb') as f:
+                try:
+                    document = PDFDocument(PDFParser(f))
+                except PDFPasswordIncorrect:
+                    return {'encrypted': True, 'needs_password': True}
+                
+                pages = resolve1(document.catalog.get('Pages'))
+                page_count = resolve1(pages.get('Count', 0)) if isinstance(pages, dict) else 0
+                
+                fonts, images, seen_forms = set(), set(), set()
+                content_bytes = 0
+                sampled = 0
+                text_seen = False
+                for page in islice(PDFPage.create_pages(document), PREFLIGHT_SAMPLE_PAGES):
+                    sampled += 1
+                    forms = []
+                    self._collect_pdf_resources(resolve1(page.resources) or {}, fonts, images, forms, seen_forms)
+                    streams = [resolve1(stream) for stream in page.contents] + forms
+                    for stream in streams:
+                        content_bytes += self._estimated_stream_bytes(stream)
+                    if fonts and not text_seen and sampled <= TEXT_LAYER_PROBE_PAGES:
+                        text_seen = any(PDF_TEXT_OPERATOR.search(stream.get_data()) for stream in streams)
+                
+                page_count = page_count or sampled
+                # No text without fonts, nor when every page was probed. Otherwise
+                # the text may start after the probed pages (e.g. a cover image)
+                fully_probed = page_count <= min(sampled, TEXT_LAYER_PROBE_PAGES)
+                has_text_layer = True if text_seen else (None if fonts and not fully_probed else False)
+                scale = page_count / sampled if sampled else 0
+                return {
+                    'pages': page_count,
+                    'has_text_layer': has_text_layer,
+                    'encrypted': bool(document.encryption),
+                    'image_count': round(len(images) * scale),
+                    'font_count': len(fonts),
+                    'estimated_text_chars': round(content_bytes * scale * CONTENT_TEXT_RATIO) if has_text_layer is not False else 0
+                }
+        except Exception as e:
+            raise Exception(f"Error inspecting PDF: {str(e)}")
+    
+    def _inspect_docx(self, file_path):
+        """Media count and text size from the zip directory and docProps/app.xml"""
+        try:
+            with zipfile.ZipFile(file_path) as archive:
+                entries = {info.filename: info for info in archive.infolist()}
+                document = entries.get('word/document.xml')
+                if document is None:
+                    raise ValueError("word/document.xml not found")
+                
+                report = {
+                    'image_count': sum(1 for name in entries if name.startswith('word/media/')),
+                    'estimated_text_chars': round(document.file_size * DOCX_TEXT_RATIO),
+                    'has_text_layer': True
+                }
+                
+                font_table = entries.get('word/fontTable.xml')
+                if font_table is not None:
+                    report['font_count'] = archive.read(font_table).count(b'<w:font ')
+                
+                # Word stores its own page and character statistics here
+                app_props = entries.get('docProps/app.xml')
+                if app_props is not None:
+                    props = archive.read(app_props)
+                    pages = DOCX_PAGES_PATTERN.search(props)
+                    characters = DOCX_CHARACTERS_PATTERN.search(props)
+                    if pages:
+                        report['pages'] = int(pages.group(1))
+                    if characters and int(characters.group(1)):
+                        report['estimated_text_chars'] = int(characters.group(1))
+                return report
+        except Exception as e:
+            raise Exception(f"Error inspecting DOCX: {str(e)}")
+    
+    def _inspect_ole(self, file_path, file_ext):
+        """Encrypted OOXML packages and legacy .doc files are OLE2 containers"""
+        if file_ext == '.docx':
+            # Password-protected DOCX files are stored as an encrypted OLE package
+            return {'encrypted': True, 'needs_password': True}
+        if olefile is None:
+            return {}
+        
+        with olefile.OleFileIO(file_path) as ole:
+            if not ole.exists('WordDocument'):
+                return {}
+            fib = ole.openstream('WordDocument').read(0x50)
+        encrypted = bool(struct.unpack_from('<H', fib, 0x0A)[0] & 0x0100)
+        return {
+            'encrypted': encrypted,
+            'needs_password': encrypted,
+            'has_text_layer': True,
+            'estimated_text_chars': struct.unpack_from('<i', fib, 0x4C)[0]
+        }
+    
+    def _collect_pdf_resources(self, resources, fonts, images, forms, seen_forms):
+        """
+        Add the fonts and images of a resource dictionary to the given sets,
+        descending into Form XObjects (drawn with 'Do', they carry their own
+        content stream and resources). New forms are appended to `forms`;
+        `seen_forms` keeps a form shared by many pages from being read twice.
+        """
+        for name, ref in (resolve1(resources.get('Font')) or {}).items():
+            font = resolve1(ref)
+            fonts.add(self._pdf_name(font.get('BaseFont')) if isinstance(font, dict) else name)
+        for name, ref in (resolve1(resources.get('XObject')) or {}).items():
+            xobject = resolve1(ref)
+            attrs = getattr(xobject, 'attrs', {})
+            subtype = self._pdf_name(attrs.get('Subtype'))
+            if subtype == 'Image':
+                images.add(getattr(ref, 'objid', name))
+            elif subtype == 'Form':
+                key = getattr(ref, 'objid', None) or id(xobject)
+                if key in seen_forms:
+                    continue
+                seen_forms.add(key)
+                forms.append(xobject)
+                self._collect_pdf_resources(resolve1(attrs.get('Resources')) or {}, fonts, images, forms, seen_forms)
+    
+    def _estimated_stream_bytes(self, stream):
+        """Decoded size of a content stream, estimated from its declared Length"""
+        attrs = getattr(stream, 'attrs', None)
+        if not attrs:
+            return 0
+        size = resolve1(attrs.get('Length', 0)) or 0
+        filters = resolve1(attrs.get('Filter')) or []
+        if not isinstance(filters, list):
+            filters = [filters]
+        for stream_filter in filters:
+            size *= STREAM_EXPANSION.get(self._pdf_name(stream_filter), 1.0)
+        return size
+    
+    def _pdf_name(self, value):
+        """Plain string for a PDF name object"""
+        value = resolve1(value)
+        if isinstance(value, PSLiteral):
+            return value.name
+        if isinstance(value, bytes):
+            return value.decode('latin-1')
+        return value
     
-    def extract(self, file_path):
+    def extract(self, file_path, max_pages=None):
         """
         Main extraction method that determines file type and extracts text
         
         Args:
             file_path (str): Path to the document file
+            max_pages (int): Only extract the first pages of a PDF (optional)
             
         Returns:
             str: Extracted text from the document
@@ -68,9 +785,11 @@ class TextExtractor:
             raise ValueError(f"Unsupported file format: {file_ext}. Supported: {self.supported_formats}")
         
         if file_ext == '.pdf':
-            return self.extract_from_pdf(file_path)
-        elif file_ext in ['.docx', '.doc']:
+            return self.extract_from_pdf(file_path, max_pages)
+        elif file_ext == '.docx':
             return self.extract_from_docx(file_path)
+        elif file_ext == '.doc':
+            return self.extract_from_doc(file_path)
         
     def get_file_info(self, file_path):
         """Get basic file information"""
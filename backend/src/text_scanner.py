@@ -0,0 +1,86 @@
+"""
+Text Scanner Module
+Single pass over resume text for action verbs, metrics and passive phrasing
+"""
+
+import re
+from functools import lru_cache
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config_store import current_config
+
+# Alternatives are tried left to right at each position, so multi-word
+# phrases come before the catch-all word token. Passive phrases stay on one
+# line, matching the old line-by-line check. "helped with"/"assisted in" are
+# zero-width: the next match at the same offset reads the verb as a word.
+SCAN_PATTERN = re.compile(r"""
+    (?P<passive>
+        \b(?:am|is|are|was|were|be|been|being)[ \t]+(?P<participle>\w+ed)\b
+      | \bresponsible[ \t]+for\b
+      | \b(?=helped[ \t]+with\b|assisted[ \t]+in\b)
+    )
+  | (?P<metric>
+        \b(?P<metric_verb>increased|reduced)\s+by\s+\d+
+      | \bsaved\s+\d+
+      | \d+\s+(?:users|customers|clients|projects|employees|team\ members|revenue|growth|reduction|improvement)
+      | \d+%
+      | \$\d+
+      | \b\d{1,3}(?:,\d{3})*\b
+    )
+  | (?P<word>[^\W\d_]+)
+""", re.IGNORECASE | re.VERBOSE)
+
+
+def scan_text(text, config=None):
+    """
+    Walk the text once and collect impact and tone signals
+
+    Args:
+        text (str): Resume text
+        config (ConfigSnapshot): Settings to use (the live ones if omitted)
+
+    Returns:
+        dict: 'verbs' and 'metrics' as (offset, value) tuples in text order,
+              'passive_lines' as line numbers containing passive phrasing.
+              Results are cached per config snapshot, so treat them as read-only.
+    """
+    return _scan(text, config or current_config())
+
+
+@lru_cache(maxsize=32)
+def _scan(text, config):
+    verb_rank = config.action_verb_rank
+    verbs = []
+    metrics = []
+    passive_lines = []
+    line_no = 0
+    last_pos = 0
+
+    for match in SCAN_PATTERN.finditer(text):
+        kind = match.lastgroup
+        if kind == 'word':
+            word = match.group('word').lower()
+            if word in verb_rank:
+                verbs.append((match.start(), verb_rank[word][1]))
+        elif kind == 'metric':
+            metrics.append((match.start(), match.group('metric').lower()))
+            lead = (match.group('metric_verb') or '').lower()
+            if lead in verb_rank:
+                verbs.append((match.start(), verb_rank[lead][1]))
+        else:
+            line_no += text.count('\n', last_pos, match.start())
+            last_pos = match.start()
+            if not passive_lines or passive_lines[-1] != line_no:
+                passive_lines.append(line_no)
+            participle = (match.group('participle') or '').lower()
+            if participle in verb_rank:
+                verbs.append((match.start('participle'), verb_rank[participle][1]))
+
+    return {
+        'verbs': tuple(verbs),
+        'metrics': tuple(metrics),
+        'passive_lines': tuple(passive_lines)
+    }